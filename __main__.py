@@ -22,7 +22,15 @@ Date:   November 20, 2019
 """
 from consts import *
 from app import *
+import sys
 
 # Application code
 if __name__ == '__main__':
-    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT).run()
+    game = Invaders(width=GAME_WIDTH,height=GAME_HEIGHT,rate=SIM_RATE,
+                    catchup=MAX_CATCHUP)
+    try:
+        game.run()
+    finally:
+        # A fourth argument names the file to record the game to
+        if len(sys.argv) > 4:
+            game.getRecording().save(sys.argv[4])
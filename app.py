@@ -9,6 +9,7 @@ This module contains the main controller class for the Alien Invaders app.
 from consts import *
 from game2d import *
 from wave import *
+from replay import Recording
 
 
 # PRIMARY RULE: Invaders can only access attributes in wave.py via getters/setters
@@ -68,6 +69,12 @@ class Invaders(GameApp):
     #
     #Attribute _last: number of keys pressed in the previous frame
     #Invariant: _last is an int >=0
+    #
+    #Attribute _recording: the input of every frame so far, for replay
+    #Invariant: _recording is a Recording object
+    #
+    #Attribute _percent: the percent of the assets loaded when last shown
+    #Invariant: _percent is an int in -1..100 (-1 before anything is shown)
 
     # DO NOT MAKE A NEW INITIALIZER!
 
@@ -83,16 +90,18 @@ class Invaders(GameApp):
 
         This method should make sure that all of the attributes satisfy the
         given invariants. When done, it sets the _state to STATE_INACTIVE and
-        create a message (in attribute _text) saying that the user should press
-        to play a game.
+        create a message (in attribute _text) saying how much of the game is
+        loaded, or that the user should press to play a game.
         """
+        # Only redraw what changed from one frame to the next
+        self.view.retained=True
         self._state=STATE_INACTIVE
-        self._text=GLabel(text="Press 's' to Play",font_size=ARCADE_MEDIUM,
-                          font_name=ARCADE_FONT, width=BANNER_WIDTH,
-                          height=BANNER_HEIGHT, x=GAME_WIDTH/2,
-                          y=GAME_HEIGHT/2)
+        self._text=None
+        self._percent=-1
+        self._loading()
         self._wave=None
         self._last=0
+        self._recording=Recording()
 
 
     def update(self,dt):
@@ -114,7 +123,9 @@ class Invaders(GameApp):
         STATE_INACTIVE: This is the state when the application first opens.
         It is a paused state, waiting for the player to start the game.  It
         displays a simple message on the screen. The application remains in
-        this state so long as the player never presses a key.  In addition,
+        this state so long as the player never presses a key.  Until the game
+        is loaded, the message shows how far along it is, keys are ignored,
+        and the frames are not recorded.  In addition,
         this is the state the application returns to when the game is over
         (all lives are lost or all aliens are dead).
 
@@ -147,17 +158,20 @@ class Invaders(GameApp):
         Precondition: dt is a number (int or float)
         """
         # IMPLEMENT ME
+        if self._state==STATE_INACTIVE and self._loading():
+            return
+        self._recording.capture(self.input,dt)
         if self._state==STATE_INACTIVE:
             self._begin()
         if self._state==STATE_NEWWAVE:
             self._wave=Wave()
+            self._recording.setSeed(self._wave.getSeed())
             self._state=(self._state+1)%6
         if self._state==STATE_ACTIVE:
             self._text=None
             self._wave.update(self.input,dt)
             if (self._wave.getDeath()==False):
-                if(self._allAliens(self._wave.getAliens()) or
-                   self._wave.getBelow()):
+                if(self._wave.getAlienCount()==0 or self._wave.getBelow()):
                     self._state=STATE_COMPLETE
             else:
                 self._state=STATE_PAUSED
@@ -172,7 +186,7 @@ class Invaders(GameApp):
             else:
                 self._state=STATE_COMPLETE
         if self._state==STATE_CONTINUE:
-            s=Ship()
+            s=ShipBody()
             self._wave.setShip(s)
             self._state=STATE_ACTIVE
         if self._state==STATE_COMPLETE: #STATE_COMPLETE
@@ -203,7 +217,36 @@ class Invaders(GameApp):
             self._wave.draw(self.view)
 
 
+    # GETTER FOR THE RECORDING
+    def getRecording(self):
+        """
+        Returns the Recording of every frame played so far
+        """
+        return self._recording
+
+
     # HELPER METHODS FOR THE STATES GO HERE
+    def _loading(self):
+        """
+        Returns True if the game is still loading; otherwise False
+
+        The message shows the percent loaded, changing only when the percent
+        does. Once everything is loaded, it asks the player to press 's'.
+        """
+        percent=int(100*self.loaded)
+        if percent!=self._percent and percent<100:
+            self._text=GLabel(text="Loading... %d%%" % percent,
+                              font_size=ARCADE_MEDIUM,font_name=ARCADE_FONT,
+                              width=BANNER_WIDTH,height=BANNER_HEIGHT,
+                              x=GAME_WIDTH/2,y=GAME_HEIGHT/2)
+        elif percent!=self._percent:
+            self._text=GLabel(text="Press 's' to Play",
+                              font_size=ARCADE_MEDIUM,font_name=ARCADE_FONT,
+                              width=BANNER_WIDTH,height=BANNER_HEIGHT,
+                              x=GAME_WIDTH/2,y=GAME_HEIGHT/2)
+        self._percent=percent
+        return percent<100
+
     def _begin(self):
         """
         Changes the state and removes welcome message if s is pressed;
@@ -216,18 +259,3 @@ class Invaders(GameApp):
                 self._state=(self._state+1)%6
         self._last=pressed
 
-
-    # HELPER METHDO TO DETEMINE IF ALL ALIENS ARE DEAD
-    def _allAliens(self,a):
-        """
-        Returns true if a is a 2d list with only None;
-        otherwise return False
-
-        Parameter a: 2d list to check over
-        Precondition: a must be a nonempty table
-        """
-        for r in range(len(a)):
-            for c in range(len(a[0])):
-                if (a[r][c]!=None):
-                    return False
-        return True
@@ -0,0 +1,664 @@
+"""
+Batch simulation module for Alien Invaders
+
+This module contains the class BatchWave, which plays many independent headless
+waves at once. Every piece of wave state (the formation, the ship, the bolts,
+the timers and the random number generator) is an array with one entry (or one
+row) per wave, and each update advances all of the waves with a fixed number of
+NumPy operations. This is for balancing runs and bot training, where thousands
+of waves are played with the same rules.
+
+Run this module as a script to measure the cost of one batch update. It takes
+the same arguments as the game, followed by the number of waves:
+
+    python batch.py [rows] [aliens-per-row] [speed] [waves]
+
+# Evelyn Si es828
+# 12/7/21
+"""
+from consts import *
+from sim import Formation, sweptHits
+import numpy as np
+import random
+import time
+
+# PRIMARY RULE: Like sim.py, this module may only access consts.py and sim.py.
+# It must never import game2d or Kivy, directly or indirectly.
+
+# The constants of the SplitMix64 generator (see sim.RandomStream)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+class BatchWave(object):
+    """
+    A class to play a batch of independent headless waves together.
+
+    Wave i of a batch plays out exactly as Wave(headless=True,seed=seeds[i])
+    does, given the same keys and time steps: the same random numbers, the same
+    bolts and the same floating point positions. The only differences are where
+    Wave would raise an error. A wave with no ship cannot fire, and a wave
+    with no aliens does not fire alien bolts.
+
+    The formation of each wave is stored as one x coordinate per column and one
+    y coordinate per row (every alien in a column, or row, moves together), and
+    the row of the bottom live alien of each column. Aliens are only ever shot
+    from the bottom of a column, so that is enough to know which are alive.
+
+    The player bolt of each wave is stored apart from the alien bolts, as a
+    wave never has more than one. The alien bolts are stored in slots, which
+    grow as needed up to the bolt capacity of a Wave.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _seeds: the seed of each wave
+    # Invariant: _seeds is a list of ints in 0..2**64-1, one per wave
+    #
+    # Attribute _rng: the state of the random number generator of each wave
+    # Invariant: _rng is a uint64 array of length size
+    #
+    # Attribute _x: the horizontal coordinate of each column of aliens
+    # Invariant: _x is a size x cols float array
+    #
+    # Attribute _y: the vertical coordinate of each row of aliens
+    # Invariant: _y is a size x rows float array
+    #
+    # Attribute _bottom: the row of the bottom live alien in each column
+    # Invariant: _bottom is a size x cols int array; -1 for an empty column
+    #
+    # Attribute _occupied: the occupied columns of each wave, in the same
+    # order as Formation keeps them
+    # Invariant: _occupied is a size x cols int array; the first _nOccupied[i]
+    # entries of row i are the columns with _bottom>=0
+    #
+    # Attribute _slot: the position of each occupied column in _occupied
+    # Invariant: _slot is a size x cols int array
+    #
+    # Attribute _nOccupied: the number of occupied columns of each wave
+    # Invariant: _nOccupied is an int array of length size
+    #
+    # Attribute _leftCol, _rightCol: the leftmost and rightmost occupied column
+    # Invariant: each is an int array of length size; -1 if there are none
+    #
+    # Attribute _count: the number of live aliens of each wave
+    # Invariant: _count is an int array of length size
+    #
+    # Attribute _time, _alienStep, _randomBolt: as in Wave, for each wave
+    # Invariant: _time is a float array, the others are int arrays
+    #
+    # Attribute _leftward: True for each wave whose aliens are marching left
+    # Invariant: _leftward is a bool array of length size
+    #
+    # Attribute _down, _below, _death: as in Wave, for each wave
+    # Invariant: each is a bool array of length size
+    #
+    # Attribute _changed: True for each wave whose formation has descended or
+    # lost an alien since _below was last computed
+    # Invariant: _changed is a bool array of length size
+    #
+    # Attribute _lives: as in Wave, for each wave
+    # Invariant: _lives is an int array of length size
+    #
+    # Attribute _ship: True for each wave that has a ship
+    # Invariant: _ship is a bool array of length size
+    #
+    # Attribute _shipX, _frame: the position and explosion frame of each ship
+    # Invariant: _shipX is a float array, _frame an int array
+    #
+    # Attribute _animating: True for each wave whose ship is exploding
+    # Invariant: _animating is a bool array of length size
+    #
+    # Attribute _deathTime: the time each explosion has run so far
+    # Invariant: _deathTime is a float array of length size
+    #
+    # Attribute _shot: True for each wave with a player bolt
+    # Invariant: _shot is a bool array of length size
+    #
+    # Attribute _shotX, _shotY: the center of each player bolt
+    # Invariant: each is a float array of length size
+    #
+    # Attribute _shotFrom: the vertical center of each player bolt before its
+    # last move, as Bolt.lastY
+    # Invariant: _shotFrom is a float array of length size
+    #
+    # Attribute _boltOn: the active alien bolt slots of each wave
+    # Invariant: _boltOn is a size x slots bool array, slots <= BOLT_CAPACITY
+    #
+    # Attribute _boltX, _boltY: the center of each alien bolt
+    # Invariant: each is a size x slots float array
+    #
+    # Attribute _boltFrom: the vertical center of each alien bolt before its
+    # last move, as Bolt.lastY
+    # Invariant: _boltFrom is a size x slots float array
+
+    # GETTERS
+    @property
+    def size(self):
+        """
+        The number of waves in this batch
+        """
+        return len(self._seeds)
+
+
+    def getSeeds(self):
+        """
+        Returns the list of seeds of the waves
+        """
+        return self._seeds
+
+
+    def getLives(self):
+        """
+        Returns an int array of the lives of each wave
+        """
+        return self._lives
+
+
+    def getDeath(self):
+        """
+        Returns a bool array that is True for each wave whose ship has died
+        """
+        return self._death
+
+
+    def getBelow(self):
+        """
+        Returns a bool array that is True for each wave with an alien below the
+        defense line
+        """
+        return self._below
+
+
+    def getAlienCount(self):
+        """
+        Returns an int array of the number of live aliens in each wave
+        """
+        return self._count
+
+
+    def getShipX(self):
+        """
+        Returns a float array of the ship position in each wave
+
+        The value for a wave with no ship is the position of its last ship.
+        """
+        return self._shipX
+
+
+    def setDeath(self,which=None):
+        """
+        Clears the death flag of the given waves, as Wave.setDeath does
+
+        Parameter which: the waves to change, or None for all of them
+        Precondition: which is None or a bool array of length size
+        """
+        if (which is None):
+            self._death[:]=False
+        else:
+            self._death[which]=False
+
+
+    def setShip(self,which=None):
+        """
+        Gives a new ship to the given waves, as Wave.setShip(ShipBody()) does
+
+        Parameter which: the waves to change, or None for all of them
+        Precondition: which is None or a bool array of length size, and none
+        of those waves has a ship
+        """
+        if (which is None):
+            which=np.ones(self.size,dtype=bool)
+        assert not np.any(self._ship[which]), 'a wave still has its ship'
+        self._ship[which]=True
+        self._shipX[which]=GAME_WIDTH/2
+        self._frame[which]=0
+
+
+    # INITIALIZER TO CREATE THE WAVES
+    def __init__(self,size,seeds=None):
+        """
+        Initializes a batch of new waves
+
+        Parameter size: the number of waves
+        Precondition: size is an int > 0
+
+        Parameter seeds: the seed of each wave, or None to pick fresh seeds
+        Precondition: seeds is None or a sequence of size ints in 0..2**64-1
+        """
+        assert type(size)==int and size>0, repr(size)+' is not a valid size'
+        assert BOLT_WIDTH<ALIEN_H_SEP, 'a bolt may not overlap two columns'
+        assert ALIEN_ROWS<=ALIEN_ROWS_MAX and ALIENS_IN_ROW<=ALIENS_IN_ROW_MAX, \
+            'a huge formation cannot be batched'
+        if (seeds==None):
+            source=random.SystemRandom()
+            seeds=[source.getrandbits(64) for i in range(size)]
+        seeds=list(seeds)
+        assert len(seeds)==size, 'there must be one seed per wave'
+        for seed in seeds:
+            assert type(seed)==int and 0<=seed<2**64, repr(seed)+' is not a valid seed'
+        self._seeds=seeds
+        self._rng=np.array(seeds,dtype=np.uint64)
+
+        start=Formation()
+        rows=start.rows
+        cols=start.cols
+        self._x=np.repeat(start.x[0][np.newaxis,:],size,axis=0)
+        self._y=np.repeat(start.y[:,0][np.newaxis,:],size,axis=0)
+        self._bottom=np.full((size,cols),rows-1,dtype=np.int64)
+        self._occupied=np.repeat(np.arange(cols)[np.newaxis,:],size,axis=0)
+        self._slot=self._occupied.copy()
+        self._nOccupied=np.full(size,cols,dtype=np.int64)
+        self._leftCol=np.zeros(size,dtype=np.int64)
+        self._rightCol=np.full(size,cols-1,dtype=np.int64)
+        self._count=np.full(size,rows*cols,dtype=np.int64)
+
+        self._time=np.zeros(size)
+        self._alienStep=np.zeros(size,dtype=np.int64)
+        self._leftward=np.zeros(size,dtype=bool)
+        self._down=np.zeros(size,dtype=bool)
+        self._below=np.zeros(size,dtype=bool)
+        self._changed=np.ones(size,dtype=bool)
+        self._death=np.zeros(size,dtype=bool)
+        self._lives=np.full(size,SHIP_LIVES,dtype=np.int64)
+
+        self._ship=np.ones(size,dtype=bool)
+        self._shipX=np.full(size,GAME_WIDTH/2)
+        self._frame=np.zeros(size,dtype=np.int64)
+        self._animating=np.zeros(size,dtype=bool)
+        self._deathTime=np.zeros(size)
+
+        self._shot=np.zeros(size,dtype=bool)
+        self._shotX=np.zeros(size)
+        self._shotY=np.zeros(size)
+        self._shotFrom=np.zeros(size)
+        self._boltOn=np.zeros((size,4),dtype=bool)
+        self._boltX=np.zeros((size,4))
+        self._boltY=np.zeros((size,4))
+        self._boltFrom=np.zeros((size,4))
+
+        everyone=np.arange(size)
+        self._randomBolt=self._randint(everyone,1,BOLT_RATE)
+
+
+    # UPDATE METHOD TO MOVE THE SHIPS, ALIENS, AND LASER BOLTS
+    def update(self,dt,left=False,right=False,up=False):
+        """
+        Animates the Ships, Bolts, and Aliens of every wave, as Wave.update does
+
+        Parameter dt: time since last animation frame
+        Precondition: dt is a float
+
+        Parameter left, right, up: whether each key is held down
+        Precondition: each is a bool, or a bool array of length size
+        """
+        scale=dt*FRAME_RATE
+        self._moveAliens(dt)
+        self._makeAlienBolts()
+        leaving=self._fireAlienBolts(scale)
+        self._collide()
+        self._boltOn&=~leaving
+        idle=~self._animating
+        self._animateShips(dt)
+        self._firePlayerBolts(idle,scale,left,right,up)
+        self._alienUnder()
+
+
+    # HELPER METHOD TO MOVE THE ALIENS
+    def _moveAliens(self,dt):
+        """
+        Steps the formation of each wave whose alien timer has run out
+
+        Parameter dt: time since last animation frame
+        Precondition: dt is a float
+        """
+        self._time+=dt
+        step=self._time>=ALIEN_SPEED
+        if (not step.any()):
+            return
+        self._alienStep+=step
+        everyone=np.arange(self.size)
+        col=np.where(self._leftward,self._leftCol,self._rightCol)
+        edge=self._x[everyone,col]
+        turn=np.where(self._leftward,
+                      (edge-ALIEN_WIDTH/2.0)-ALIEN_H_SEP<=0,
+                      (edge+ALIEN_WIDTH/2.0)+ALIEN_H_SEP>=GAME_WIDTH)
+        turn&=step&~self._down&(self._nOccupied>0)
+        march=step&~turn
+        self._y-=np.where(turn,ALIEN_V_WALK,0)[:,np.newaxis]
+        self._changed|=turn
+        dx=np.where(self._leftward,-1*ALIEN_H_WALK,ALIEN_H_WALK)
+        self._x+=np.where(march,dx,0)[:,np.newaxis]
+        self._time[step]=0
+        self._down=np.where(step,turn,self._down)
+        self._leftward^=turn
+
+
+    # HELPER METHOD FOR CREATING ALIEN BOLTS
+    def _makeAlienBolts(self):
+        """
+        Fires a bolt from a random column of each wave whose turn it is
+        """
+        ready=(self._alienStep>=self._randomBolt)&(self._nOccupied>0)
+        if (not ready.any()):
+            return
+        ws=np.flatnonzero(ready)
+        col=self._occupied[ws,self._randint(ws,0,self._nOccupied[ws]-1)]
+        row=self._bottom[ws,col]
+        self._fireAlien(ws,self._x[ws,col],self._y[ws,row])
+        self._alienStep[ws]=0
+        self._randomBolt[ws]=self._randint(ws,1,BOLT_RATE)
+
+
+    def _fireAlien(self,ws,x,y):
+        """
+        Puts an alien bolt in the first free slot of each wave in ws
+
+        A wave whose bolt pool is full gets no bolt, as in BoltPool.fire.
+
+        Parameter ws: the waves that fire
+        Precondition: ws is an int array of distinct waves
+
+        Parameter x, y: the center of each new bolt
+        Precondition: each is a float array of the same length as ws
+        """
+        room=self._boltOn[ws].sum(axis=1)+self._shot[ws]<BOLT_CAPACITY
+        ws=ws[room]
+        free=~self._boltOn[ws]
+        if (not free.any(axis=1).all()):
+            self._growSlots()
+            free=~self._boltOn[ws]
+        k=free.argmax(axis=1)
+        self._boltOn[ws,k]=True
+        self._boltX[ws,k]=x[room]
+        self._boltY[ws,k]=y[room]
+        self._boltFrom[ws,k]=y[room]
+
+
+    def _growSlots(self):
+        """
+        Doubles the number of alien bolt slots, up to BOLT_CAPACITY
+        """
+        slots=self._boltOn.shape[1]
+        more=min(slots*2,BOLT_CAPACITY)-slots
+        pad=((0,0),(0,more))
+        self._boltOn=np.pad(self._boltOn,pad)
+        self._boltX=np.pad(self._boltX,pad)
+        self._boltY=np.pad(self._boltY,pad)
+        self._boltFrom=np.pad(self._boltFrom,pad)
+
+
+    # HELPER METHOD TO MOVE THE ALIEN BOLTS
+    def _fireAlienBolts(self,scale):
+        """
+        Returns the mask of alien bolts that leave the screen, after moving
+        every alien bolt
+
+        The bolts that leave are still checked for collisions along the rest
+        of their path (by _collide) before they are removed, as in Wave.
+
+        Parameter scale: the number of FRAME_RATE updates this update stands for
+        Precondition: scale is a float > 0
+        """
+        dy=(-1*BOLT_SPEED)*scale
+        leaving=self._boltOn&((self._boltY+BOLT_HEIGHT/2.0)+dy<0)
+        np.copyto(self._boltFrom,self._boltY)
+        self._boltY+=dy
+        return leaving
+
+
+    # HELPER METHOD FOR COLLISION DETECTION
+    def _collide(self):
+        """
+        Checks the alien bolts against the ships and the player bolts against
+        the aliens, as Wave._collide does
+
+        Each alien bolt that hits a ship costs a life and restarts its
+        explosion. A player bolt that hits the bottom alien of a column kills it.
+        Every bolt is tested along the whole path of its last move.
+        """
+        sy=SHIP_BOTTOM+SHIP_HEIGHT/2
+        hit=sweptHits(self._boltX,self._boltY,self._boltFrom,
+                      self._shipX[:,np.newaxis],sy,SHIP_WIDTH,SHIP_HEIGHT)
+        hit&=self._boltOn
+        hit&=self._ship[:,np.newaxis]
+        if (hit.any()):
+            ws,ks=np.nonzero(hit)
+            self._boltOn[ws,ks]=False
+            hits=np.bincount(ws,minlength=self.size)
+            struck=hits>0
+            self._animating|=struck
+            self._deathTime[struck]=0
+            self._lives[struck]=(self._lives[struck]-hits[struck])%3
+        self._shootAliens(self._shot)
+
+
+    def _shootAliens(self,shot):
+        """
+        Checks the player bolts of the waves in shot against the aliens,
+        killing the bottom alien of a column when it is hit
+
+        Parameter shot: the waves whose player bolt should be checked
+        Precondition: shot is a bool array of length size, True only for waves
+        with a player bolt
+        """
+        low=np.minimum(self._shotY,self._shotFrom)-BOLT_HEIGHT/2.0
+        high=np.maximum(self._shotY,self._shotFrom)+BOLT_HEIGHT/2.0
+        near=shot&(high>self._y[:,-1]-ALIEN_HEIGHT/2.0)
+        near&=low<self._y[:,0]+ALIEN_HEIGHT/2.0
+        if (not near.any()):
+            return
+        ws=np.flatnonzero(near)
+        bx=self._shotX[ws]
+        x=self._x[ws]
+        col=np.rint((bx-x[:,0])/(ALIEN_WIDTH+ALIEN_H_SEP)).astype(np.int64)
+        col=np.clip(col,0,x.shape[1]-1)
+        row=self._bottom[ws,col]
+        ax=x[np.arange(len(ws)),col]
+        ay=self._y[ws,row]
+        hit=row>=0
+        hit&=sweptHits(bx,self._shotY[ws],self._shotFrom[ws],ax,ay,
+                       ALIEN_WIDTH,ALIEN_HEIGHT)
+        if (hit.any()):
+            self._kill(ws[hit],col[hit])
+
+
+    def _kill(self,ws,col):
+        """
+        Kills the bottom alien of one column in each wave of ws, using up the
+        player bolt, and updates the column index as Formation.kill does
+
+        Parameter ws: the waves
+        Precondition: ws is an int array of distinct waves
+
+        Parameter col: the column in each wave
+        Precondition: col is an int array of occupied columns, same length as ws
+        """
+        self._shot[ws]=False
+        self._count[ws]-=1
+        self._bottom[ws,col]-=1
+        self._changed[ws]=True
+        empty=self._bottom[ws,col]<0
+        if (not empty.any()):
+            return
+        ws=ws[empty]
+        col=col[empty]
+        self._nOccupied[ws]-=1
+        slot=self._slot[ws,col]
+        last=self._occupied[ws,self._nOccupied[ws]]
+        self._occupied[ws,slot]=last
+        self._slot[ws,last]=slot
+        alive=self._bottom[ws]>=0
+        some=alive.any(axis=1)
+        cols=alive.shape[1]
+        self._leftCol[ws]=np.where(some,alive.argmax(axis=1),-1)
+        self._rightCol[ws]=np.where(some,cols-1-alive[:,::-1].argmax(axis=1),-1)
+
+
+    # HELPER METHOD TO ANIMATE THE EXPLODING SHIPS
+    def _animateShips(self,dt):
+        """
+        Advances each ship explosion, as the animateShip coroutine does
+
+        A wave whose explosion has finished loses its ship and all of its
+        bolts, and its death flag is set.
+
+        Parameter dt: time since last animation frame
+        Precondition: dt is a float
+        """
+        if (not self._animating.any()):
+            return
+        an=self._animating
+        self._deathTime=np.where(an,self._deathTime+dt,self._deathTime)
+        frame=((self._deathTime/DEATH_SPEED)*7).astype(np.int64)
+        self._frame=np.where(an,frame,self._frame)
+        done=an&(self._deathTime>=DEATH_SPEED)
+        if (done.any()):
+            self._ship&=~done
+            self._animating&=~done
+            self._boltOn&=~done[:,np.newaxis]
+            self._shot&=~done
+            self._death|=done
+
+
+    # HELPER METHOD TO FIRE AND MOVE THE SHIPS AND THEIR BOLTS
+    def _firePlayerBolts(self,idle,scale,left,right,up):
+        """
+        Fires, moves the ship and moves the player bolt of each idle wave
+
+        Parameter idle: the waves whose ship was not exploding after _collide
+        Precondition: idle is a bool array of length size
+
+        Parameter scale: the number of FRAME_RATE updates this update stands for
+        Precondition: scale is a float > 0
+
+        Parameter left, right, up: whether each key is held down
+        Precondition: each is a bool, or a bool array of length size
+        """
+        ready=idle&self._ship
+        fire=ready&up&~self._shot
+        if (fire.any()):
+            fire&=self._boltOn.sum(axis=1)<BOLT_CAPACITY
+            self._shot|=fire
+            self._shotX=np.where(fire,self._shipX,self._shotX)
+            self._shotY[fire]=SHIP_BOTTOM+SHIP_HEIGHT/2+SHIP_HEIGHT/2.0
+            self._shotFrom[fire]=self._shotY[fire]
+
+        move=ready&(right|left)
+        if (move.any()):
+            step=np.where(right,SHIP_MOVEMENT*scale,-1*SHIP_MOVEMENT*scale)
+            x=self._shipX+step
+            low=SHIP_WIDTH/2
+            high=GAME_WIDTH-SHIP_WIDTH/2
+            x=np.where((x<=high)&(x>=low),x,np.where(x<low,low,high))
+            self._shipX=np.where(move,x,self._shipX)
+
+        shot=idle&self._shot
+        if (shot.any()):
+            dy=BOLT_SPEED*scale
+            gone=shot&((self._shotY-BOLT_HEIGHT/2.0)+dy>GAME_HEIGHT)
+            self._shotFrom=np.where(shot,self._shotY,self._shotFrom)
+            self._shotY=np.where(shot,self._shotY+dy,self._shotY)
+            if (gone.any()):
+                self._shootAliens(gone)
+                self._shot&=~gone
+
+
+    # HELPER METHOD TO DETERMINE IF ANY OF THE ALIENS ARE BELOW THE DEFENSE LINE
+    def _alienUnder(self):
+        """
+        Updates _below for each wave whose formation has descended or lost an
+        alien since the last call
+
+        The lowest live alien of a wave is in the row of its lowest column.
+        """
+        if (not self._changed.any()):
+            return
+        ws=np.flatnonzero(self._changed)
+        row=self._bottom[ws].max(axis=1)
+        y=self._y[ws,row]
+        self._below[ws]=(row>=0)&(y-ALIEN_HEIGHT/2.0<=DEFENSE_LINE)
+        self._changed[ws]=False
+
+
+    # HELPER METHODS FOR THE RANDOM NUMBER GENERATORS
+    def _next(self,ws):
+        """
+        Returns the next 64-bit value of the generator of each wave in ws
+
+        This is RandomStream.next for many waves at once.
+
+        Parameter ws: the waves
+        Precondition: ws is an int array of distinct waves
+        """
+        z=self._rng[ws]+_GOLDEN
+        self._rng[ws]=z
+        z=(z^(z>>np.uint64(30)))*_MIX1
+        z=(z^(z>>np.uint64(27)))*_MIX2
+        return z^(z>>np.uint64(31))
+
+
+    def _randint(self,ws,a,b):
+        """
+        Returns an int array with a random int in a..b for each wave in ws
+
+        This is RandomStream.randint for many waves at once, and draws the
+        same numbers.
+
+        Parameter ws: the waves
+        Precondition: ws is an int array of distinct waves
+
+        Parameter a, b: the smallest and largest values
+        Precondition: each is an int or an int array of the same length as ws,
+        with a<=b
+        """
+        n=np.zeros(len(ws),dtype=np.uint64)+np.asarray(b-a+1,dtype=np.uint64)
+        extra=(np.uint64(0)-n)%n
+        limit=np.uint64(0)-extra
+        z=self._next(ws)
+        bad=(extra!=0)&(z>=limit)
+        while bad.any():
+            z[bad]=self._next(ws[bad])
+            bad=(extra!=0)&(z>=limit)
+        return a+(z%n).astype(np.int64)
+
+
+# FUNCTIONS TO MEASURE A BATCH
+def measure(size,steps=600,dt=1/SIM_RATE,seed=0):
+    """
+    Returns the average time in seconds of one update of a batch of waves
+
+    The waves all play the scripted player of sim.py.
+
+    Parameter size: the number of waves
+    Precondition: size is an int > 0
+
+    Parameter steps: the number of updates to average over
+    Precondition: steps is an int > 0
+
+    Parameter dt: the time between frames in seconds
+    Precondition: dt is a float > 0
+
+    Parameter seed: the seed of the first wave (the others follow it)
+    Precondition: seed is an int >= 0
+    """
+    from sim import _autopilot
+
+    batch=BatchWave(size,range(seed,seed+size))
+    start=time.perf_counter()
+    for frame in range(steps):
+        keys=_autopilot(frame)
+        batch.update(dt,'left' in keys,'right' in keys,'up' in keys)
+        batch.setShip(batch.getDeath())
+        batch.setDeath(batch.getDeath())
+    return (time.perf_counter()-start)/steps
+
+
+if __name__=='__main__':
+    import sys
+    try:
+        size=int(sys.argv[4])
+    except:
+        size=10000
+    seconds=measure(size)
+    print('%d waves: %.3f ms per update, %.0f ns per wave' %
+          (size,seconds*1e3,seconds*1e9/size))
@@ -0,0 +1,362 @@
+"""
+Benchmarks for Alien Invaders
+
+This module measures the cost of the parts of the game that the headless
+tools depend on. Each benchmark is a function that prints one line per
+measurement. Run this module as a script with the name of a benchmark:
+
+    python bench.py snapshot
+
+Like the game, it also takes the formation size and speed as the first three
+arguments, before the benchmark name:
+
+    python bench.py 5 12 1.0 snapshot
+
+# Evelyn Si es828
+# 12/7/21
+"""
+from consts import *
+import multiprocessing
+import itertools
+import tracemalloc
+import time
+
+
+# HELPER FUNCTIONS
+def _timeit(fnc,repeat):
+    """
+    Returns the average time in seconds of one call to fnc
+
+    Parameter fnc: the function to time
+    Precondition: fnc is a function taking no arguments
+
+    Parameter repeat: the number of calls to average over
+    Precondition: repeat is an int > 0
+    """
+    start=time.perf_counter()
+    for i in range(repeat):
+        fnc()
+    return (time.perf_counter()-start)/repeat
+
+
+def _playedWave(steps=600,seed=1):
+    """
+    Returns a headless Wave that has been played for some steps
+
+    The player sweeps back and forth and fires whenever it can, so the wave
+    has dead aliens and bolts in flight.
+
+    Parameter steps: the number of steps to play
+    Precondition: steps is an int >= 0
+
+    Parameter seed: the seed for the Wave
+    Precondition: seed is an int >= 0
+    """
+    from wave import Wave
+    from game2d.headless import HeadlessInput
+
+    wave=Wave(headless=True,seed=seed)
+    input=HeadlessInput()
+    for i in range(steps):
+        input.set_keys(('up','left') if (i//90)%2==0 else ('up','right'))
+        wave.update(input,1/SIM_RATE)
+        if wave.getDeath() or wave.getBelow() or wave.getAlienCount()==0:
+            break
+    return wave
+
+
+def _footprint(make,count):
+    """
+    Returns (bytes, seconds) that making one object with make costs on average
+
+    The bytes are those allocated through Python (see tracemalloc), so they
+    leave out any memory that an extension module gets directly from C.
+
+    Parameter make: the function that makes an object
+    Precondition: make is a function taking no arguments
+
+    Parameter count: the number of objects to make
+    Precondition: count is an int > 0
+    """
+    start=time.perf_counter()
+    keep=[make() for i in range(count)]
+    seconds=time.perf_counter()-start
+    del keep
+    tracemalloc.start()
+    keep=[make() for i in range(count)]
+    size=tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (size/count,seconds/count)
+
+
+def _unslotted(cls):
+    """
+    Returns a subclass of cls without __slots__, so its objects have a __dict__
+
+    Parameter cls: the class to copy
+    Precondition: cls is a class with __slots__
+    """
+    return type(cls.__name__+'Dict',(cls,),{})
+
+
+def _modelFootprints(count,conn):
+    """
+    Sends the footprint of a Ship from models.py, and of a GRectangle the
+    size of a bolt, through conn
+
+    This is run in its own process, as making Kivy objects can crash a
+    process that has no GL context. It opens the Kivy window first, as that
+    is what makes the context.
+
+    Parameter count: the number of objects of each kind to make
+    Precondition: count is an int > 0
+
+    Parameter conn: the end of a pipe to send the result to
+    Precondition: conn is a multiprocessing Connection
+    """
+    import os
+    import kivy.resources
+    from kivy.core.window import Window
+    from game2d import GameApp, GRectangle
+    from models import Ship
+
+    GameApp.images=os.path.join(os.path.dirname(os.path.abspath(__file__)),'Images')
+    kivy.resources.resource_add_path(GameApp.images)
+    conn.send([('Ship',_footprint(Ship,count)),
+               ('GRectangle',_footprint(lambda: GRectangle(x=0.0,y=0.0,
+                    width=BOLT_WIDTH,height=BOLT_HEIGHT,fillcolor='black'),count))])
+
+
+def _frameTimes(wave,steps,frame):
+    """
+    Returns the time in seconds of each frame while the autopilot plays wave
+
+    A lost ship is replaced at once, so the wave plays until it is won or
+    lost or steps frames have passed.
+
+    Parameter wave: the wave to play
+    Precondition: wave is a Wave object
+
+    Parameter steps: the most frames to play
+    Precondition: steps is an int > 0
+
+    Parameter frame: the work of one frame, given the input to play it with
+    Precondition: frame is a function taking a HeadlessInput
+    """
+    from wave import ShipBody
+    from game2d.headless import HeadlessInput
+    import sim
+
+    input=HeadlessInput()
+    times=[]
+    for i in range(steps):
+        input.set_keys(sim._autopilot(i))
+        start=time.perf_counter()
+        frame(input)
+        times.append(time.perf_counter()-start)
+        if wave.getDeath():
+            wave.setDeath()
+            wave.setShip(ShipBody())
+        if wave.getBelow() or wave.getAlienCount()==0:
+            break
+    return times
+
+
+def _drawnFrames(sizes,steps,conn):
+    """
+    Sends the (mean, worst) frame time of a drawn Wave of each size through
+    conn
+
+    A frame is the update of the wave, drawing it (and so syncing its Swarm
+    or batch) into a retained GView, and rendering and flipping the window.
+    This is run in its own process, as making Kivy objects can crash a
+    process that has no window system.
+
+    Parameter sizes: the (rows, aliens per row) of each formation
+    Precondition: sizes is a sequence of pairs of ints
+
+    Parameter steps: the most frames to play for each size
+    Precondition: steps is an int > 0
+
+    Parameter conn: the end of a pipe to send the result to
+    Precondition: conn is a multiprocessing Connection
+    """
+    import os
+    import kivy.resources
+    from kivy.core.window import Window
+    from game2d import GameApp, GView
+    from wave import Wave
+
+    folder=os.path.dirname(os.path.abspath(__file__))
+    GameApp.images=os.path.join(folder,'Images')
+    GameApp.sounds=os.path.join(folder,'Sounds')
+    GameApp.fonts=os.path.join(folder,'Fonts')
+    for path in (GameApp.images,GameApp.sounds,GameApp.fonts):
+        kivy.resources.resource_add_path(path)
+    view=GView()
+    view.size=(GAME_WIDTH,GAME_HEIGHT)
+    view.retained=True
+    Window.add_widget(view)
+
+    results=[]
+    for (rows,cols) in sizes:
+        wave=Wave(seed=1,rows=rows,cols=cols)
+        def frame(input):
+            wave.update(input,1/SIM_RATE)
+            view.clear()
+            wave.draw(view)
+            view.present()
+            Window.dispatch('on_draw')
+            Window.dispatch('on_flip')
+        times=_frameTimes(wave,steps,frame)
+        results.append((sum(times)/len(times),max(times)))
+    conn.send(results)
+
+
+# BENCHMARKS
+def snapshot(repeat=20000):
+    """
+    Measures Wave.snapshot and Wave.restore on a wave in progress
+
+    Parameter repeat: the number of calls to average over
+    Precondition: repeat is an int > 0
+    """
+    wave=_playedWave()
+    data=wave.snapshot()
+    save=_timeit(wave.snapshot,repeat)
+    load=_timeit(lambda: wave.restore(data),repeat)
+    print('%dx%d wave, %d bytes: snapshot %.1f us, restore %.1f us' %
+          (ALIEN_ROWS,ALIENS_IN_ROW,len(data),save*1e6,load*1e6))
+
+
+def batch(size=10000,steps=300):
+    """
+    Measures one BatchWave update against one Wave update
+
+    Parameter size: the number of waves in the batch
+    Precondition: size is an int > 0
+
+    Parameter steps: the number of updates to average over
+    Precondition: steps is an int > 0
+    """
+    import sim
+    import batch
+
+    stats=sim.run(steps,sim._autopilot,seed=1)
+    single=stats['seconds']/stats['steps']
+    together=batch.measure(size,steps)
+    print('%d waves: %.3f ms per update, the cost of %.1f Wave updates' %
+          (size,together*1e3,together/single))
+
+
+def env(steps=50000):
+    """
+    Measures WaveEnv.step, resetting whenever an episode ends
+
+    Parameter steps: the number of steps to average over
+    Precondition: steps is an int > 0
+    """
+    from env import WaveEnv, ACTIONS
+
+    game=WaveEnv()
+    game.reset(0)
+    actions=itertools.cycle(range(len(ACTIONS)))
+    def play():
+        if game.step(next(actions))[2]:
+            game.reset(0)
+    seconds=_timeit(play,steps)
+    print('WaveEnv.step: %.1f us, %.1f million steps per hour' %
+          (seconds*1e6,3600/seconds/1e6))
+
+
+def huge(sizes=((10,15),(30,30),(100,100),(300,300),(1000,1000)),steps=600):
+    """
+    Measures the update and frame time of a Wave against the formation size
+
+    For each size it reports the time to build a headless wave, the mean and
+    worst update while the autopilot plays, and the time of Formation.pixels
+    (the work the Swarm does on the CPU when an alien dies). It then plays a
+    drawn wave of each size in a separate process, and reports the mean and
+    worst frame: update, draw and render. If that process fails (as it does
+    without a GL context), it says that drawing was skipped; the update times
+    alone are not frame times. The budget of one frame at 60 fps is 16.7 ms.
+
+    Parameter sizes: the (rows, aliens per row) of each formation
+    Precondition: sizes is a sequence of pairs of ints, each within
+    HUGE_ROWS_MAX x HUGE_IN_ROW_MAX
+
+    Parameter steps: the number of updates to play for each size
+    Precondition: steps is an int > 0
+    """
+    from wave import Wave
+
+    for (rows,cols) in sizes:
+        start=time.perf_counter()
+        wave=Wave(headless=True,seed=1,rows=rows,cols=cols)
+        build=time.perf_counter()-start
+        times=_frameTimes(wave,steps,lambda input: wave.update(input,1/SIM_RATE))
+        aliens=wave.getAliens()
+        pixels=_timeit(lambda: aliens.pixels(HUGE_COLORS),10)
+        print('%4dx%-4d %7d aliens: build %7.2f ms, update %6.3f ms mean '
+              '%6.3f ms max, pixels %6.2f ms' %
+              (rows,cols,rows*cols,build*1e3,sum(times)/len(times)*1e3,
+               max(times)*1e3,pixels*1e3))
+
+    context=multiprocessing.get_context('spawn')
+    (mine,theirs)=context.Pipe(False)
+    process=context.Process(target=_drawnFrames,args=(sizes,steps,theirs))
+    process.start()
+    process.join()
+    if (process.exitcode!=0 or not mine.poll()):
+        print('draw: skipped, no GL context (exit code %s)' % process.exitcode)
+        return
+    for ((rows,cols),(mean,worst)) in zip(sizes,mine.recv()):
+        print('%4dx%-4d %7d aliens: frame %6.3f ms mean %6.3f ms max '
+              '(update, draw and render)' %
+              (rows,cols,rows*cols,mean*1e3,worst*1e3))
+
+
+def bodies(count=10000):
+    """
+    Measures the memory and construction time of one game object, for the
+    window-free bodies in sim.py, the same bodies without __slots__, and the
+    Kivy-backed objects that would hold the same state (a Ship, and a
+    GRectangle the size of a bolt)
+
+    The Kivy objects are made in a separate process. If that process fails (as it
+    does without a GL context), their line says they were skipped.
+
+    Parameter count: the number of objects of each kind to make
+    Precondition: count is an int > 0
+    """
+    from sim import ShipBody, BoltBody
+
+    ShipDict=_unslotted(ShipBody)
+    BoltDict=_unslotted(BoltBody)
+    results=[('ShipBody',_footprint(ShipBody,count)),
+             ('ShipDict',_footprint(ShipDict,count)),
+             ('BoltBody',_footprint(lambda: BoltBody(0.0,0.0,BOLT_SPEED),count)),
+             ('BoltDict',_footprint(lambda: BoltDict(0.0,0.0,BOLT_SPEED),count))]
+    context=multiprocessing.get_context('spawn')
+    (mine,theirs)=context.Pipe(False)
+    process=context.Process(target=_modelFootprints,args=(count,theirs))
+    process.start()
+    process.join()
+    if (process.exitcode==0 and mine.poll()):
+        results.extend(mine.recv())
+    else:
+        print('Ship, GRectangle: skipped, no GL context (exit code %s)' % process.exitcode)
+    for (name,(size,seconds)) in results:
+        print('%-10s %7.0f bytes, %7.2f us to make' % (name,size,seconds*1e6))
+
+
+# The benchmarks that can be run from the command line
+BENCHMARKS = {'snapshot':snapshot,'batch':batch,'env':env,'huge':huge,
+              'bodies':bodies}
+
+
+if __name__=='__main__':
+    import sys
+    names=[arg for arg in sys.argv[1:] if arg in BENCHMARKS]
+    for name in names or sorted(BENCHMARKS):
+        BENCHMARKS[name]()
@@ -63,6 +63,19 @@ ALIENS_IN_ROW  = 12
 ALIEN_IMAGES   = ('alien1.png','alien2.png','alien3.png')
 # the number of seconds (float <= 1) between alien steps
 ALIEN_SPEED = 1.0
+# the largest number of rows drawn at full size
+ALIEN_ROWS_MAX    = 10
+# the largest number of aliens per row drawn at full size
+ALIENS_IN_ROW_MAX = 15
+# the largest number of rows in a huge formation (the stress mode)
+HUGE_ROWS_MAX     = 1000
+# the largest number of aliens per row in a huge formation
+HUGE_IN_ROW_MAX   = 1000
+# the box (in pixels) that a huge formation is shrunk to fit in
+HUGE_WIDTH  = 600
+HUGE_HEIGHT = 240
+# the color of each alien image (as RGBA bytes) when drawn in a huge formation
+HUGE_COLORS = ((134,158,135,255),(53,123,84,255),(35,86,71,255))
 
 
 ### BOLT CONSTANTS ###
@@ -102,17 +115,20 @@ everything after the word python. So if you start the game typing
 
 Python puts ['breakout.py', '3', '4', '0.5'] into sys.argv. Below, we take advantage of
 this fact to change the constants ALIEN_ROWS, ALIENS_IN_ROW, and ALIEN_SPEED.
+
+Formations larger than ALIEN_ROWS_MAX x ALIENS_IN_ROW_MAX (up to HUGE_ROWS_MAX x
+HUGE_IN_ROW_MAX) are a stress mode: the aliens are shrunk to fit and drawn as one image.
 """
 try:
     rows = int(sys.argv[1])
-    if rows >= 1 and rows <= 10:
+    if rows >= 1 and rows <= HUGE_ROWS_MAX:
         ALIEN_ROWS = rows
 except:
     pass # Use original value
 
 try:
     perrow = int(sys.argv[2])
-    if perrow >= 1 and perrow <= 15:
+    if perrow >= 1 and perrow <= HUGE_IN_ROW_MAX:
         ALIENS_IN_ROW = perrow
 except:
     pass # Use original value
@@ -137,6 +153,19 @@ ALIEN_POINTS = 10
 SPEED_FACTOR = 1.03
 # The music volume for each alien step.
 STEP_VOLUME = 0.3
+# The size (in pixels) of a square cell in the collision grid
+GRID_CELL = 64
+# The most laser bolts that can be on screen at once
+BOLT_CAPACITY = 128
+
+# The update rate (in updates per second) that SHIP_MOVEMENT and BOLT_SPEED
+# were tuned for. Movement is scaled so the game plays the same at any rate.
+FRAME_RATE = 60
+# The number of fixed simulation steps per second. Lower it to save work on
+# slow machines; the game speed stays the same.
+SIM_RATE = 60
+# The most simulation steps to run in one animation frame when catching up
+MAX_CATCHUP = 5
 
 # The font choice for labels and messages
 ARCADE_FONT = 'Arcade.ttf'
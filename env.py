@@ -0,0 +1,192 @@
+"""
+Environment module for Alien Invaders
+
+This module contains the class WaveEnv, which wraps a headless Wave in the
+reset/step interface of a reinforcement learning environment. It is meant for
+training agents at millions of steps per hour, so a step allocates as little as
+possible: the observation is a fixed dictionary of NumPy views into one
+preallocated buffer, updated in place. Code that keeps an observation across
+steps must copy it.
+
+# Evelyn Si es828
+# 12/7/21
+"""
+from consts import *
+import numpy as np
+
+# PRIMARY RULE: Like sim.py, this module must never import Kivy, directly or
+# indirectly.
+
+# The keys held down for each action
+ACTIONS = ((),('left',),('right',),('up',),('left','up'),('right','up'))
+
+
+class WaveEnv(object):
+    """
+    A class to play a headless Wave one step at a time.
+
+    An action is an index into ACTIONS. Each step plays one update of 1/SIM_RATE
+    seconds. When the ship is destroyed and lives remain, the next ship is given
+    at once, as if the player had pressed 's' in the paused state. The reward
+    of a step is ALIEN_POINTS for each alien killed. The episode is done when
+    every alien is dead, an alien is below the defense line, or the last ship
+    is destroyed.
+
+    The observation is a dictionary of views into one float buffer:
+    'ship' is [x, 1 if there is a ship else 0], 'x' and 'y' are the alien
+    centers and 'alive' the alive mask (each rows x cols), 'bolts' holds
+    [active, x, y, velocity] for each bolt slot (BOLT_CAPACITY x 4), and
+    'all' is the whole buffer, for a model that takes one flat vector.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _wave: the wave being played
+    # Invariant: _wave is a headless Wave, or None before the first reset
+    #
+    # Attribute _inputs: a scripted input for each action
+    # Invariant: _inputs is a tuple of HeadlessInput, one per action
+    #
+    # Attribute _buffer: the storage for every observation
+    # Invariant: _buffer is a 1d float array
+    #
+    # Attribute _obs: the observation, as views into _buffer
+    # Invariant: _obs is a dictionary with the keys in the class description
+    #
+    # Attribute _info: the extra information returned by step
+    # Invariant: _info is a dictionary with the keys 'seed', 'lives', 'aliens'
+    # and 'steps'
+    #
+    # Attribute _synced: the (version, count) of the formation last copied
+    # Invariant: _synced is a pair of ints, or None
+    #
+    # Attribute _filled: the bolt slots written to the observation last step
+    # Invariant: _filled is a list of ints
+    #
+    # Attribute _done: whether the episode is over
+    # Invariant: _done is a bool
+
+    # GETTERS
+    def getWave(self):
+        """
+        Returns the wave being played, or None before the first reset
+        """
+        return self._wave
+
+
+    # INITIALIZER TO ALLOCATE THE BUFFERS
+    def __init__(self):
+        """
+        Initializes the environment and its observation buffer
+
+        Call reset before the first step.
+        """
+        from game2d.headless import HeadlessInput
+
+        rows=ALIEN_ROWS
+        cols=ALIENS_IN_ROW
+        cells=rows*cols
+        self._buffer=np.zeros(2+3*cells+4*BOLT_CAPACITY)
+        b=self._buffer
+        self._obs={'ship':b[0:2],
+                   'x':b[2:2+cells].reshape(rows,cols),
+                   'y':b[2+cells:2+2*cells].reshape(rows,cols),
+                   'alive':b[2+2*cells:2+3*cells].reshape(rows,cols),
+                   'bolts':b[2+3*cells:].reshape(BOLT_CAPACITY,4),
+                   'all':b}
+        self._inputs=tuple(HeadlessInput(keys) for keys in ACTIONS)
+        self._info={'seed':None,'lives':0,'aliens':0,'steps':0}
+        self._wave=None
+        self._synced=None
+        self._filled=[]
+        self._done=True
+
+
+    # METHODS TO PLAY AN EPISODE
+    def reset(self,seed=None):
+        """
+        Returns the first observation of a new episode
+
+        Parameter seed: the seed for the wave, or None for a fresh one
+        Precondition: seed is None or an int in 0..2**64-1
+        """
+        from wave import Wave
+
+        self._wave=Wave(headless=True,seed=seed)
+        self._synced=None
+        self._done=False
+        self._info['seed']=self._wave.getSeed()
+        self._info['steps']=0
+        self._observe()
+        return self._obs
+
+
+    def step(self,action):
+        """
+        Returns (observation, reward, done, info) after playing one step
+
+        The observation and info are the same objects on every step, updated
+        in place.
+
+        Parameter action: the index of the keys to hold down
+        Precondition: action is an int in 0..len(ACTIONS)-1, and the episode
+        is not done
+        """
+        from wave import ShipBody
+
+        assert not self._done, 'the episode is over; call reset'
+        wave=self._wave
+        before=wave.getAlienCount()
+        wave.update(self._inputs[action],1/SIM_RATE)
+        reward=ALIEN_POINTS*(before-wave.getAlienCount())
+        if wave.getDeath():
+            if wave.getLives()==0:
+                self._done=True
+            else:
+                wave.setDeath()
+                wave.setShip(ShipBody())
+        if wave.getAlienCount()==0 or wave.getBelow():
+            self._done=True
+        self._info['steps']=self._info['steps']+1
+        self._observe()
+        return (self._obs,reward,self._done,self._info)
+
+
+    # HELPER METHOD TO FILL THE OBSERVATION
+    def _observe(self):
+        """
+        Copies the state of the wave into the observation buffer
+
+        The formation is only copied when it has moved or lost an alien, and
+        only the bolt slots that are (or were) active are written.
+        """
+        wave=self._wave
+        ship=wave.getShip()
+        obs=self._obs
+        if (ship!=None):
+            obs['ship'][0]=ship.x
+            obs['ship'][1]=1.0
+        else:
+            obs['ship'][1]=0.0
+
+        aliens=wave.getAliens()
+        state=(aliens.version,aliens.count())
+        if (state!=self._synced):
+            np.copyto(obs['x'],aliens.x)
+            np.copyto(obs['y'],aliens.y)
+            np.copyto(obs['alive'],aliens.alive)
+            self._synced=state
+
+        bolts=obs['bolts']
+        for i in self._filled:
+            bolts[i,0]=0.0
+        pool=wave.getBolts()
+        self._filled=pool.indices()
+        for i in self._filled:
+            b=pool.get(i)
+            row=bolts[i]
+            row[0]=1.0
+            row[1]=b.x
+            row[2]=b.y
+            row[3]=b.getVelocity()
+
+        self._info['lives']=wave.getLives()
+        self._info['aliens']=aliens.count()
@@ -4,13 +4,43 @@ A module to support simple 2D game development.
 This module is a simple wrapper around Kivy interfaces to make 2D game development
 simpler for students in CS 1110.
 
+The Kivy-backed classes are loaded on first access, so importing this package (or
+using :class:`HeadlessInput` or :class:`TextureCache`) does not start Kivy.
+
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from .gobject import GObject, GScene
-from .grectangle import GRectangle, GEllipse, GImage, GLabel
-from .gsprite import GSprite
-from .gpath import GPath, GTriangle, GPolygon
-from .gview import GInput, GView
-from .sound import Sound, SoundLibrary
-from .app import GameApp
\ No newline at end of file
+from .headless import HeadlessInput
+from .cache import TextureCache
+
+# The Kivy-backed classes, and the submodule that defines each
+_KIVY_CLASSES = {
+    'GObject': '.gobject', 'GScene': '.gobject',
+    'GRectangle': '.grectangle', 'GEllipse': '.grectangle',
+    'GImage': '.grectangle', 'GLabel': '.grectangle', 'GBitmap': '.grectangle',
+    'GSprite': '.gsprite',
+    'GBatch': '.gbatch',
+    'TextureAtlas': '.atlas', 'Preloader': '.preload',
+    'GPath': '.gpath', 'GTriangle': '.gpath', 'GPolygon': '.gpath',
+    'GInput': '.gview', 'GView': '.gview',
+    'Sound': '.sound', 'SoundLibrary': '.sound',
+    'GameApp': '.app',
+}
+
+__all__ = list(_KIVY_CLASSES)+['HeadlessInput','TextureCache']
+
+
+def __getattr__(name):
+    """
+    Returns: the Kivy-backed class ``name``, importing its submodule on demand
+
+    :param name: The attribute name
+    :type name:  ``str``
+    """
+    if name not in _KIVY_CLASSES:
+        raise AttributeError('module %s has no attribute %s' % (repr(__name__),repr(name)))
+
+    import importlib
+    value = getattr(importlib.import_module(_KIVY_CLASSES[name],__name__),name)
+    globals()[name] = value
+    return value
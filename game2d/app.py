@@ -19,6 +19,9 @@ from kivy.clock  import Clock
 import numpy as np
 
 import os.path
+import weakref
+
+from .cache import TextureCache
 
 class GameApp(kivy.app.App):
     """
@@ -40,7 +43,10 @@ class GameApp(kivy.app.App):
     thing you should have in this method are calls to ``self.view.draw()``.
     """
     # Class attribute for tracking textures (to reduce memory footprint)
-    TEXTURE_CACHE = {}
+    TEXTURE_CACHE = TextureCache()
+    
+    # Class attribute for the images packed into a few textures (see build_atlas)
+    ATLAS = None
     
     
     # MUTABLE ATTRIBUTES
@@ -65,6 +71,47 @@ class GameApp(kivy.app.App):
         self._fps = value
         Clock.schedule_interval(self._refresh,1.0/self._fps)
     
+    @property
+    def rate(self):
+        """
+        The number of fixed simulation steps per second, or None
+        
+        If this value is None (the default), :meth:`update` is called once per animation
+        frame with the actual time since the last frame.  Otherwise, the time of each 
+        frame is added to an accumulator, and :meth:`update` is called with ``1/rate``
+        once for every whole step in the accumulator.  This decouples the game speed 
+        from the frame rate, so a slow machine can use a lower rate.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._rate
+    
+    @rate.setter
+    def rate(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._rate = value
+        self._accum = 0.0
+    
+    @property
+    def catchup(self):
+        """
+        The most fixed simulation steps to run in a single animation frame
+        
+        This only matters if :attr:`rate` is not None.  If a frame takes so long that
+        more steps are owed than this, the extra time is dropped and the game slows
+        down, rather than spending ever longer catching up.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._catchup
+    
+    @catchup.setter
+    def catchup(self,value):
+        assert type(value) == int, 'value %s is not an int' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._catchup = value
+    
     
     # IMMUTABLE PROPERTIES
     @property
@@ -109,6 +156,20 @@ class GameApp(kivy.app.App):
         """
         return self._input
     
+    @property
+    def loaded(self):
+        """
+        The fraction of the game assets loaded so far
+        
+        When the game starts, a :class:`Preloader` loads the files in the **Images**, 
+        **Sounds** and **Fonts** folders in the background.  This value goes from 0 to 1
+        as it does, so that the game can show a loading screen.  Objects made before it
+        is 1 still work, but may stall the game while they load their files.
+        
+        **Invariant**: Must be a float in the range 0..1.
+        """
+        return 1.0 if self._preloader is None else self._preloader.progress
+    
     # CLASS METHODS
     @classmethod
     def is_image(cls,name):
@@ -169,8 +230,10 @@ class GameApp(kivy.app.App):
         """
         Returns: The texture for the given file name, or None if it cannot be loaded
         
-        The ``name`` must refer to the file in the **Images** folder.  If the texture
-        has already been loaded, it will return the cached texture.  Otherwise, it will
+        The ``name`` must refer to the file in the **Images** folder.  If the image is
+        in the :attr:`ATLAS`, it will return the region of the atlas that holds it.  If
+        the texture has already been loaded (and not since dropped from the bounded
+        :attr:`TEXTURE_CACHE`), it will return the cached texture.  Otherwise, it will
         load the texture and cache it before returning it.
         
         This method will crash if name is not a valid file.
@@ -179,8 +242,11 @@ class GameApp(kivy.app.App):
         :type name:  ``str``
         """
         assert cls.is_image(name), '%s is not an image file' % repr(name)
-        if name in cls.TEXTURE_CACHE:
-            return cls.TEXTURE_CACHE[name]
+        if cls.ATLAS is not None and name in cls.ATLAS:
+            return cls.ATLAS.region(name)
+        texture = cls.TEXTURE_CACHE.get(name)
+        if texture is not None:
+            return texture
         
         try:
             from kivy.core.image import Image
@@ -191,6 +257,83 @@ class GameApp(kivy.app.App):
         
         return texture
     
+    @classmethod
+    def hold_textures(cls,owner,names):
+        """
+        Returns: A handle that keeps the given textures pinned in the cache while in use
+        
+        The textures for ``names`` are pinned in :attr:`TEXTURE_CACHE` until ``owner`` is
+        garbage collected, or until the handle is called, whichever comes first.  This is
+        how the drawables keep the textures they show from being dropped.
+        
+        :param owner: The object using the textures
+        :type owner:  any object that supports weak references
+        
+        :param names: The file names of the textures (None entries are skipped)
+        :type names:  ``list`` of ``str`` or ``None``
+        
+        :return: the handle that unpins the textures
+        :rtype:  ``weakref.finalize``
+        """
+        names = [name for name in names if name is not None]
+        for name in names:
+            cls.TEXTURE_CACHE.pin(name)
+        return weakref.finalize(owner,cls._release_textures,names)
+    
+    @classmethod
+    def _release_textures(cls,names):
+        """
+        Unpins the textures for the given names (the callback of :meth:`hold_textures`)
+        
+        :param names: The file names of the textures
+        :type names:  ``list`` of ``str``
+        """
+        for name in names:
+            cls.TEXTURE_CACHE.unpin(name)
+    
+    @classmethod
+    def build_atlas(cls,source=None,images=None):
+        """
+        Returns: The atlas of the images in the **Images** folder, which is now :attr:`ATLAS`
+        
+        If ``source`` is None, every image in the folder is decoded and packed into a few
+        textures.  Otherwise, it names an atlas in the folder made ahead of time with the
+        ``kivy.atlas`` tool, which is read instead.  From then on :meth:`load_texture`
+        returns regions of the atlas, so objects made from these images share textures.
+        
+        If ``images`` is given, those pixels are packed in place of decoding the folder.
+        This is how the :class:`Preloader` builds the atlas once its thread has decoded
+        the images.
+        
+        This method must be called on the main thread, once the window exists.  It is
+        called for you when the game starts, unless the game was made with ``atlas=False``.
+        
+        :param source: The file name of an atlas made ahead of time, or None
+        :type source:  ``str`` or ``None``
+        
+        :param images: The pixels of each image (as given by ``atlas.decode``), or None
+        :type images:  ``dict`` or ``None``
+        """
+        from .atlas import TextureAtlas, decode
+        if source is not None:
+            assert type(source) == str and os.path.exists(os.path.join(cls.images,source)), \
+                    '%s is not an atlas file' % repr(source)
+            cls.ATLAS = TextureAtlas.read(os.path.join(cls.images,source))
+            return cls.ATLAS
+        
+        if images is not None:
+            cls.ATLAS = TextureAtlas.build(images)
+            return cls.ATLAS
+        
+        images = {}
+        for name in sorted(os.listdir(cls.images)):
+            try:
+                images[name] = decode(os.path.join(cls.images,name))
+            except:
+                pass
+        cls.ATLAS = TextureAtlas.build(images)
+        return cls.ATLAS
+    
     @classmethod
     def unload_texture(cls,name):
         """
@@ -226,6 +369,12 @@ class GameApp(kivy.app.App):
         The game window will not show until you start the game. To start the game, use 
         the method ``run()``.
         
+        The keyword ``atlas`` decides what :meth:`build_atlas` does when the game starts.
+        If it is True (the default), the images are packed into an atlas once they are
+        loaded (see :attr:`loaded`).  If it is the name of an atlas file in the **Images**
+        folder, that atlas is read instead.  If it is False, every image is loaded as a
+        texture of its own.
+        
         **You will never call the constructor or run yourself**.  That is handled for 
         you in the provided code.
         
@@ -235,6 +384,9 @@ class GameApp(kivy.app.App):
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        r = keywords.pop('rate', None)
+        c = keywords.pop('catchup', 5)
+        a = keywords.pop('atlas', True)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
@@ -244,6 +396,11 @@ class GameApp(kivy.app.App):
         self._gwidth = w
         self._gheight = h
         self._fps = f
+        self.rate = r
+        self.catchup = c
+        assert type(a) in [bool,str], 'atlas %s is not a bool or file name' % repr(a)
+        self._atlas = a
+        self._preloader = None
         
         Config.set('graphics', 'width', str(self.width))
         Config.set('graphics', 'height', str(self.height))
@@ -334,12 +491,19 @@ class GameApp(kivy.app.App):
         Bootstraps the clock scheduler for the game..
         
         This method is a callback-proxy for method `start`.  It handles important issues 
-        behind the scenes, particularly with setting the FPS
+        behind the scenes, particularly with setting the FPS.  It also starts loading the
+        game assets in the background (see :attr:`loaded`).
         """
+        from .preload import Preloader
         if (self.fps < 60):
             Clock.schedule_interval(self._refresh,1.0/self.fps)
         else:
             Clock.schedule_interval(self._refresh,0)
+        if type(self._atlas) == str:
+            GameApp.build_atlas(self._atlas)
+        images = None if type(self._atlas) == str else GameApp.images
+        self._preloader = Preloader(images,GameApp.sounds,GameApp.fonts,self._atlas is True)
+        self._preloader.start()
         self.start()
     
     def _refresh(self,dt):
@@ -348,13 +512,29 @@ class GameApp(kivy.app.App):
         
         This method a callback-proxy for the methods `update` and `draw`.  It handles
         important issues behind the scenes, particularly with clearing the window.
+        If :attr:`rate` is set, it also runs the fixed simulation steps owed.  Until the
+        assets are loaded, it first uploads the images decoded since the last frame.
         
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
+        if self._preloader is not None and not self._preloader.finished:
+            self._preloader.poll()
         self.view.clear()
-        self.update(dt)
+        if self._rate is None:
+            self.update(dt)
+        else:
+            step = 1.0/self._rate
+            self._accum += dt
+            count = 0
+            while self._accum >= step and count < self._catchup:
+                self.update(step)
+                self._accum -= step
+                count += 1
+            if self._accum >= step:
+                self._accum %= step
         self.draw()
+        self.view.present()
     
     def _setpaths(self):
         """
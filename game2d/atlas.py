@@ -0,0 +1,229 @@
+"""
+Texture atlas support for 2D game support.
+
+This module packs many small images into a few large textures, so that drawing them
+does not switch textures between every image.  :meth:`GameApp.build_atlas` uses it to
+pack the **Images** folder when the game starts, after which :meth:`GameApp.load_texture`
+(and so :class:`GImage`, :class:`GSprite` and :class:`GBatch`) returns a region of the
+atlas in place of a texture of its own.
+
+Decoding an image with :func:`decode` does not touch the graphics card, so it is safe
+off the main thread.  Making a :class:`TextureAtlas` uploads the pixels, so it is not.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+import os
+import numpy as np
+
+
+def decode(path):
+    """
+    Returns the pixels of the given image file, with the bottom row first
+
+    :param path: The path to the image file
+    :type path:  ``str``
+
+    :return: the pixels of the image, as four bytes (red, green, blue, alpha) each
+    :rtype:  ``numpy.ndarray`` of ``uint8`` with shape (height,width,4)
+    """
+    from kivy.core.image import ImageLoader
+    data = ImageLoader.load(path)._data[0]
+    channels = len(data.fmt)
+    pixels = np.frombuffer(data.data,dtype=np.uint8).reshape(data.height,-1)
+    pixels = pixels[:,:data.width*channels].reshape(data.height,data.width,channels)
+    if data.fmt in ('bgr','bgra'):
+        pixels = pixels[:,:,[2,1,0]+list(range(3,channels))]
+    if channels == 3:
+        alpha = np.full((data.height,data.width,1),255,dtype=np.uint8)
+        pixels = np.concatenate((pixels,alpha),axis=2)
+    if data.flip_vertical:
+        pixels = pixels[::-1]
+    return np.ascontiguousarray(pixels)
+
+
+def pack(sizes,width,height,padding=1):
+    """
+    Returns a place for each rectangle on pages of at most the given size
+
+    The rectangles are put on shelves from the tallest to the shortest, left to right,
+    with ``padding`` empty pixels around each one.  A shelf that would make the page
+    taller than ``height`` starts a new page, and a rectangle wider than a page gets a
+    page of its own.  No rectangle may be taller than a page.  The result is a list with a triple (page, x, y) for each
+    rectangle, in the order of ``sizes``, and a list of the (width, height) of each
+    page.
+
+    :param sizes: The (width, height) of each rectangle
+    :type sizes:  ``list`` of pairs of ``int``
+
+    :param width: The width of a page
+    :type width:  ``int`` > 0
+
+    :param height: The largest height of a page
+    :type height:  ``int`` > 0
+
+    :param padding: The space to leave around each rectangle
+    :type padding:  ``int`` >= 0
+
+    :return: the place of each rectangle, and the size of each page
+    :rtype:  pair of ``list``
+    """
+    order = sorted(range(len(sizes)),key=lambda i: (-sizes[i][1],-sizes[i][0]))
+    places = [None]*len(sizes)
+    pages = []
+    page = None
+    for i in order:
+        (w,h) = sizes[i]
+        assert h+2*padding <= height, 'rectangle %s is taller than a page' % repr(sizes[i])
+        if w+2*padding > width:
+            places[i] = (len(pages),padding,padding)
+            pages.append([w+2*padding,h+2*padding])
+            continue
+        if page is None or x+w+2*padding > width:
+            if page is None or pages[page][1]+h+2*padding > height:
+                page = len(pages)
+                pages.append([width,0])
+            x = 0
+            y = pages[page][1]
+            pages[page][1] = y+h+2*padding
+        places[i] = (page,x+padding,y+padding)
+        x += w+2*padding
+    return (places,[tuple(p) for p in pages])
+
+
+class TextureAtlas(object):
+    """
+    A class representing images packed into a few textures.
+
+    An atlas maps the file name of each image it holds to a region of one of its pages.
+    A region is a texture in its own right, so it can be used (and cut up further, as
+    :class:`GSprite` does) anywhere the texture of the image would be.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def pages(self):
+        """
+        The textures that the images are packed into.
+
+        **invariant**: Value is a ``list`` of textures.
+        """
+        return self._pages
+
+    @property
+    def names(self):
+        """
+        The file names of the images in this atlas.
+
+        **invariant**: Value is a ``list`` of ``str``.
+        """
+        return list(self._regions)
+
+
+    # BUILT-IN METHODS
+    def __init__(self,pages,regions):
+        """
+        Creates an atlas from textures that are already packed.
+
+        Use :meth:`build` to pack images, or :meth:`read` to load an atlas made by the
+        ``kivy.atlas`` tool.
+
+        :param pages: The packed textures
+        :type pages:  ``list`` of textures
+
+        :param regions: The region of a page holding each image, by file name
+        :type regions:  ``dict``
+        """
+        self._pages = pages
+        self._regions = regions
+
+    def __contains__(self,name):
+        """
+        :return: True if the image ``name`` is in this atlas
+        :rtype:  ``bool``
+        """
+        return name in self._regions
+
+    def __len__(self):
+        """
+        :return: The number of images in this atlas
+        :rtype:  ``int``
+        """
+        return len(self._regions)
+
+
+    # PUBLIC METHODS
+    def region(self,name):
+        """
+        Returns the region of the atlas holding the image ``name``
+
+        :param name: The file name of the image
+        :type name:  ``str`` in this atlas
+
+        :return: the region holding the image
+        :rtype:  texture
+        """
+        return self._regions[name]
+
+    @classmethod
+    def build(cls,images,width=1024,height=1024,padding=1):
+        """
+        Returns a new atlas holding the given images
+
+        The images are packed with :func:`pack` and uploaded one page at a time.  This
+        must be called on the main thread.
+
+        :param images: The pixels of each image (as given by :func:`decode`), by file name
+        :type images:  ``dict``
+
+        :param width: The width of each page
+        :type width:  ``int`` > 0
+
+        :param height: The largest height of each page
+        :type height:  ``int`` > 0
+
+        :param padding: The space to leave around each image
+        :type padding:  ``int`` >= 0
+        """
+        from kivy.graphics.texture import Texture
+        names = list(images)
+        sizes = [(images[n].shape[1],images[n].shape[0]) for n in names]
+        (places,shapes) = pack(sizes,width,height,padding)
+
+        buffers = [np.zeros((h,w,4),dtype=np.uint8) for (w,h) in shapes]
+        for (name,(w,h),(page,x,y)) in zip(names,sizes,places):
+            buffers[page][y:y+h,x:x+w] = images[name]
+
+        pages = []
+        for data in buffers:
+            texture = Texture.create(size=(data.shape[1],data.shape[0]),colorfmt='rgba')
+            texture.blit_buffer(data.tobytes(),colorfmt='rgba',bufferfmt='ubyte')
+            pages.append(texture)
+
+        regions = {}
+        for (name,(w,h),(page,x,y)) in zip(names,sizes,places):
+            regions[name] = pages[page].get_region(x,y,w,h)
+        return cls(pages,regions)
+
+    @classmethod
+    def read(cls,path):
+        """
+        Returns the atlas stored in the given ``.atlas`` file
+
+        The file is one made ahead of time with the ``kivy.atlas`` tool.  That tool names
+        each image by its file name without the extension; the images keep the full
+        names of the files they came from, as long as those files are next to the atlas.
+
+        :param path: The path to the ``.atlas`` file
+        :type path:  ``str``
+        """
+        from kivy.atlas import Atlas
+        atlas = Atlas(path)
+        folder = os.path.dirname(path)
+        files = os.listdir(folder) if folder else os.listdir('.')
+        regions = {}
+        for name in files:
+            key = os.path.splitext(name)[0]
+            if key in atlas.textures:
+                regions[name] = atlas.textures[key]
+        return cls(list(atlas.original_textures),regions)
@@ -0,0 +1,242 @@
+"""
+A bounded texture cache for 2D game support.
+
+This module provides :class:`TextureCache`, the class of :attr:`GameApp.TEXTURE_CACHE`.
+It keeps the most recently used textures up to a memory budget, so that a game that
+cycles through many images does not hold on to all of them.  Nothing in this module
+imports Kivy; a texture is anything with a ``width`` and a ``height``.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+from collections import OrderedDict
+
+
+class TextureCache(object):
+    """
+    A class representing a least-recently-used cache of textures, keyed by file name.
+
+    Every texture is charged ``width*height*4`` bytes (four bytes per pixel).  When the
+    total is over :attr:`budget`, the textures used least recently are dropped until it
+    is not.  A texture that is pinned (see :meth:`pin`) is never dropped, so the total
+    stays over the budget for as long as the pinned textures alone are.
+
+    The cache counts its :attr:`hits` and :attr:`misses` (lookups with :meth:`get`) and
+    its :attr:`evictions` (textures dropped to stay in the budget).
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def budget(self):
+        """
+        The most bytes of textures this cache keeps, unless they are pinned.
+
+        Lowering the budget drops textures right away.
+
+        **invariant**: Value must be an ``int`` >= 0.
+        """
+        return self._budget
+
+    @budget.setter
+    def budget(self,value):
+        assert type(value) == int, 'value %s is not an int' % repr(value)
+        assert value >= 0, 'value %s is negative' % repr(value)
+        self._budget = value
+        self._evict()
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def bytes(self):
+        """
+        The number of bytes charged for the textures in this cache.
+
+        **invariant**: Value is an ``int`` >= 0.
+        """
+        return self._bytes
+
+    @property
+    def hits(self):
+        """
+        The number of lookups that found their texture.
+
+        **invariant**: Value is an ``int`` >= 0.
+        """
+        return self._hits
+
+    @property
+    def misses(self):
+        """
+        The number of lookups that did not find their texture.
+
+        **invariant**: Value is an ``int`` >= 0.
+        """
+        return self._misses
+
+    @property
+    def evictions(self):
+        """
+        The number of textures dropped to stay within the budget.
+
+        **invariant**: Value is an ``int`` >= 0.
+        """
+        return self._evictions
+
+
+    # BUILT-IN METHODS
+    def __init__(self,budget=128*1024*1024):
+        """
+        Creates a new empty cache.
+
+        :param budget: The most bytes of textures to keep (default 128 MiB)
+        :type budget:  ``int`` >= 0
+        """
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._pins = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self.budget = budget
+
+    def __contains__(self,name):
+        """
+        :return: True if the texture for ``name`` is in this cache
+        :rtype:  ``bool``
+        """
+        return name in self._entries
+
+    def __len__(self):
+        """
+        :return: The number of textures in this cache
+        :rtype:  ``int``
+        """
+        return len(self._entries)
+
+    def __getitem__(self,name):
+        """
+        Returns the texture for ``name``, which is now the most recently used
+
+        Unlike :meth:`get`, this does not count as a hit or a miss.
+
+        :param name: The file name
+        :type name:  ``str`` in this cache
+        """
+        self._entries.move_to_end(name)
+        return self._entries[name]
+
+    def __setitem__(self,name,texture):
+        """
+        Adds (or replaces) the texture for ``name``, dropping old textures if needed
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :param texture: The texture
+        :type texture:  any value with a ``width`` and a ``height``
+        """
+        if name in self._entries:
+            self._remove(name)
+        size = 4*int(texture.width)*int(texture.height)
+        self._entries[name] = texture
+        self._sizes[name] = size
+        self._bytes += size
+        self._evict()
+
+    def __delitem__(self,name):
+        """
+        Removes the texture for ``name`` from this cache
+
+        :param name: The file name
+        :type name:  ``str`` in this cache
+        """
+        self._remove(name)
+
+
+    # PUBLIC METHODS
+    def get(self,name):
+        """
+        Returns the texture for ``name``, or None if it is not in this cache
+
+        A texture found is now the most recently used.  This counts as a hit or a miss.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        if name in self._entries:
+            self._hits += 1
+            return self[name]
+        self._misses += 1
+        return None
+
+    def pin(self,name):
+        """
+        Keeps the texture for ``name`` from being dropped, until it is unpinned
+
+        Pins are counted, so a texture stays pinned until :meth:`unpin` is called as
+        many times as this method was.  A name may be pinned before its texture is
+        added.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        self._pins[name] = self._pins.get(name,0)+1
+
+    def unpin(self,name):
+        """
+        Undoes one call to :meth:`pin` for ``name``
+
+        Once a texture has no pins left, it may be dropped to stay within the budget.
+
+        :param name: The file name
+        :type name:  ``str`` that is pinned
+        """
+        assert self._pins.get(name,0) > 0, '%s is not pinned' % repr(name)
+        self._pins[name] -= 1
+        if self._pins[name] == 0:
+            del self._pins[name]
+            self._evict()
+
+    def is_pinned(self,name):
+        """
+        :return: True if the texture for ``name`` is pinned
+        :rtype:  ``bool``
+        """
+        return name in self._pins
+
+    def clear(self):
+        """
+        Removes every texture from this cache, pinned or not
+
+        The pins and the counters are kept.
+        """
+        self._entries.clear()
+        self._sizes.clear()
+        self._bytes = 0
+
+
+    # HIDDEN METHODS
+    def _remove(self,name):
+        """
+        Removes the texture for ``name`` and its charge
+
+        :param name: The file name
+        :type name:  ``str`` in this cache
+        """
+        del self._entries[name]
+        self._bytes -= self._sizes.pop(name)
+
+    def _evict(self):
+        """
+        Drops the least recently used unpinned textures until the cache fits in the
+        budget, or only pinned textures are left
+        """
+        if self._bytes <= self._budget:
+            return
+        for name in list(self._entries):
+            if self._bytes <= self._budget:
+                break
+            if not name in self._pins:
+                self._remove(name)
+                self._evictions += 1
@@ -0,0 +1,234 @@
+"""
+A drawable for many rectangles that share a few textures.
+
+This module provides :class:`GBatch`, which draws any number of axis-aligned
+rectangles with one Kivy ``Mesh`` per texture.  A scene of a hundred :class:`GImage`
+objects needs a hundred sets of transform and rectangle instructions; a batch of the
+same rectangles needs one mesh for each distinct image, no matter how many there are.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+from kivy.graphics import *
+from kivy.graphics.instructions import *
+from .gobject import GObject
+from .app import GameApp
+import numpy as np
+
+# The most rectangles one mesh can hold (Kivy indices are unsigned shorts)
+MAX_QUADS = 65535//4
+
+
+class GBatch(GObject):
+    """
+    A class representing many unrotated rectangles drawn with a few meshes.
+
+    A batch has a list of image files in the attribute ``sources``.  Each source is a
+    layer, and the rectangles of a layer are all drawn with that image, in one ``Mesh``.
+    The layers are drawn in order.  A source of ``None`` is a layer of solid rectangles
+    in the ``fillcolor`` of the batch; otherwise ``fillcolor`` tints the images, as it
+    does for :class:`GImage`.  Layers whose images share a texture (as the images of
+    the :attr:`GameApp.ATLAS` do) are drawn together with a single mesh, in the place
+    of the first of them.
+
+    The rectangles of a layer are set all at once with :meth:`set_quads`, relative to
+    the center (x,y) of the batch.  Their corners are written into a NumPy buffer that
+    the mesh reads in place, so changing them does not rebuild the drawing cache, and
+    moving or rotating the batch moves all of them at once.  The buffer only grows when
+    a layer gets more rectangles than it ever had.
+
+    The attributes ``width`` and ``height`` of a batch are not used for drawing.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def sources(self):
+        """
+        The image file for each layer of this batch.
+
+        **invariant**: Value is a tuple of strings refering to valid files, or ``None``.
+        """
+        return self._sources
+
+    @property
+    def count(self):
+        """
+        The number of rectangles in this batch, over all of the layers.
+
+        **invariant**: Value is an ``int`` >= 0.
+        """
+        return sum(self._sizes)
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new batch with no rectangles.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes. For example, to make a
+        batch of images of ``alien1.png`` and ``alien2.png`` about (100,200), use::
+
+            GBatch(x=100,y=200,sources=['alien1.png','alien2.png'])
+
+        This class supports the all same keywords as :class:`GObject`; the only new
+        keyword is ``sources``.  If it is missing, the batch has one layer of solid
+        rectangles.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        sources = tuple(keywords.pop('sources')) if 'sources' in keywords else (None,)
+        for source in sources:
+            assert source is None or GameApp.is_image(source), '%s is not an image file' % repr(source)
+        self._sources = sources
+        self._sizes = [0]*len(sources)
+        self._verts = [np.zeros((0,4,4),dtype=np.float32) for s in sources]
+        self._index = [np.zeros((0,6),dtype=np.uint16) for s in sources]
+        self._meshes = []
+        self._groups = []
+        self._merged = []
+        self._held = None
+        GObject.__init__(self,**keywords)
+        self._reset()
+        self._defined = True
+
+
+    # PUBLIC METHODS
+    def set_quads(self,layer,quads):
+        """
+        Replaces the rectangles of the given layer.
+
+        Each rectangle is a row (x, y, width, height) giving its center relative to the
+        center of this batch, and its size.
+
+        :param layer: the layer to change
+        :type layer:  ``int`` in 0..len(sources)-1
+
+        :param quads: the rectangles, one per row
+        :type quads:  array-like of shape (N,4) with N <= ``MAX_QUADS``
+        """
+        quads = np.asarray(quads,dtype=np.float32).reshape(-1,4)
+        size = len(quads)
+        assert size <= MAX_QUADS, 'a layer cannot have more than %d rectangles' % MAX_QUADS
+        if size > len(self._verts[layer]):
+            self._grow(layer,min(max(size,2*len(self._verts[layer])),MAX_QUADS))
+
+        verts = self._verts[layer]
+        left  = quads[:,0]-quads[:,2]/2.0
+        right = quads[:,0]+quads[:,2]/2.0
+        bottom = quads[:,1]-quads[:,3]/2.0
+        top   = quads[:,1]+quads[:,3]/2.0
+        verts[:size,0,0] = left
+        verts[:size,0,1] = bottom
+        verts[:size,1,0] = right
+        verts[:size,1,1] = bottom
+        verts[:size,2,0] = right
+        verts[:size,2,1] = top
+        verts[:size,3,0] = left
+        verts[:size,3,1] = top
+        self._sizes[layer] = size
+        self._upload(layer)
+
+
+    # HIDDEN METHODS
+    def _grow(self,layer,capacity):
+        """
+        Replaces the buffers of the given layer with ones that hold capacity rectangles.
+
+        The texture coordinates and the indices never change, so they are only written
+        here.
+
+        :param layer: the layer to grow
+        :type layer:  ``int`` in 0..len(sources)-1
+
+        :param capacity: the new number of rectangles
+        :type capacity:  ``int`` in 0..MAX_QUADS
+        """
+        texture = self._texture(layer)
+        coords = (0,0,1,0,1,1,0,1) if texture is None else texture.tex_coords
+        verts = np.zeros((capacity,4,4),dtype=np.float32)
+        verts[:,:,2:] = np.asarray(coords,dtype=np.float32).reshape(4,2)
+        verts[:self._sizes[layer]] = self._verts[layer][:self._sizes[layer]]
+        base = 4*np.arange(capacity,dtype=np.uint16)[:,np.newaxis]
+        self._verts[layer] = verts
+        self._index[layer] = base+np.array([0,1,2,2,3,0],dtype=np.uint16)
+
+    def _texture(self,layer):
+        """
+        Returns the texture of the given layer, or None if it is solid
+
+        :param layer: the layer
+        :type layer:  ``int`` in 0..len(sources)-1
+        """
+        source = self._sources[layer]
+        return None if source is None else GameApp.load_texture(source)
+
+    def _upload(self,layer):
+        """
+        Points the mesh of the given layer at the rectangles in its buffers.
+
+        If the layer has a mesh to itself, the mesh reads the buffers in place, so this
+        only tells it the data changed.  Otherwise, the rectangles of every layer that
+        shares the mesh are copied into one buffer, in order.
+
+        :param layer: the layer
+        :type layer:  ``int`` in 0..len(sources)-1
+        """
+        for group in range(len(self._groups)):
+            if layer in self._groups[group]:
+                break
+
+        layers = self._groups[group]
+        size = sum(self._sizes[l] for l in layers)
+        mesh = self._meshes[group]
+        if size == 0:
+            mesh.indices = []
+            mesh.vertices = []
+        elif len(layers) == 1:
+            mesh.vertices = self._verts[layer][:size].reshape(-1)
+            mesh.indices = self._index[layer][:size].reshape(-1)
+        else:
+            assert size <= MAX_QUADS, 'a mesh cannot have more than %d rectangles' % MAX_QUADS
+            verts = np.concatenate([self._verts[l][:self._sizes[l]] for l in layers])
+            index = 4*np.arange(size,dtype=np.uint16)[:,np.newaxis]
+            index = index+np.array([0,1,2,2,3,0],dtype=np.uint16)
+            self._merged[group] = (verts,index)
+            mesh.vertices = verts.reshape(-1)
+            mesh.indices = index.reshape(-1)
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        GObject._reset(self)
+        if not self._fillcolor is None:
+            self._cache.add(self._fillcolor)
+        else:
+            self._cache.add(Color(1,1,1))
+
+        if self._held is not None:
+            self._held()
+        self._held = GameApp.hold_textures(self,self._sources)
+
+        # One mesh for each texture, shared by the layers that use it
+        self._meshes = []
+        self._groups = []
+        keys = []
+        for layer in range(len(self._sources)):
+            texture = self._texture(layer)
+            key = None if texture is None else texture.id
+            if key in keys:
+                self._groups[keys.index(key)].append(layer)
+            else:
+                keys.append(key)
+                self._groups.append([layer])
+                self._meshes.append(Mesh(mode='triangles',texture=texture))
+        self._merged = [None]*len(self._groups)
+
+        for group in range(len(self._groups)):
+            self._upload(self._groups[group][0])
+            self._cache.add(self._meshes[group])
+
+        self._cache.add(PopMatrix())
@@ -12,6 +12,7 @@ from kivy.graphics import *
 from kivy.graphics.instructions import *
 from introcs.geom import Point2, Matrix
 import introcs
+import numpy as np
 
 def is_color(c):
     """
@@ -554,16 +555,38 @@ class GObject(object):
         :return: True if the shape contains this point
         :rtype:  ``bool``
         """
-        import numpy as np
         if isinstance(point,Point2):
             point = (point.x,point.y)
         assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
 
         if self._rotate.angle != 0.0:
-            point = self.matrix.inverse()._transform(point[0],point[1])
+            if not self._mtrue or self._matrix is None:
+                self._build_matrix()
+            (m0,m1) = self._invrows
+            x = m0[0]*point[0]+m0[1]*point[1]+m0[2]
+            y = m1[0]*point[0]+m1[1]*point[1]+m1[2]
+            return abs(x) < self.width/2.0 and abs(y) < self.height/2.0
 
         return abs(point[0]-self.x) < self.width/2.0 and abs(point[1]-self.y) < self.height/2.0
 
+    def contains_many(self,points):
+        """
+        Checks which of the given points this shape contains
+
+        This is :meth:`contains` applied to every point at once. By default, it just
+        checks the bounding box of the shape. The inverse matrix of a rotated shape is
+        kept until the shape is moved, turned or scaled again, so testing many points
+        against the same shape costs a few array operations.
+
+        :param points: the points to check, one per row
+        :type points:  array-like of shape (N,2)
+
+        :return: a mask that is True for each point this shape contains
+        :rtype:  ``numpy.ndarray`` of ``bool``
+        """
+        x, y = self._localize(points)
+        return (abs(x) < self.width/2.0) & (abs(y) < self.height/2.0)
+
     def transform(self,point):
         """
         Transforms the point to the local coordinate system
@@ -623,8 +646,43 @@ class GObject(object):
         self._invrse.scale(1.0/self._scale.x,1.0/self._scale.y)
         self._invrse.rotate(-self._rotate.angle)
         self._invrse.translate(-self._trans.x,-self._trans.y)
+
+        # The inverse as the first two rows of a 3x3 matrix, for _localize
+        angle = np.radians(self._rotate.angle)
+        c = np.cos(angle)/self._scale.x
+        s = np.sin(angle)/self._scale.x
+        self._invdata = np.zeros((2,3))
+        self._invdata[0] = (c,s,-c*self._trans.x-s*self._trans.y)
+        c = np.cos(angle)/self._scale.y
+        s = np.sin(angle)/self._scale.y
+        self._invdata[1] = (-s,c,s*self._trans.x-c*self._trans.y)
+        self._invrows = self._invdata.tolist()
         self._mtrue = True
 
+    def _localize(self,points):
+        """
+        Returns the coordinates of the points relative to the center of this shape
+
+        For a rotated shape, the points are moved to the local coordinate system of the
+        shape (undoing the translation, rotation and scale that it is drawn with).
+
+        :param points: the points to move, one per row
+        :type points:  array-like of shape (N,2)
+
+        :return: the horizontal and vertical coordinates of the points
+        :rtype:  pair of ``numpy.ndarray``
+        """
+        points = np.asarray(points,dtype=float)
+        assert points.ndim == 2 and points.shape[1] == 2, '%s is not an array of points' % repr(points)
+
+        if self._rotate.angle == 0.0:
+            return (points[:,0]-self.x, points[:,1]-self.y)
+
+        if not self._mtrue or self._matrix is None:
+            self._build_matrix()
+        m = self._invdata
+        return (points.dot(m[0,:2])+m[0,2], points.dot(m[1,:2])+m[1,2])
+
 
 # #mark -
 
@@ -727,6 +785,22 @@ class GScene(GObject):
 
 
     # PUBLIC METHODS
+    def remove(self,child):
+        """
+        Removes a child from this scene.
+
+        This is the same as assigning ``children`` without ``child``, except that only
+        the drawing instructions of ``child`` are removed; the rest of the drawing cache
+        is left as it is. This makes removing one child of a large scene cheap.
+
+        :param child: the child to remove
+        :type child:  :class:`GObject` in ``children``
+        """
+        assert child in self._children, '%s is not a child of this scene' % repr(child)
+        self._children.remove(child)
+        self._cache.remove(child._cache)
+
+
     def select(self,point):
         """
         Selects the child selected by the given point.
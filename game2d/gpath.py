@@ -10,7 +10,9 @@ Date:   August 1, 2017 (Python 3 version)
 # Lower-level kivy modules to support animation
 from kivy.graphics import *
 from kivy.graphics.instructions import *
+from introcs.geom import Point2
 from .gobject import GObject
+import numpy as np
 
 
 def same_side(p1, p2, a, b):
@@ -32,7 +34,6 @@ def same_side(p1, p2, a, b):
     :return: True if ``p1``, ``p2`` are on the same side of segment ``ba``; False otherwise
     :rtype:  ``bool``
     """
-    import numpy as np
     ba  = np.append(np.subtract(b,a),[0])
     cp1 = np.cross(ba,np.subtract(p1,a))
     cp2 = np.cross(ba,np.subtract(p2,a))
@@ -57,6 +58,34 @@ def in_triangle(p, t):
             same_side(p, t[4:6], t[0:2], t[2:4]))
 
 
+def in_triangles(points, t):
+    """
+    Checks which of the given points are inside of a triangle
+    
+    This is :func:`in_triangle` applied to every point at once, with the same test
+    against each edge.
+    
+    :param points: The points to check, one per row
+    :type points:  array-like of shape (N,2)
+    
+    :param t: A triangle defined by 3 points
+    :type t:  6-element list of ``int`` or ``float``
+    
+    :return: a mask that is True for each point in triangle ``t``
+    :rtype:  ``numpy.ndarray`` of ``bool``
+    """
+    points = np.asarray(points,dtype=float).reshape(-1,2)
+    t = np.asarray(t,dtype=float).reshape(3,2)
+    result = np.ones(len(points),dtype=bool)
+    for (i,j,k) in ((0,1,2),(1,0,2),(2,0,1)):
+        (a,b) = (t[j],t[k])
+        ba = b-a
+        cp1 = ba[0]*(points[:,1]-a[1])-ba[1]*(points[:,0]-a[0])
+        cp2 = ba[0]*(t[i,1]-a[1])-ba[1]*(t[i,0]-a[0])
+        result &= cp1*cp2 >= 0
+    return result
+
+
 def is_point_tuple(t,minsize):
     """
     Checks whether a value is an EVEN sequence of numbers.
@@ -213,6 +242,21 @@ class GPath(GObject):
         """
         return False
     
+    def contains_many(self,points):
+        """
+        Checks which of the given points this shape contains
+        
+        As with :meth:`contains`, every point is outside, as a ``GPath`` has no interior.
+        
+        :param points: the points to check, one per row
+        :type points:  array-like of shape (N,2)
+        
+        :return: a mask that is True for each point this shape contains
+        :rtype:  ``numpy.ndarray`` of ``bool``
+        """
+        points = np.asarray(points,dtype=float).reshape(-1,2)
+        return np.zeros(len(points),dtype=bool)
+    
     def near(self,point):
         """
         Checks whether this path is near the given point
@@ -345,7 +389,21 @@ class GTriangle(GPath):
             point = (point.x,point.y)
         assert is_point_tuple(point,1), "%s is not a valid point" % repr(point)
         
-        return in_triangle(points,self._points)
+        return in_triangle(point,self._points)
+    
+    def contains_many(self,points):
+        """
+        Checks which of the given points this shape contains
+        
+        This is :meth:`contains` applied to every point at once.
+        
+        :param points: the points to check, one per row
+        :type points:  array-like of shape (N,2)
+        
+        :return: a mask that is True for each point this shape contains
+        :rtype:  ``numpy.ndarray`` of ``bool``
+        """
+        return in_triangles(points,self._points)
     
     
     # HIDDEN METHODS
@@ -532,12 +590,32 @@ class GPolygon(GPath):
         assert is_point_tuple(point,1), "%s is not a valid point" % repr(point)
         
         found = False
-        for i in xrange(4,len(self._points),2):
+        for i in range(4,len(self._points),2):
             t = (0,0)+self.points[i-4:i]
             found = found or in_triangle(point,t)
         
         return found
     
+    def contains_many(self,points):
+        """
+        Checks which of the given points this shape contains
+        
+        This is :meth:`contains` applied to every point at once, one triangle at a time.
+        
+        :param points: the points to check, one per row
+        :type points:  array-like of shape (N,2)
+        
+        :return: a mask that is True for each point this shape contains
+        :rtype:  ``numpy.ndarray`` of ``bool``
+        """
+        points = np.asarray(points,dtype=float).reshape(-1,2)
+        found = np.zeros(len(points),dtype=bool)
+        for i in range(4,len(self._points),2):
+            t = (0,0)+tuple(self.points[i-4:i])
+            found |= in_triangles(points,t)
+        
+        return found
+    
     
     # HIDDEN METHODS
     def _make_mesh(self):
@@ -10,6 +10,7 @@ Date:   August 1, 2017 (Python 3 version)
 """
 from kivy.graphics import *
 from kivy.graphics.instructions import *
+from kivy.graphics.texture import Texture
 from kivy.uix.label import Label
 from kivy.uix.image import Image
 from .gobject import GObject
@@ -154,12 +155,29 @@ class GEllipse(GRectangle):
             dx = (point[0]-self.x)*(point[0]-self.x)/(rx*rx)
             dy = (point[1]-self.y)*(point[1]-self.y)/(ry*ry)
         else:
-            p = self.matrix.inverse()._transform(point[0],point[1])
-            dx = p[0]*p[0]/(rx*rx)
-            dy = p[1]*p[1]/(ry*ry)
+            x, y = self._localize([point])
+            dx = x[0]*x[0]/(rx*rx)
+            dy = y[0]*y[0]/(ry*ry)
         
         return (dx+dy) <= 1.0
     
+    def contains_many(self,points):
+        """
+        Checks which of the given points this shape contains
+        
+        This is :meth:`contains` applied to every point at once.
+        
+        :param points: the points to check, one per row
+        :type points:  array-like of shape (N,2)
+        
+        :return: a mask that is True for each point this shape contains
+        :rtype:  ``numpy.ndarray`` of ``bool``
+        """
+        x, y = self._localize(points)
+        rx = self.width/2.0
+        ry = self.height/2.0
+        return x*x/(rx*rx)+y*y/(ry*ry) <= 1.0
+    
     
     # HIDDEN METHODS
     def _reset(self):
@@ -244,6 +262,7 @@ class GImage(GRectangle):
         self._defined = False
         self.source = keywords['source'] if 'source' in keywords else None
         self._texture = None
+        self._held = None
         GRectangle.__init__(self,**keywords)
         self._defined = True
     
@@ -257,6 +276,9 @@ class GImage(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        if self._held is not None:
+            self._held()
+        self._held = GameApp.hold_textures(self,[self.source])
         self._texture = GameApp.load_texture(self.source)
         fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
         if not self._fillcolor is None:
@@ -273,6 +295,116 @@ class GImage(GRectangle):
         self._cache.add(PopMatrix())
 
 
+# #mark -
+class GBitmap(GRectangle):
+    """
+    A class representing a rectangular image whose pixels are set by the program.
+    
+    The image is a texture of ``columns`` x ``rows`` pixels, stretched over the
+    rectangle without smoothing, so each pixel is drawn as a solid block. The pixels
+    start out transparent; use :meth:`blit` to change them. Changing the pixels does
+    not rebuild the drawing cache, so this is the cheap way to draw many small
+    squares that change over time.
+    
+    This class acts much like is parent :class:`GRectangle` and shares all of the same 
+    properties.
+    """
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def columns(self):
+        """
+        The number of pixels across the image.
+        
+        **invariant**: Value is an ``int`` > 0.
+        """
+        return self._columns
+    
+    @property
+    def rows(self):
+        """
+        The number of pixels up the image.
+        
+        **invariant**: Value is an ``int`` > 0.
+        """
+        return self._rows
+    
+    
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new bitmap.
+        
+        To use the constructor for this class, you should provide it with a list of 
+        keyword arguments that initialize various attributes. For example, to create a 
+        bitmap of 40 x 30 pixels stretched over a 400 x 300 rectangle, use::
+            
+            GBitmap(x=200,y=150,width=400,height=300,columns=40,rows=30)
+        
+        This class supports the all same keywords as :class:`GRectangle`; the new 
+        keywords ``columns`` and ``rows`` are required.
+        
+        :param keywords: dictionary of keyword arguments 
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        assert type(keywords.get('columns')) == int and keywords['columns'] > 0, \
+            '%s is not a valid number of columns' % repr(keywords.get('columns'))
+        assert type(keywords.get('rows')) == int and keywords['rows'] > 0, \
+            '%s is not a valid number of rows' % repr(keywords.get('rows'))
+        self._columns = keywords.pop('columns')
+        self._rows = keywords.pop('rows')
+        self._texture = Texture.create(size=(self._columns,self._rows),colorfmt='rgba')
+        self._texture.mag_filter = 'nearest'
+        self._texture.min_filter = 'nearest'
+        self._texture.blit_buffer(bytes(4*self._columns*self._rows),colorfmt='rgba',
+                                  bufferfmt='ubyte')
+        GRectangle.__init__(self,**keywords)
+        self._defined = True
+    
+    
+    # PUBLIC METHODS
+    def blit(self,data):
+        """
+        Replaces the pixels of this image.
+        
+        The pixels are given row by row, starting with the bottom row, with four bytes
+        (red, green, blue, alpha) per pixel.
+        
+        :param data: the new pixels
+        :type data:  bytes-like object of length ``4*columns*rows``
+        """
+        # Kivy reads a buffer other than bytes as signed chars
+        view = memoryview(data).cast('b')
+        assert len(view) == 4*self._columns*self._rows, \
+            'data is not %d x %d RGBA pixels' % (self._columns,self._rows)
+        self._texture.blit_buffer(view,colorfmt='rgba',bufferfmt='ubyte')
+    
+    
+    # HIDDEN METHODS
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        GObject._reset(self)
+        x = -self.width/2.0
+        y = -self.height/2.0
+        
+        fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
+        if not self._fillcolor is None:
+            self._cache.add(self._fillcolor)
+        else:
+            self._cache.add(Color(1,1,1))
+        self._cache.add(fill)
+        
+        if not self._linecolor is None and self.linewidth > 0:
+            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
+            self._cache.add(self._linecolor)
+            self._cache.add(line)
+        
+        self._cache.add(PopMatrix())
+
+
 # #mark -
 class GLabel(GRectangle):
     """
@@ -106,6 +106,7 @@ class GSprite(GRectangle):
         self._images = [None]*self.count
         self._bounds = None
         self._texture = None
+        self._held = None
         GRectangle.__init__(self,**keywords)
         self._defined = True
     
@@ -130,6 +131,9 @@ class GSprite(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        if self._held is not None:
+            self._held()
+        self._held = GameApp.hold_textures(self,[self.source])
         texture = GameApp.load_texture(self.source)
         if texture:
             width  = texture.width/self._format[1]
@@ -325,6 +325,32 @@ class GView(FloatLayout):
     See the documentation of that class for more information.
     """
 
+    # MUTABLE ATTRIBUTES
+    @property
+    def retained(self):
+        """
+        Whether the canvas keeps what was drawn from one animation frame to the next.
+
+        If this value is False (the default), the canvas is emptied at the start of
+        every animation frame and everything drawn is added to it again.  If it is True,
+        the canvas is only changed at the end of a frame, and only for the commands that
+        were added or dropped since the previous frame.  A frame that draws the same
+        objects as the last one does not touch the canvas at all.  Either way, the
+        window shows what was drawn in the order it was drawn.
+
+        **Invariant**: Must be a bool
+        """
+        return self._retained
+
+    @retained.setter
+    def retained(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._retained = value
+        self._frame.clear()
+        self._contents.clear()
+        self._order = []
+        self._shown = []
+
     # BUILT-IN METHODS
     def __init__(self):
         """
@@ -341,6 +367,9 @@ class GView(FloatLayout):
         self.bind(size=self._reset)
         self._reset()
         self._contents = set()
+        self._retained = False
+        self._order = []
+        self._shown = []
 
 
     # PUBLIC METHODS
@@ -355,7 +384,10 @@ class GView(FloatLayout):
         :type cmd:  A Kivy graphics command
         """
         if not cmd in self._contents:
-            self._frame.add(cmd)
+            if self._retained:
+                self._order.append(cmd)
+            else:
+                self._frame.add(cmd)
             self._contents.add(cmd)
 
     def clear(self):
@@ -363,10 +395,47 @@ class GView(FloatLayout):
         Clears the contents of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        frame.  That way, you are not drawing images on top of one another.  If the
+        view is :attr:`retained`, the canvas is left alone until the end of the frame.
         """
-        self._frame.clear()
+        if not self._retained:
+            self._frame.clear()
         self._contents.clear()
+        del self._order[:]
+
+    def present(self):
+        """
+        Updates the canvas to show the commands drawn this frame.
+
+        This method is called for you automatically at the end of the animation frame,
+        after :meth:`GameApp.draw`.  It only does something if the view is
+        :attr:`retained`: commands that were not drawn this frame are removed, and new
+        ones are inserted at their place in the drawing order.  The canvas is only
+        rebuilt from scratch if the commands that stayed were drawn in a different order.
+
+        Code that draws frames outside of :class:`GameApp` (such as a benchmark) must
+        call this after drawing, or a retained view will not change.
+        """
+        if not self._retained:
+            return
+
+        if self._order != self._shown:
+            drawn = self._contents
+            shown = set(self._shown)
+            kept = [cmd for cmd in self._shown if cmd in drawn]
+            if kept == [cmd for cmd in self._order if cmd in shown]:
+                for cmd in self._shown:
+                    if not cmd in drawn:
+                        self._frame.remove(cmd)
+                for pos in range(len(self._order)):
+                    if not self._order[pos] in shown:
+                        self._frame.insert(pos,self._order[pos])
+            else:
+                self._frame.clear()
+                for cmd in self._order:
+                    self._frame.add(cmd)
+
+        self._shown, self._order = self._order, self._shown
 
     # HIDDEN METHODS
     def _reset(self,obj=None,value=None):
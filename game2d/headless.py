@@ -0,0 +1,175 @@
+"""
+Window-free stand-ins for 2D game support.
+
+This module provides replacements for the singletons in :mod:`gview` that do not
+require Kivy.  They allow a game controller to be driven from a script (for bots,
+balancing runs or regression tests) on a machine with no display.  Nothing in this
+module may import Kivy, directly or indirectly.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+
+
+class HeadlessInput(object):
+    """
+    A class representing a scripted input handler
+
+    This class has the same query interface as :class:`GInput` (:meth:`is_key_down`,
+    :attr:`key_count`, :attr:`keys` and :attr:`touch`), but it is never hooked up to
+    a keyboard or mouse.  Instead, the key state is set by the script driving the game,
+    using the methods :meth:`press`, :meth:`release` and :meth:`set_keys`.
+
+    Unlike :class:`GInput`, you are expected to construct objects of this class.
+    """
+
+    # MUTABLE ATTRIBUTES
+    @property
+    def touch_enabled(self):
+        """
+        Whether the touch (mouse) interface is currently enabled.
+
+        This value has no effect, as a scripted input never has a touch.
+
+        **Invariant**: Must be a bool
+        """
+        return self._touch_enabled
+
+    @touch_enabled.setter
+    def touch_enabled(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._touch_enabled = value
+
+    @property
+    def keyboard_enabled(self):
+        """
+        Whether the keyboard interface is currently enabled.
+
+        Setting this value to False releases all keys and ignores any later presses.
+
+        **Invariant**: Must be a bool
+        """
+        return self._keyboard_enabled
+
+    @keyboard_enabled.setter
+    def keyboard_enabled(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        if not value:
+            self._keystate = {}
+            self._keycount = 0
+        self._keyboard_enabled = value
+
+
+    # IMMUTABLE ATTRIBUTES
+    @property
+    def touch(self):
+        """
+        The current (x,y) coordinate of the mouse, if pressed.
+
+        A scripted input has no mouse, so this is always None.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be None.
+        """
+        return None
+
+    @property
+    def key_count(self):
+        """
+        The number of keys currently held down.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an int >= 0."""
+        return self._keycount
+
+    @property
+    def keys(self):
+        """
+        The list of keys that are currently held down.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a list of strings (possibly empty)
+        """
+        return tuple(k for (k,v) in self._keystate.items() if v)
+
+
+    # BUILT-IN METHODS
+    def __init__(self,keys=()):
+        """
+        Creates a new scripted input handler
+
+        :param keys: the keys initially held down
+        :type keys:  iterable of ``str``
+        """
+        self._touch_enabled = True
+        self._keyboard_enabled = True
+
+        self._keystate = {}
+        self._keycount = 0
+        self.set_keys(keys)
+
+
+    # PUBLIC METHODS
+    def is_key_down(self,key):
+        """
+        Checks wether the key is currently held down.
+
+        :param key: the key to test
+        :type key:  ``str``
+
+        :return: True if ``key`` is currently held down
+        :rtype:  ``bool``
+        """
+        return key in self._keystate and self._keystate[key]
+
+    def is_touch_down(self):
+        """
+        Checks wether the mouse is currently held down.
+
+        :return: False, as a scripted input has no mouse
+        :rtype:  ``bool``
+        """
+        return False
+
+    def press(self,key):
+        """
+        Holds down the given key until it is released.
+
+        :param key: the key to press
+        :type key:  ``str``
+        """
+        assert type(key) == str, '%s is not a valid key' % repr(key)
+        if not self._keyboard_enabled:
+            return
+        if not self.is_key_down(key):
+            self._keycount += 1
+        self._keystate[key] = True
+
+    def release(self,key):
+        """
+        Releases the given key, if it is held down.
+
+        :param key: the key to release
+        :type key:  ``str``
+        """
+        assert type(key) == str, '%s is not a valid key' % repr(key)
+        if self.is_key_down(key):
+            self._keycount -= 1
+        self._keystate[key] = False
+
+    def set_keys(self,keys):
+        """
+        Replaces the current key state so that exactly ``keys`` are held down.
+
+        This is the usual way to script input: call it once before each frame.
+
+        :param keys: the keys to hold down
+        :type keys:  iterable of ``str``
+        """
+        for k in self.keys:
+            self.release(k)
+        for k in keys:
+            self.press(k)
@@ -0,0 +1,245 @@
+"""
+Background asset loading for 2D game support.
+
+This module provides :class:`Preloader`, which :class:`GameApp` starts when the game
+starts.  A worker thread decodes the images, and reads the sounds and fonts from disk,
+so that the first objects made from them do not stall the game.  Anything that touches
+the graphics card or the audio system (making textures, rendering text, and opening
+sounds) is left for the main thread, which does it a little at a time in
+:meth:`Preloader.poll`.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+import os
+import queue
+import threading
+
+
+class Preloader(object):
+    """
+    A class representing the loading of the game assets in the background.
+
+    The worker thread decodes the images to pixels (see :func:`atlas.decode`), and reads
+    the sounds and fonts from disk.  The results wait in a queue until the main thread
+    calls :meth:`poll`, which uploads the images: into the :attr:`GameApp.ATLAS` once
+    they are all decoded, or each into :attr:`GameApp.TEXTURE_CACHE` if the game has no
+    atlas.  The audio system is not safe to use from another thread, so :meth:`poll`
+    also opens the sounds, one per call.  Each sound is kept for the first
+    :class:`Sound` made from its file.
+
+    Kivy renders text on the main thread, and opens a font once for every size it is
+    used at.  So :meth:`poll` renders each font once, at the default size of Kivy.  That
+    starts the text system and opens the font; a label at another size still opens the
+    font again, which is much quicker.
+
+    The attribute :attr:`progress` says how much of this is done, for a loading screen.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def total(self):
+        """
+        The number of files to load.
+
+        **invariant**: Value is an ``int`` >= 0.
+        """
+        return self._total
+
+    @property
+    def done(self):
+        """
+        The number of files that are completely loaded.
+
+        An image is only loaded once its pixels are on the graphics card.
+
+        **invariant**: Value is an ``int`` in 0..total.
+        """
+        return self._done
+
+    @property
+    def progress(self):
+        """
+        The fraction of the files that are completely loaded.
+
+        **invariant**: Value is a ``float`` in 0..1.
+        """
+        return 1.0 if self._total == 0 else self._done/float(self._total)
+
+    @property
+    def finished(self):
+        """
+        Whether every file is completely loaded.
+
+        **invariant**: Value is a ``bool``.
+        """
+        return self._done == self._total
+
+
+    # BUILT-IN METHODS
+    def __init__(self,images=None,sounds=None,fonts=None,atlas=True):
+        """
+        Creates, but does not start, a new preloader.
+
+        :param images: The folder of images, or None to skip the images
+        :type images:  ``str`` or ``None``
+
+        :param sounds: The folder of sounds, or None to skip the sounds
+        :type sounds:  ``str`` or ``None``
+
+        :param fonts: The folder of fonts, or None to skip the fonts
+        :type fonts:  ``str`` or ``None``
+
+        :param atlas: Whether to pack the images into an atlas (or upload each alone)
+        :type atlas:  ``bool``
+        """
+        self._images = self._listdir(images)
+        self._sounds = self._listdir(sounds)
+        self._fonts  = self._listdir(fonts)
+        self._atlas  = atlas
+        self._total  = len(self._images)+len(self._sounds)+len(self._fonts)
+        self._done   = 0
+        self._ready  = queue.Queue()
+        self._pixels = {}
+        self._received = 0
+        self._thread = None
+
+
+    # PUBLIC METHODS
+    def start(self):
+        """
+        Starts the worker thread.
+        """
+        assert self._thread is None, 'this preloader was already started'
+        self._thread = threading.Thread(target=self._work,name='game2d-preload')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def poll(self):
+        """
+        Uploads the images (and renders the fonts) that the worker thread has loaded
+        since the last call, and opens at most one of its sounds.
+
+        This must be called on the main thread.  :class:`GameApp` calls it at the start
+        of every animation frame until the preloader is :attr:`finished`.
+        """
+        from .app import GameApp
+        while True:
+            try:
+                (kind,name,value) = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'image':
+                self._received += 1
+            if value is None:
+                self._done += 1
+            elif kind == 'font':
+                self._warm(value)
+                self._done += 1
+            elif kind == 'sound':
+                self._open(name,value)
+                self._done += 1
+                # Opening a sound decodes all of it, so leave the rest for later frames
+                break
+            elif self._atlas:
+                self._pixels[name] = value
+            else:
+                if not name in GameApp.TEXTURE_CACHE:
+                    GameApp.TEXTURE_CACHE[name] = self._upload(value)
+                self._done += 1
+
+        if self._atlas and self._pixels and self._received == len(self._images):
+            images = self._pixels
+            self._pixels = {}
+            GameApp.build_atlas(images=images)
+            self._done += len(images)
+
+
+    # HIDDEN METHODS
+    def _work(self):
+        """
+        Decodes every image and reads every other file, passing the results to the main
+        thread through the queue.
+
+        This is the body of the worker thread.  A file that cannot be loaded is counted
+        as done, and is left for the game to load (and fail on) as it would without a
+        preloader.
+        """
+        from .atlas import decode
+        for path in self._images:
+            try:
+                pixels = decode(path)
+            except:
+                pixels = None
+            self._ready.put(('image',os.path.basename(path),pixels))
+
+        for (kind,paths) in (('sound',self._sounds),('font',self._fonts)):
+            for path in paths:
+                name = os.path.basename(path)
+                try:
+                    with open(path,'rb') as file:
+                        file.read()
+                    self._ready.put((kind,name,path))
+                except:
+                    self._ready.put((kind,name,None))
+
+    def _upload(self,pixels):
+        """
+        Returns a new texture holding the given pixels
+
+        :param pixels: The pixels of an image (as given by :func:`atlas.decode`)
+        :type pixels:  ``numpy.ndarray``
+        """
+        from kivy.graphics.texture import Texture
+        texture = Texture.create(size=(pixels.shape[1],pixels.shape[0]),colorfmt='rgba')
+        texture.blit_buffer(pixels.tobytes(),colorfmt='rgba',bufferfmt='ubyte')
+        return texture
+
+    def _open(self,name,path):
+        """
+        Opens the given sound, keeping it for the first :class:`Sound` made from it
+
+        A sound that Kivy cannot open is skipped, and is left for the game to fail on.
+
+        :param name: The file name of the sound
+        :type name:  ``str``
+
+        :param path: The path to the sound file
+        :type path:  ``str``
+        """
+        from kivy.core.audio import SoundLoader
+        from .sound import Sound
+        try:
+            sound = SoundLoader.load(path)
+            if sound is not None:
+                Sound.PRELOADED.setdefault(name,sound)
+        except:
+            pass
+
+    def _warm(self,path):
+        """
+        Renders a character in the given font, so that Kivy has opened it
+
+        A font that Kivy cannot use is skipped, and is left for the game to fail on.
+
+        :param path: The path to the font file
+        :type path:  ``str``
+        """
+        from kivy.core.text import Label as CoreLabel
+        try:
+            CoreLabel(text='0',font_name=path).refresh()
+        except:
+            pass
+
+    def _listdir(self,folder):
+        """
+        Returns the paths of the files in the given folder, in order of name
+
+        :param folder: The folder, or None
+        :type folder:  ``str`` or ``None``
+        """
+        if folder is None or not os.path.isdir(folder):
+            return []
+        names = sorted(os.listdir(folder))
+        return [os.path.join(folder,name) for name in names
+                if os.path.isfile(os.path.join(folder,name))]
@@ -26,6 +26,9 @@ class Sound(object):
     # This class is a simply replacement for the built-in Kivy Sound class.  It is a
     # little better with error handling, since GStreamer appears to be quite unreliable.
     
+    # Class attribute for sounds loaded ahead of time (see Preloader), by file name
+    PRELOADED = {}
+    
     # MUTABLE PROPERTIES
     @property
     def volume(self):
@@ -78,7 +81,9 @@ class Sound(object):
         from .app import GameApp
         assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
         self._source = source
-        self._sound  = SoundLoader.load(source)
+        self._sound  = Sound.PRELOADED.pop(source,None)
+        if self._sound is None:
+            self._sound = SoundLoader.load(source)
         if self._sound is None:
             raise IOError('Module game2d cannot read the file %s' % repr(source))
     
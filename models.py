@@ -3,13 +3,15 @@ Models module for Alien Invaders
 
 This module contains the model classes for the Alien Invaders game. Anything
 that you interact with on the screen is model: the ship, the laser bolts, and
-the aliens.
+the aliens. The game state itself is kept in the window-free bodies of sim.py;
+the classes here only draw it (see Painter).
 
 # Evelyn Si es828
 # 12/7/21
 """
 from consts import *
 from game2d import *
+import numpy as np
 
 # PRIMARY RULE: Models are not allowed to access anything in any module other
 # than consts.py.  If you need extra information from Gameplay, then it should
@@ -55,7 +57,7 @@ class Ship(GSprite):
                          x=x,y=y,width=width,height=height)
 
 
-    # METHODS TO MOVE THE SHIP AND CHECK FOR COLLISIONS
+    # METHOD TO MOVE THE SHIP
     def move(self,x):
         """
         Moves the Ship x pixels to the right from its center if x>0;
@@ -74,34 +76,6 @@ class Ship(GSprite):
             self.x=GAME_WIDTH-self.width/2
 
 
-    def collide(self,b):
-        """
-        Returns True if a Alien bolt collides with the Ship;
-        otherwise return False.
-
-        This method also returns False if the bolt was not fired from an Alien
-
-        Parameter b: the Alien bolt
-        Precondition: b is a Bolt object
-        """
-        assert isinstance(b,Bolt), "b is not a Bolt object"
-        if (b.isPlayerBolt()==True):
-            return False
-        topRight=(b.right,b.top)
-        topLeft=(b.left,b.top)
-        bottomRight=(b.right,b.bottom)
-        bottomLeft=(b.left,b.bottom)
-        if (self.contains(topRight)):
-            return True
-        if (self.contains(topLeft)):
-            return True
-        if (self.contains(bottomRight)):
-            return True
-        if (self.contains(bottomLeft)):
-            return True
-        return False
-
-
     # COROUTINE METHOD TO ANIMATE THE SHIP
     def animateShip(self):
         """
@@ -117,148 +91,199 @@ class Ship(GSprite):
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
 
 
-class Alien(GImage):
-    """
-    A class to represent a single alien.
+# IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
 
-    At the very least, you want a __init__ method to initialize the alien
-    dimensions. These dimensions are all specified in consts.py.
 
-    You also MIGHT want to add code to detect a collision with a bolt. We
-    do not require this.  You could put this method in Wave if you wanted to.
-    But the advantage of putting it here is that Ships and Aliens collide
-    with different bolts.  Ships collide with Alien bolts, not Ship bolts.
-    And Aliens collide with Ship bolts, not Alien bolts. An easy way to
-    keep this straight is for this class to have its own collision method.
+class Swarm(GBitmap):
+    """
+    A class to draw a huge formation of aliens as a single image.
 
-    However, there is no need for any more attributes other than those
-    inherited by GImage. You would only add attributes if you needed them
-    for extra gameplay features (like giving each alien a score value).
+    A formation larger than ALIEN_ROWS_MAX x ALIENS_IN_ROW_MAX has too many
+    aliens to give each one its own Alien image. A Swarm instead draws one
+    pixel per alien (in the color HUGE_COLORS gives its image), stretched
+    over the whole formation. The pixels are only sent again when an alien
+    dies, and moving the formation only moves the image.
     """
-    #  IF YOU ADD ATTRIBUTES, LIST THEM BELOW
+    # HIDDEN ATTRIBUTES:
+    # Attribute _count: the number of live aliens the last time pixels were sent
+    # Invariant: _count is an int >= 0, or None before the first sync
 
-    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    # INITIALIZER TO CREATE THE IMAGE
+    def __init__(self,aliens):
+        """
+        Initializes the Swarm to draw the given formation
 
-    # INITIALIZER TO CREATE AN ALIEN
-    def __init__(self,x,y,s,width=ALIEN_WIDTH,height=ALIEN_HEIGHT):
+        Parameter aliens: the formation to draw
+        Precondition: aliens is a Formation object
         """
-        Initializes the Alien object
+        super().__init__(columns=aliens.cols,rows=aliens.rows,
+                         width=aliens.cols*(aliens.width+aliens.hsep),
+                         height=aliens.rows*(aliens.height+aliens.vsep),
+                         x=0,y=0)
+        self._count=None
+        self.sync(aliens)
 
-        Parameter x: horizontal coordinate of the center of the object
-        Precondition: x is a float or int
 
-        Parameter y: vertical coordinate of the center of the object
-        Precondition: y is a float or int
+    # METHOD TO FOLLOW THE FORMATION
+    def sync(self,aliens):
+        """
+        Moves the image to the formation, and clears the pixels of dead aliens
 
-        Parameter s: source file for the image
-        Precondition: s is a strings refering to a valid file
+        Parameter aliens: the formation this Swarm was made for
+        Precondition: aliens is a Formation object
         """
-        super().__init__(x=x,y=y,width=width,height=height,
-                       source=s)
+        self.x=float((aliens.x[0,0]+aliens.x[0,-1])/2.0)
+        self.y=float((aliens.y[0,0]+aliens.y[-1,0])/2.0)
+        if (aliens.count()!=self._count):
+            self.blit(aliens.pixels(HUGE_COLORS))
+            self._count=aliens.count()
 
 
-    # METHOD TO CHECK FOR COLLISION (IF DESIRED)
-    def collide(self,b):
+    def invalidate(self):
         """
-        Returns True if a player bolt collides with an Alien;
-        otherwise return False.
+        Makes the next sync send the pixels again, even if no alien died
+
+        Wave calls this when it restores a snapshot, as the alive mask may
+        have changed without the count changing.
+        """
+        self._count=None
 
-        This method also returns False if the bolt was not fired from player
 
-        Parameter b: the player bolt
-        Precondition: b is a Bolt object
+class AlienBatch(GBatch):
+    """
+    A class to draw a formation of aliens as one batch.
+
+    Each alien image is a layer of the batch, so the whole formation takes one
+    mesh per image however many aliens there are. The rectangles are placed
+    relative to the alien in row 0 and column 0, which is where the batch is.
+    The formation only moves as a whole, so moving it only moves the batch;
+    the rectangles are only rebuilt when an alien dies.
+    """
+
+    # INITIALIZER TO CREATE AN EMPTY BATCH
+    def __init__(self):
+        """
+        Initializes the AlienBatch with no aliens
         """
-        assert isinstance(b,Bolt), "b is not a Bolt object"
-        if (b.isPlayerBolt()==False):
-            return False
-        topRight=(b.right,b.top)
-        topLeft=(b.left,b.top)
-        bottomRight=(b.right,b.bottom)
-        bottomLeft=(b.left,b.bottom)
-        if (self.contains(topRight)):
-            return True
-        if (self.contains(topLeft)):
-            return True
-        if (self.contains(bottomRight)):
-            return True
-        if (self.contains(bottomLeft)):
-            return True
-        return False
+        super().__init__(sources=ALIEN_IMAGES,x=0,y=0)
 
 
-    # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
+    # METHODS TO FOLLOW THE FORMATION
+    def follow(self,aliens):
+        """
+        Moves the batch to the alien in row 0 and column 0 of the formation
 
+        Parameter aliens: the formation this batch draws
+        Precondition: aliens is a Formation object
+        """
+        self.x=float(aliens.x[0,0])
+        self.y=float(aliens.y[0,0])
 
-class Bolt(GRectangle):
-    """
-    A class representing a laser bolt.
 
-    Laser bolts are often just thin, white rectangles. The size of the bolt
-    is determined by constants in consts.py. We MUST subclass GRectangle,
-    because we need to add an extra (hidden) attribute for the velocity of
-    the bolt.
+    def load(self,aliens):
+        """
+        Replaces the rectangles of the batch with the live aliens of the
+        formation
 
-    The class Wave will need to look at these attributes, so you will need
-    getters for them.  However, it is possible to write this assignment with
-    no setters for the velocities.  That is because the velocity is fixed and
-    cannot change once the bolt is fired.
+        Parameter aliens: the formation this batch draws
+        Precondition: aliens is a Formation object
+        """
+        for k in range(len(ALIEN_IMAGES)):
+            r,c=np.nonzero(aliens.alive&(aliens.image==k))
+            quads=np.empty((len(r),4))
+            quads[:,0]=aliens.x[r,c]-aliens.x[0,0]
+            quads[:,1]=aliens.y[r,c]-aliens.y[0,0]
+            quads[:,2]=aliens.width
+            quads[:,3]=aliens.height
+            self.set_quads(k,quads)
 
-    In addition to the getters, you need to write the __init__ method to set
-    the starting velocity. This __init__ method will need to call the __init__
-    from GRectangle as a  helper.
 
-    You also MIGHT want to create a method to move the bolt.  You move the
-    bolt by adding the velocity to the y-position.  However, the getter
-    allows Wave to do this on its own, so this method is not required.
+class BoltBatch(GBatch):
+    """
+    A class to draw every bolt of a pool as one batch.
     """
-    # INSTANCE ATTRIBUTES:
-    # Attribute _velocity: the velocity in y direction
-    # Invariant: _velocity is an int or float
 
-    # LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # INITIALIZER TO CREATE AN EMPTY BATCH
+    def __init__(self):
+        """
+        Initializes the BoltBatch with no bolts
+        """
+        super().__init__(x=0,y=0,fillcolor='black')
 
 
-    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
-    def getVelocity(self):
+    # METHOD TO FOLLOW THE BOLTS
+    def load(self,bolts):
         """
-        Returns the _velocity attribute
+        Replaces the rectangles of the batch with the active bolts of the pool
+
+        Parameter bolts: the bolts to draw
+        Precondition: bolts is a BoltPool object
         """
-        return self._velocity
+        quads=[]
+        for i in bolts.indices():
+            b=bolts.get(i)
+            quads.append((b.x,b.y,b.width,b.height))
+        self.set_quads(0,quads)
 
 
-    def move(self):
+class Painter(object):
+    """
+    A class to draw the window-free bodies of a Wave with the models above.
+
+    The game state of a Wave is kept in the light ShipBody and BoltBody
+    classes of sim.py. A Painter is the only place where Kivy-backed models
+    are made for them, and only when there is something to draw: one Ship,
+    and one BoltBatch for all of the bolts. They are reused from then on, and
+    copy the position (and animation frame) of the bodies each time they are
+    drawn.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _ship: the Ship that draws the ship body
+    # Invariant: _ship is a Ship object, or None if no ship was drawn yet
+    #
+    # Attribute _bolts: the batch that draws the bolt bodies
+    # Invariant: _bolts is a BoltBatch object, or None if no bolts were drawn
+    # yet
+
+    # INITIALIZER TO CREATE AN EMPTY PAINTER
+    def __init__(self):
         """
-        Moves the Bolt in the y direction by _velocity pixels
+        Initializes the Painter with no models
         """
-        self.y=self.y+self.getVelocity()
+        self._ship=None
+        self._bolts=None
 
-    # INITIALIZER TO SET THE VELOCITY
-    def __init__(self,x,y,vel,width=BOLT_WIDTH,height=BOLT_HEIGHT):
-        """
-        Initializes the Bolt
 
-        Parameter x: horizontal coordinate of the center of the Bolt object
-        Precondition: x is a float or int
+    # METHODS TO DRAW THE BODIES
+    def drawShip(self,body,view):
+        """
+        Draws the ship body in view
 
-        Parameter y: vertical coordinate of the center of the Bolt object
-        Precondition: y is a float or int
+        Parameter body: the ship to draw
+        Precondition: body is a ShipBody object
 
-        Parameter vel: horizontal velocity of the bolt
-        Precondition: vel is a float or int
+        Parameter view: the game view
+        Precondition: view is an instance of GView
         """
-        super().__init__(x=x,y=y,width=width,height=height,
-                       fillcolor='black')
-        self._velocity=vel
+        if (self._ship==None):
+            self._ship=Ship()
+        self._ship.x=body.x
+        self._ship.y=body.y
+        self._ship.frame=body.frame
+        self._ship.draw(view)
 
-    # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
-    def isPlayerBolt(self):
-        """
-        Returns true if the Bolt is shot from the player;
-        otherwise, return False
+
+    def drawBolts(self,bolts,view):
         """
-        if(self.getVelocity()<0):
-            return False
-        return True
+        Draws every active bolt of the pool in view, as one batch
 
+        Parameter bolts: the bolts to draw
+        Precondition: bolts is a BoltPool object
 
-# IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
+        Parameter view: the game view
+        Precondition: view is an instance of GView
+        """
+        if (self._bolts==None):
+            self._bolts=BoltBatch()
+        self._bolts.load(bolts)
+        self._bolts.draw(view)
@@ -0,0 +1,348 @@
+"""
+Recording and replay module for Alien Invaders
+
+This module contains the class Recording, which stores the keys held down and
+the time step of every frame of a game, and the class Session, a window-free
+copy of the game states in Invaders. Playing a Recording through a Session
+reproduces the game exactly, as fast as the CPU allows, so that a bug seen by a
+player can be replayed and a real game can be used as a performance workload.
+
+Run the game with a file name after the usual three arguments to record the
+game to that file when the window closes:
+
+    python . [rows] [aliens-per-row] [speed] [recording]
+
+Run this module as a script with the same arguments to replay it:
+
+    python replay.py [rows] [aliens-per-row] [speed] [recording]
+
+# Evelyn Si es828
+# 12/7/21
+"""
+from consts import *
+from array import array
+import numpy as np
+import struct
+import time
+
+# PRIMARY RULE: Like sim.py, this module must never import Kivy, directly or
+# indirectly. The game2d package only loads Kivy for its Kivy-backed classes.
+
+# The keys that the game consults, one bit each in a frame of a recording
+RECORDED_KEYS = ('left','right','up','s')
+# The key pressed on replay for any other keys held down (only the number of
+# keys down matters for those)
+OTHER_KEY = 'other'
+# The first bytes of every recording file (changes whenever the layout does)
+RECORDING_MAGIC = b'AIR1'
+# The layout of the start of a recording file: magic, rows, aliens per row,
+# alien speed, has seed, seed, and number of frames
+RECORDING_HEAD = struct.Struct('<4sHHdBQI')
+
+
+class Recording(object):
+    """
+    A class to represent the input to one game of Alien Invaders.
+
+    A recording stores the seed of the wave and, for every frame, the time
+    step and the keys held down. The keys are stored as a bit mask over
+    RECORDED_KEYS, plus one bit for any other key.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _rows: the number of alien rows the game was played with
+    # Invariant: _rows is an int > 0
+    #
+    # Attribute _cols: the number of aliens per row the game was played with
+    # Invariant: _cols is an int > 0
+    #
+    # Attribute _speed: the alien speed the game was played with
+    # Invariant: _speed is a float > 0
+    #
+    # Attribute _seed: the seed of the wave, if one was created
+    # Invariant: _seed is an int in 0..2**64-1, or None
+    #
+    # Attribute _dts: the time step of each frame
+    # Invariant: _dts is an array of floats (type 'd')
+    #
+    # Attribute _masks: the keys held down at each frame, as bit masks
+    # Invariant: _masks is a bytearray with the same length as _dts
+
+    # GETTERS AND SETTERS
+    def getSeed(self):
+        """
+        Returns the seed of the wave, or None if the game never started one
+        """
+        return self._seed
+
+
+    def setSeed(self,seed):
+        """
+        Sets the seed of the wave
+
+        Parameter seed: the seed of the wave
+        Precondition: seed is an int in 0..2**64-1
+        """
+        assert type(seed)==int and 0<=seed<2**64, repr(seed)+' is not a valid seed'
+        self._seed=seed
+
+
+    def getSize(self):
+        """
+        Returns the (rows, aliens per row, speed) that the game was played with
+        """
+        return (self._rows,self._cols,self._speed)
+
+
+    def count(self):
+        """
+        Returns the number of frames recorded
+        """
+        return len(self._dts)
+
+
+    # INITIALIZER TO CREATE AN EMPTY RECORDING
+    def __init__(self,rows=ALIEN_ROWS,cols=ALIENS_IN_ROW,speed=ALIEN_SPEED):
+        """
+        Initializes a recording with no frames
+
+        Parameter rows: the number of alien rows
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of aliens per row
+        Precondition: cols is an int > 0
+
+        Parameter speed: the alien speed
+        Precondition: speed is a float > 0
+        """
+        self._rows=rows
+        self._cols=cols
+        self._speed=float(speed)
+        self._seed=None
+        self._dts=array('d')
+        self._masks=bytearray()
+
+
+    # METHODS TO ADD AND READ FRAMES
+    def capture(self,input,dt):
+        """
+        Appends a frame with the keys currently held down in input
+
+        Parameter input: the input for this frame
+        Precondition: input is an instance of GInput or HeadlessInput
+
+        Parameter dt: the time step of this frame
+        Precondition: dt is a float > 0
+        """
+        mask=0
+        down=0
+        for i in range(len(RECORDED_KEYS)):
+            if (input.is_key_down(RECORDED_KEYS[i])):
+                mask=mask|(1<<i)
+                down=down+1
+        if (input.key_count>down):
+            mask=mask|(1<<len(RECORDED_KEYS))
+        self._dts.append(dt)
+        self._masks.append(mask)
+
+
+    def frames(self):
+        """
+        Returns an iterator over the (dt, mask) pairs of the frames, in order
+        """
+        return zip(self._dts,self._masks)
+
+
+    # METHODS TO SAVE AND LOAD THE RECORDING
+    def save(self,filename):
+        """
+        Writes this recording to a file
+
+        The layout is RECORDING_HEAD, then the time steps (little-endian
+        float64) and then the masks (one byte per frame).
+
+        Parameter filename: the name of the file
+        Precondition: filename is a string
+        """
+        head=RECORDING_HEAD.pack(RECORDING_MAGIC,self._rows,self._cols,
+            self._speed,self._seed!=None,
+            self._seed if self._seed!=None else 0,len(self._dts))
+        with open(filename,'wb') as file:
+            file.write(head)
+            file.write(np.asarray(self._dts,'<f8').tobytes())
+            file.write(self._masks)
+
+
+def load(filename):
+    """
+    Returns the Recording stored in a file
+
+    Parameter filename: the name of a file written by Recording.save
+    Precondition: filename is a string
+    """
+    with open(filename,'rb') as file:
+        data=file.read()
+    head=RECORDING_HEAD.unpack_from(data,0)
+    assert head[0]==RECORDING_MAGIC, filename+' is not a recording'
+    count=head[6]
+    offset=RECORDING_HEAD.size
+    assert len(data)==offset+9*count, filename+' is truncated'
+    result=Recording(head[1],head[2],head[3])
+    if (head[4]):
+        result.setSeed(head[5])
+    result._dts=array('d',np.frombuffer(data,'<f8',count,offset).tolist())
+    result._masks=bytearray(data[offset+8*count:])
+    return result
+
+
+class Session(object):
+    """
+    A class to represent a window-free game of Alien Invaders.
+
+    This class has the same states, and changes between them on the same
+    frames, as Invaders. It plays a headless Wave and displays no messages.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _state: the current state of the game represented as an int
+    # Invariant: _state is one of STATE_INACTIVE, STATE_NEWWAVE, STATE_ACTIVE,
+    # STATE_PAUSED, STATE_CONTINUE, or STATE_COMPLETE
+    #
+    # Attribute _wave: the subcontroller for a single wave, managing aliens
+    # Invariant: _wave is a headless Wave object, or None if _state is
+    # STATE_INACTIVE
+    #
+    # Attribute _seed: the seed for the wave, or None for a fresh one
+    # Invariant: _seed is an int in 0..2**64-1, or None
+    #
+    # Attribute _last: number of keys pressed in the previous frame
+    # Invariant: _last is an int >=0
+
+    # GETTERS
+    def getState(self):
+        """
+        Returns the current state of the game
+        """
+        return self._state
+
+
+    def getWave(self):
+        """
+        Returns the current wave, or None if no wave has started
+        """
+        return self._wave
+
+
+    # INITIALIZER TO CREATE A GAME WAITING TO START
+    def __init__(self,seed=None):
+        """
+        Initializes a game in STATE_INACTIVE
+
+        Parameter seed: the seed for the wave, or None for a fresh one
+        Precondition: seed is None or an int in 0..2**64-1
+        """
+        self._state=STATE_INACTIVE
+        self._wave=None
+        self._seed=seed
+        self._last=0
+
+
+    # UPDATE METHOD TO CHANGE STATE OR PLAY THE WAVE
+    def update(self,input,dt):
+        """
+        Animates a single frame in the game, exactly as Invaders.update does
+
+        Parameter input: the keys held down this frame
+        Precondition: input is an instance of HeadlessInput
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+        """
+        from wave import Wave, ShipBody
+
+        if self._state==STATE_INACTIVE:
+            self._begin(input)
+        if self._state==STATE_NEWWAVE:
+            self._wave=Wave(headless=True,seed=self._seed)
+            self._state=STATE_ACTIVE
+        if self._state==STATE_ACTIVE:
+            self._wave.update(input,dt)
+            if (self._wave.getDeath()==False):
+                if(self._wave.getAlienCount()==0 or self._wave.getBelow()):
+                    self._state=STATE_COMPLETE
+            else:
+                self._state=STATE_PAUSED
+        if self._state==STATE_PAUSED:
+            if (self._wave.getLives()>0):
+                self._begin(input)
+                self._wave.setDeath()
+            else:
+                self._state=STATE_COMPLETE
+        if self._state==STATE_CONTINUE:
+            self._wave.setShip(ShipBody())
+            self._state=STATE_ACTIVE
+
+
+    # HELPER METHOD FOR THE STATES
+    def _begin(self,input):
+        """
+        Advances the state if s is newly pressed; otherwise nothing happens
+
+        Parameter input: the keys held down this frame
+        Precondition: input is an instance of HeadlessInput
+        """
+        pressed=input.key_count
+        if (pressed>0 and self._last==0):
+            if (input.is_key_down('s')):
+                self._state=self._state+1
+        self._last=pressed
+
+
+# FUNCTIONS TO REPLAY A RECORDING
+def play(recording):
+    """
+    Returns a dictionary of statistics after replaying a recording.
+
+    The recording is played through a Session as fast as possible, stopping
+    early once the game is complete (no later frame can change it). The
+    dictionary has the keys 'seed', 'frames', 'seconds', 'frames_per_sec',
+    'state', 'lives', 'aliens' and 'below'.
+
+    Parameter recording: the recording to replay
+    Precondition: recording is a Recording made with the current ALIEN_ROWS,
+    ALIENS_IN_ROW and ALIEN_SPEED
+    """
+    from game2d.headless import HeadlessInput
+
+    assert recording.getSize()==(ALIEN_ROWS,ALIENS_IN_ROW,ALIEN_SPEED), \
+        'recording was made with (rows, aliens per row, speed) '+ \
+        repr(recording.getSize())
+    keys=[tuple(k for (i,k) in enumerate(RECORDED_KEYS+(OTHER_KEY,))
+                if mask&(1<<i)) for mask in range(1<<(len(RECORDED_KEYS)+1))]
+    session=Session(recording.getSeed())
+    input=HeadlessInput()
+    last=0
+    count=0
+    start=time.perf_counter()
+    for (dt,mask) in recording.frames():
+        if (mask!=last):
+            input.set_keys(keys[mask])
+            last=mask
+        session.update(input,dt)
+        count=count+1
+        if (session.getState()==STATE_COMPLETE):
+            break
+    seconds=time.perf_counter()-start
+    wave=session.getWave()
+    return {'seed':recording.getSeed(),'frames':count,'seconds':seconds,
+            'frames_per_sec':count/seconds if seconds>0 else float('inf'),
+            'state':session.getState(),
+            'lives':wave.getLives() if wave!=None else None,
+            'aliens':wave.getAlienCount() if wave!=None else None,
+            'below':wave.getBelow() if wave!=None else None}
+
+
+if __name__=='__main__':
+    import sys
+    stats=play(load(sys.argv[4]))
+    print('%d frames in %.3f s: %.0f frames/sec (state %d, lives %s, aliens %s)' %
+          (stats['frames'],stats['seconds'],stats['frames_per_sec'],
+           stats['state'],stats['lives'],stats['aliens']))
@@ -0,0 +1,241 @@
+"""
+Parallel runner for headless games of Alien Invaders
+
+This module plays many headless games at once, one per seed, over a pool of
+worker processes, and merges the results into a summary table for each
+formation size. It is for balance sweeps: every game is independent, so the
+sweep scales with the number of cores.
+
+The formation size is set the same way as for the game, by the command line
+arguments that consts.py reads. Each size therefore gets its own pool of
+freshly started workers, which set sys.argv before their first import of
+consts. For the same reason, this module must never import consts (or any
+module that imports it) at the top level. The workers only import sim and
+wave in headless mode, so they never load Kivy.
+
+Run this module as a script:
+
+    python runner.py [--seeds 0:1000] [--size 5x12x1.0 ...] [--policy autopilot]
+                     [--steps 100000] [--workers N] [--out results.csv]
+
+A policy is the name of one in POLICIES, or 'module:function' for a function
+that takes the frame number and returns the keys to hold down.
+
+# Evelyn Si es828
+# 12/7/21
+"""
+import multiprocessing
+import importlib
+import sys
+
+# The columns of a per-game result, in the order they are written out
+RESULT_FIELDS = ('rows','cols','speed','seed','won','below','lives','aliens',
+                 'steps','seconds')
+
+
+# POLICIES FOR THE PLAYER
+def _idle(frame):
+    """
+    Returns no keys, for a player that never moves or fires
+
+    Parameter frame: the frame number
+    Precondition: frame is an int >= 0
+    """
+    return ()
+
+
+def _fire(frame):
+    """
+    Returns the fire key, for a player that fires whenever it can but never moves
+
+    Parameter frame: the frame number
+    Precondition: frame is an int >= 0
+    """
+    return ('up',)
+
+
+# The policies that can be named on the command line
+POLICIES = {'autopilot':'sim:_autopilot','idle':'runner:_idle',
+            'fire':'runner:_fire'}
+
+
+# FUNCTIONS RUN IN THE WORKERS
+def _configure(size):
+    """
+    Sets the formation size of this worker, before consts is first imported
+
+    Parameter size: the (rows, aliens per row, speed) to play with
+    Precondition: size is a tuple of an int, an int and a float
+    """
+    assert 'consts' not in sys.modules, 'consts was imported before the size was set'
+    sys.argv[1:]=[str(value) for value in size]
+
+
+def _policy(name):
+    """
+    Returns the policy function with the given name
+
+    Parameter name: a key of POLICIES, or 'module:function'
+    Precondition: name is a string
+    """
+    path=POLICIES.get(name,name)
+    assert ':' in path, repr(name)+' is not a policy'
+    module,function=path.split(':')
+    return getattr(importlib.import_module(module),function)
+
+
+def _play(task):
+    """
+    Returns the result of one headless game as a dictionary with RESULT_FIELDS
+
+    The rows, cols and speed are the values consts.py settled on, which are
+    clamped to the ranges that the game allows.
+
+    Parameter task: the (seed, policy name, maximum steps) of the game
+    Precondition: task is a tuple of an int >= 0, a string and an int > 0
+    """
+    import consts
+    import sim
+
+    seed,policy,steps=task
+    stats=sim.run(steps,_policy(policy),seed=seed)
+    assert 'kivy' not in sys.modules, 'a worker imported Kivy'
+    return {'rows':consts.ALIEN_ROWS,'cols':consts.ALIENS_IN_ROW,
+            'speed':consts.ALIEN_SPEED,'seed':seed,
+            'won':stats['aliens']==0,'below':stats['below'],
+            'lives':stats['lives'],'aliens':stats['aliens'],
+            'steps':stats['steps'],'seconds':stats['seconds']}
+
+
+# FUNCTIONS TO RUN AND SUMMARIZE A SWEEP
+def sweep(seeds,sizes,policy='autopilot',steps=100000,workers=None):
+    """
+    Yields the result of each game, as soon as it is finished
+
+    Every seed is played with every formation size. The results of one size
+    all arrive before those of the next, but in no particular order.
+
+    Parameter seeds: the seeds of the games
+    Precondition: seeds is a sequence of ints >= 0
+
+    Parameter sizes: the formation sizes to play with
+    Precondition: sizes is a sequence of (rows, aliens per row, speed) tuples
+
+    Parameter policy: the player, as a key of POLICIES or 'module:function'
+    Precondition: policy is a string
+
+    Parameter steps: the maximum number of frames of a game
+    Precondition: steps is an int > 0
+
+    Parameter workers: the number of processes, or None for one per core
+    Precondition: workers is None or an int > 0
+    """
+    if workers==None:
+        workers=multiprocessing.cpu_count()
+    tasks=[(seed,policy,steps) for seed in seeds]
+    chunk=max(1,len(tasks)//(workers*8))
+    context=multiprocessing.get_context('spawn')
+    for size in sizes:
+        with context.Pool(workers,_configure,(tuple(size),)) as pool:
+            for result in pool.imap_unordered(_play,tasks,chunk):
+                yield result
+
+
+def summarize(results):
+    """
+    Returns a dictionary of totals for each formation size
+
+    The keys are (rows, cols, speed) tuples. Each value is a dictionary with
+    the keys 'games', 'won', 'below', 'lives', 'aliens', 'steps' and 'seconds',
+    each the total over the games of that size.
+
+    Parameter results: the results of games
+    Precondition: results is an iterable of dictionaries from sweep
+    """
+    table={}
+    for result in results:
+        key=(result['rows'],result['cols'],result['speed'])
+        if key not in table:
+            table[key]={'games':0,'won':0,'below':0,'lives':0,'aliens':0,
+                        'steps':0,'seconds':0.0}
+        row=table[key]
+        row['games']=row['games']+1
+        for field in ('won','below','lives','aliens','steps','seconds'):
+            row[field]=row[field]+result[field]
+    return table
+
+
+def tabulate(table):
+    """
+    Returns the summary table as a string, one line per formation size
+
+    Parameter table: the result of summarize
+    Precondition: table is a dictionary from summarize
+    """
+    lines=['%-12s %7s %6s %6s %6s %7s %8s %10s' % ('size','games','won',
+           'below','lives','aliens','steps','steps/sec')]
+    for key in sorted(table):
+        row=table[key]
+        games=row['games']
+        lines.append('%-12s %7d %5.1f%% %5.1f%% %6.2f %7.1f %8.0f %10.0f' %
+                     ('%dx%dx%g' % key,games,100.0*row['won']/games,
+                      100.0*row['below']/games,row['lives']/games,
+                      row['aliens']/games,row['steps']/games,
+                      row['steps']/row['seconds'] if row['seconds']>0 else 0))
+    return '\n'.join(lines)
+
+
+# HELPER FUNCTIONS FOR THE COMMAND LINE
+def _seeds(text):
+    """
+    Returns the range of seeds written as 'start:stop', or 'stop' for 0:stop
+
+    Parameter text: the seeds
+    Precondition: text is a string
+    """
+    if ':' in text:
+        start,stop=text.split(':')
+        return range(int(start),int(stop))
+    return range(int(text))
+
+
+def _size(text):
+    """
+    Returns the formation size written as 'rows x aliens per row x speed'
+
+    Parameter text: the size, such as '5x12x1.0'
+    Precondition: text is a string
+    """
+    rows,cols,speed=text.split('x')
+    return (int(rows),int(cols),float(speed))
+
+
+if __name__=='__main__':
+    import argparse
+    import csv
+
+    parser=argparse.ArgumentParser(description='Play headless games in parallel.')
+    parser.add_argument('--seeds',type=_seeds,default=range(100))
+    parser.add_argument('--size',type=_size,action='append',dest='sizes')
+    parser.add_argument('--policy',default='autopilot')
+    parser.add_argument('--steps',type=int,default=100000)
+    parser.add_argument('--workers',type=int,default=None)
+    parser.add_argument('--out',default=None)
+    args=parser.parse_args()
+
+    results=[]
+    out=open(args.out,'w',newline='') if args.out else None
+    writer=csv.DictWriter(out,RESULT_FIELDS) if out else None
+    if writer:
+        writer.writeheader()
+    try:
+        for result in sweep(args.seeds,args.sizes or [(5,12,1.0)],args.policy,
+                            args.steps,args.workers):
+            results.append(result)
+            if writer:
+                writer.writerow(result)
+                out.flush()
+    finally:
+        if out:
+            out.close()
+    print(tabulate(summarize(results)))
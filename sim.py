@@ -0,0 +1,1270 @@
+"""
+Headless simulation module for Alien Invaders
+
+This module contains the window-free versions of the model classes. They hold
+the same gameplay state as the classes in models.py and follow the same rules,
+but they never build any graphics instructions. Every Wave keeps its state in
+them, headless or not, so a Wave can run without Kivy (bot play, balancing and
+regression runs).
+
+It also contains the class Formation, which stores the aliens of a wave as
+NumPy arrays.
+
+Run this module as a script to measure how many Wave steps per second the
+headless mode achieves. It takes the same arguments as the game, followed by
+the maximum number of steps:
+
+    python sim.py [rows] [aliens-per-row] [speed] [steps]
+
+# Evelyn Si es828
+# 12/7/21
+"""
+from consts import *
+import numpy as np
+import heapq
+import time
+
+# PRIMARY RULE: Like models.py, this module may only access consts.py. It must
+# never import game2d or Kivy, directly or indirectly.
+
+
+class Body(object):
+    """
+    A class to represent an axis-aligned box in the headless simulation.
+
+    This class mirrors the part of GObject that the game rules use: the center
+    (x,y), the size and the four edges. It has no rotation and no scale.
+
+    A Body holds no Kivy objects and uses __slots__, so it costs a few dozen
+    bytes. The game state of every Wave is made of Bodies; the Kivy-backed
+    models in models.py are only made to draw them (see models.Painter).
+    """
+    __slots__=('x','y','width','height')
+    # ATTRIBUTES:
+    # Attribute x: horizontal coordinate of the center
+    # Invariant: x is a float or int
+    #
+    # Attribute y: vertical coordinate of the center
+    # Invariant: y is a float or int
+    #
+    # Attribute width: the width of the box
+    # Invariant: width is a float or int > 0
+    #
+    # Attribute height: the height of the box
+    # Invariant: height is a float or int > 0
+
+    # GETTERS FOR THE EDGES
+    @property
+    def left(self):
+        """
+        The left edge of this box
+        """
+        return self.x-self.width/2.0
+
+    @property
+    def right(self):
+        """
+        The right edge of this box
+        """
+        return self.x+self.width/2.0
+
+    @property
+    def top(self):
+        """
+        The top edge of this box
+        """
+        return self.y+self.height/2.0
+
+    @property
+    def bottom(self):
+        """
+        The bottom edge of this box
+        """
+        return self.y-self.height/2.0
+
+
+    # INITIALIZER
+    def __init__(self,x,y,width,height):
+        """
+        Initializes the Body
+
+        Parameter x: horizontal coordinate of the center of the box
+        Precondition: x is a float or int
+
+        Parameter y: vertical coordinate of the center of the box
+        Precondition: y is a float or int
+
+        Parameter width: the width of the box
+        Precondition: width is a float or int > 0
+
+        Parameter height: the height of the box
+        Precondition: height is a float or int > 0
+        """
+        self.x=x
+        self.y=y
+        self.width=width
+        self.height=height
+
+
+    def contains(self,point):
+        """
+        Returns True if this box contains the point; otherwise False
+
+        This is the same test as GObject.contains for an unrotated object.
+
+        Parameter point: the point to check
+        Precondition: point is a pair of numbers
+        """
+        return (abs(point[0]-self.x)<self.width/2.0 and
+                abs(point[1]-self.y)<self.height/2.0)
+
+
+    def draw(self,view):
+        """
+        Does nothing, as a headless Body has nothing to draw
+
+        Parameter view: the game view (unused)
+        Precondition: NONE
+        """
+        pass
+
+
+    # HELPER METHOD FOR THE COLLISION TESTS OF THE SUBCLASSES
+    def _hitBy(self,b):
+        """
+        Returns True if the bolt b overlapped this box anywhere along its last
+        move
+
+        The test is against the box swept by the bolt, so a bolt that moves
+        farther than the height of this box in one step cannot pass through
+        it. For a bolt that has not moved, and is narrower and shorter than
+        this box, this is the same as asking if a corner of the bolt is
+        inside of this box. See sweptHit.
+
+        Parameter b: the bolt
+        Precondition: b is a BoltBody object
+        """
+        return sweptHit(b.x,b.y,b.lastY,self.x,self.y,self.width,self.height,
+                        b.width,b.height)
+
+
+class ShipBody(Body):
+    """
+    A class to represent the game ship in the headless simulation.
+
+    This class follows the same rules as the class Ship in models.py.
+    """
+    __slots__=('frame',)
+    # ATTRIBUTES:
+    # Attribute frame: the current frame of the explosion animation
+    # Invariant: frame is an int in 0..7
+
+    # INITIALIZER TO CREATE A NEW SHIP
+    def __init__(self,x=GAME_WIDTH/2, y=SHIP_BOTTOM+SHIP_HEIGHT/2,
+                 width=SHIP_WIDTH, height=SHIP_HEIGHT):
+        """
+        Initializes the ShipBody object
+        """
+        super().__init__(x,y,width,height)
+        self.frame=0
+
+
+    # METHODS TO MOVE THE SHIP AND CHECK FOR COLLISIONS
+    def move(self,x):
+        """
+        Moves the Ship x pixels to the right from its center if x>0;
+        otherwise moves Ship x pixels to the left from its center.
+
+        Prevents Ship from getting offscreen
+
+        Parameter x: the number of pixels the Ship should move horizontally
+        Precondition: x is a float or int
+        """
+        if (self.x+x<=GAME_WIDTH-self.width/2 and self.x+x>=self.width/2):
+            self.x=self.x+x
+        elif (self.x+x<self.width/2):
+            self.x=self.width/2
+        else:
+            self.x=GAME_WIDTH-self.width/2
+
+
+    def collide(self,b):
+        """
+        Returns True if a Alien bolt collides with the Ship;
+        otherwise return False.
+
+        Parameter b: the Alien bolt
+        Precondition: b is a BoltBody object
+        """
+        if (b.isPlayerBolt()):
+            return False
+        return self._hitBy(b)
+
+
+    # COROUTINE METHOD TO ANIMATE THE SHIP
+    def animateShip(self):
+        """
+        Coroutine to animate the Ship explosion
+        """
+        time=0
+        while time<DEATH_SPEED:
+            dt=(yield)
+            time=time+dt
+            self.frame=int((time/DEATH_SPEED)*7)
+
+
+class BoltBody(Body):
+    """
+    A class representing a laser bolt in the headless simulation.
+
+    It is drawn (with every other bolt of its pool) by a BoltBatch in
+    models.py.
+    """
+    __slots__=('lastY','_velocity')
+    # ATTRIBUTES:
+    # Attribute lastY: the vertical coordinate of the center before the last
+    # move (or where it was fired, if it has not moved since)
+    # Invariant: lastY is a float or int
+    #
+    # Attribute _velocity: the velocity in y direction
+    # Invariant: _velocity is an int or float
+
+    # GETTERS FOR THE SWEPT BOX
+    @property
+    def sweptBottom(self):
+        """
+        The bottom edge of the box covered by this bolt during its last move
+        """
+        return min(self.y,self.lastY)-self.height/2.0
+
+    @property
+    def sweptTop(self):
+        """
+        The top edge of the box covered by this bolt during its last move
+        """
+        return max(self.y,self.lastY)+self.height/2.0
+
+
+    def getVelocity(self):
+        """
+        Returns the _velocity attribute
+        """
+        return self._velocity
+
+
+    def move(self,scale=1):
+        """
+        Moves the Bolt in the y direction by scale*_velocity pixels
+
+        Parameter scale: the number of FRAME_RATE updates to move for
+        Precondition: scale is a float or int > 0
+        """
+        self.lastY=self.y
+        self.y=self.y+self._velocity*scale
+
+
+    def fire(self,x,y,vel):
+        """
+        Fires this Bolt again from (x,y) with velocity vel, so it can be reused
+
+        Parameter x: horizontal coordinate of the center of the Bolt object
+        Precondition: x is a float or int
+
+        Parameter y: vertical coordinate of the center of the Bolt object
+        Precondition: y is a float or int
+
+        Parameter vel: vertical velocity of the bolt
+        Precondition: vel is a float or int
+        """
+        self.x=x
+        self.y=y
+        self.lastY=y
+        self._velocity=vel
+
+
+    # INITIALIZER TO SET THE VELOCITY
+    def __init__(self,x,y,vel,width=BOLT_WIDTH,height=BOLT_HEIGHT):
+        """
+        Initializes the BoltBody
+
+        Parameter x: horizontal coordinate of the center of the Bolt object
+        Precondition: x is a float or int
+
+        Parameter y: vertical coordinate of the center of the Bolt object
+        Precondition: y is a float or int
+
+        Parameter vel: vertical velocity of the bolt
+        Precondition: vel is a float or int
+        """
+        super().__init__(x,y,width,height)
+        self.lastY=y
+        self._velocity=vel
+
+
+    def isPlayerBolt(self):
+        """
+        Returns true if the Bolt is shot from the player;
+        otherwise, return False
+        """
+        return self._velocity>=0
+
+
+class Formation(object):
+    """
+    A class to represent the grid of aliens in a wave as parallel arrays.
+
+    Every alien is a cell in a rows x cols grid. Row 0 is the top row and
+    column 0 is the leftmost column, just like the old 2d list of Aliens. The
+    centers, the alive mask and the image of every cell are stored in NumPy
+    arrays, so that a march step or a descent is one vectorized operation
+    instead of one GObject write per alien. Dead cells keep moving with the
+    rest of the formation; they are simply never drawn or hit.
+
+    The array attributes may be read directly, but should only be changed with
+    the methods of this class, so that version stays correct.
+
+    The formation also keeps an index of which columns are occupied. It is
+    updated on each kill, so that finding the bottom alien of a column, the
+    leftmost and rightmost occupied columns, or a random occupied column
+    takes constant time no matter how many aliens are left.
+
+    A formation larger than ALIEN_ROWS_MAX x ALIENS_IN_ROW_MAX is huge (the
+    stress mode). Its aliens, and the space between them, are shrunk so that
+    it fits in a box of HUGE_WIDTH x HUGE_HEIGHT pixels.
+    """
+    # ATTRIBUTES:
+    # Attribute x: horizontal coordinates of the alien centers
+    # Invariant: x is a rows x cols float array
+    #
+    # Attribute y: vertical coordinates of the alien centers
+    # Invariant: y is a rows x cols float array
+    #
+    # Attribute alive: True for each alien that has not been destroyed
+    # Invariant: alive is a rows x cols bool array
+    #
+    # Attribute image: the image of each alien, as an index into ALIEN_IMAGES
+    # Invariant: image is a rows x cols int array with values in
+    # 0..len(ALIEN_IMAGES)-1
+    #
+    # Attribute width: the width of a single alien
+    # Invariant: width is a float or int > 0
+    #
+    # Attribute height: the height of a single alien
+    # Invariant: height is a float or int > 0
+    #
+    # Attribute hsep: the horizontal space between two aliens
+    # Invariant: hsep is a float or int > 0
+    #
+    # Attribute vsep: the vertical space between two aliens
+    # Invariant: vsep is a float or int > 0
+    #
+    # Attribute version: the number of times the positions have changed
+    # Invariant: version is an int >= 0
+    #
+    # Attribute _count: the number of live aliens
+    # Invariant: _count is an int equal to the number of True values in alive
+    #
+    # Attribute _bottom: the row of the bottom live alien in each column
+    # Invariant: _bottom is a list of cols ints; _bottom[c] is the largest r
+    # with alive[r,c], or -1 if column c is empty
+    #
+    # Attribute _occupied: the columns with at least one live alien
+    # Invariant: _occupied is a list of the c with _bottom[c]>=0, in no order
+    #
+    # Attribute _slot: the position of each occupied column in _occupied
+    # Invariant: _slot is a dict with _occupied[_slot[c]]==c for each c
+    #
+    # Attribute _left: the leftmost occupied column
+    # Invariant: _left is the smallest c in _occupied, or -1 if it is empty
+    #
+    # Attribute _right: the rightmost occupied column
+    # Invariant: _right is the largest c in _occupied, or -1 if it is empty
+    #
+    # Attribute _lowest: the lowest row with a live alien
+    # Invariant: _lowest is the largest value in _bottom
+    #
+    # Attribute _inRow: the number of live aliens in each row
+    # Invariant: _inRow is a list of rows ints; _inRow[r] is the number of c
+    # with alive[r,c]
+    #
+    # Attribute _highest: the highest row with a live alien
+    # Invariant: _highest is the smallest r with _inRow[r]>0, or rows if every
+    # alien is dead
+
+    # GETTERS
+    @property
+    def rows(self):
+        """
+        The number of rows in this formation
+        """
+        return self.alive.shape[0]
+
+    @property
+    def cols(self):
+        """
+        The number of aliens in each row of this formation
+        """
+        return self.alive.shape[1]
+
+    @property
+    def huge(self):
+        """
+        True if this formation is larger than ALIEN_ROWS_MAX x ALIENS_IN_ROW_MAX
+        """
+        return self.rows>ALIEN_ROWS_MAX or self.cols>ALIENS_IN_ROW_MAX
+
+
+    # INITIALIZER TO BUILD THE GRID OF ALIENS
+    def __init__(self,rows=ALIEN_ROWS,cols=ALIENS_IN_ROW):
+        """
+        Initializes the Formation with every alien alive
+
+        The aliens are placed ALIEN_CEILING below the top of the window,
+        ALIEN_H_SEP from the left edge. The images change every two rows,
+        starting with ALIEN_IMAGES[0] at the bottom.
+
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int in 1..HUGE_ROWS_MAX
+
+        Parameter cols: the number of aliens in each row
+        Precondition: cols is an int in 1..HUGE_IN_ROW_MAX
+        """
+        if (rows<=ALIEN_ROWS_MAX and cols<=ALIENS_IN_ROW_MAX):
+            scale=1
+        else:
+            scale=min(HUGE_WIDTH/(cols*(ALIEN_WIDTH+ALIEN_H_SEP)),
+                      HUGE_HEIGHT/(rows*(ALIEN_HEIGHT+ALIEN_V_SEP)),1.0)
+        self.width=ALIEN_WIDTH*scale
+        self.height=ALIEN_HEIGHT*scale
+        self.hsep=ALIEN_H_SEP*scale
+        self.vsep=ALIEN_V_SEP*scale
+        left=self.width/2+ALIEN_H_SEP
+        top=GAME_HEIGHT-(ALIEN_CEILING+self.height/2)
+        xs=left+np.arange(cols)*(self.width+self.hsep)
+        ys=top-np.arange(rows)*(self.height+self.vsep)
+        self.x=np.repeat(xs[np.newaxis,:],rows,axis=0).astype(float)
+        self.y=np.repeat(ys[:,np.newaxis],cols,axis=1).astype(float)
+        self.alive=np.ones((rows,cols),dtype=bool)
+        built=rows-1-np.arange(rows)
+        images=(built//2)%len(ALIEN_IMAGES)
+        self.image=np.repeat(images[:,np.newaxis],cols,axis=1)
+        self.version=0
+        self._count=rows*cols
+        self._bottom=[rows-1]*cols
+        self._occupied=list(range(cols))
+        self._slot={c:c for c in range(cols)}
+        self._left=0
+        self._right=cols-1
+        self._lowest=rows-1
+        self._inRow=[cols]*rows
+        self._highest=0
+
+
+    # METHODS TO MOVE THE FORMATION
+    def march(self,dx):
+        """
+        Moves every alien dx pixels to the right (or to the left if dx<0)
+
+        Parameter dx: the number of pixels to move
+        Precondition: dx is a float or int
+        """
+        self.x+=dx
+        self.version=self.version+1
+
+
+    def descend(self,dy):
+        """
+        Moves every alien dy pixels down
+
+        Parameter dy: the number of pixels to move
+        Precondition: dy is a float or int
+        """
+        self.y-=dy
+        self.version=self.version+1
+
+
+    # METHODS TO QUERY AND DESTROY ALIENS
+    def isAlive(self,r,c):
+        """
+        Returns True if the alien at row r and column c is alive
+
+        Parameter r: the row
+        Precondition: r is an int in 0..rows-1
+
+        Parameter c: the column
+        Precondition: c is an int in 0..cols-1
+        """
+        return bool(self.alive[r,c])
+
+
+    def kill(self,r,c):
+        """
+        Destroys the alien at row r and column c, and updates the column index
+
+        Nothing happens if that alien is already dead.
+
+        Parameter r: the row
+        Precondition: r is an int in 0..rows-1
+
+        Parameter c: the column
+        Precondition: c is an int in 0..cols-1
+        """
+        if (not self.alive[r,c]):
+            return
+        self.alive[r,c]=False
+        self._count=self._count-1
+        self._inRow[r]=self._inRow[r]-1
+        while self._highest<self.rows and self._inRow[self._highest]==0:
+            self._highest=self._highest+1
+        if (r==self._bottom[c]):
+            lowest=r==self._lowest
+            while r>=0 and not self.alive[r,c]:
+                r=r-1
+            self._bottom[c]=r
+            if (r<0):
+                self._emptyColumn(c)
+            if (lowest):
+                self._lowest=max(self._bottom)
+
+
+    def count(self):
+        """
+        Returns the number of aliens still alive
+        """
+        return self._count
+
+
+    def bottomRow(self,c):
+        """
+        Returns the row of the bottom live alien in column c, or -1 if the
+        column is empty
+
+        Parameter c: the column
+        Precondition: c is an int in 0..cols-1
+        """
+        return self._bottom[c]
+
+
+    def leftColumn(self):
+        """
+        Returns the leftmost column with a live alien, or -1 if there is none
+        """
+        return self._left
+
+
+    def rightColumn(self):
+        """
+        Returns the rightmost column with a live alien, or -1 if there is none
+        """
+        return self._right
+
+
+    def bounds(self):
+        """
+        Returns the box around the live aliens as (left, bottom, right, top),
+        or None if every alien is dead
+
+        The box is read from the leftmost and rightmost occupied columns and
+        the lowest and highest live rows, which kill keeps up to date, so this
+        takes constant time. Any alien may have been killed, including those
+        in the top row.
+        """
+        if (self._count==0):
+            return None
+        w=self.width/2.0
+        h=self.height/2.0
+        return (self.x[0,self._left]-w,self.y[self._lowest,0]-h,
+                self.x[0,self._right]+w,self.y[self._highest,0]+h)
+
+
+    def randomColumn(self,rng):
+        """
+        Returns a column with a live alien, chosen uniformly at random
+
+        Parameter rng: the random number generator to use
+        Precondition: rng is a RandomStream or random.Random object, and at
+        least one alien is alive
+        """
+        return self._occupied[rng.randint(0,len(self._occupied)-1)]
+
+
+    def center(self,r,c):
+        """
+        Returns the center of the alien at row r and column c as a pair of floats
+
+        Parameter r: the row
+        Precondition: r is an int in 0..rows-1
+
+        Parameter c: the column
+        Precondition: c is an int in 0..cols-1
+        """
+        return (float(self.x[r,c]),float(self.y[r,c]))
+
+
+    def collide(self,r,c,b):
+        """
+        Returns True if a player bolt collides with the alien at row r and
+        column c; otherwise return False.
+
+        This is the swept test of sweptHit. It also returns False if the
+        alien is dead or the bolt was not fired from the player.
+
+        Parameter r: the row
+        Precondition: r is an int in 0..rows-1
+
+        Parameter c: the column
+        Precondition: c is an int in 0..cols-1
+
+        Parameter b: the player bolt
+        Precondition: b is a BoltBody object
+        """
+        if (not self.alive[r,c] or not b.isPlayerBolt()):
+            return False
+        return sweptHit(b.x,b.y,b.lastY,float(self.x[r,c]),float(self.y[r,c]),
+                        self.width,self.height,b.width,b.height)
+
+
+    # HELPER METHOD TO UPDATE THE COLUMN INDEX
+    def _emptyColumn(self,c):
+        """
+        Removes the column c from the index of occupied columns
+
+        Parameter c: the column that just lost its last live alien
+        Precondition: c is an int in _occupied
+        """
+        last=self._occupied.pop()
+        if (last!=c):
+            self._occupied[self._slot[c]]=last
+            self._slot[last]=self._slot[c]
+        del self._slot[c]
+        if (not self._occupied):
+            self._left=-1
+            self._right=-1
+            return
+        while self._bottom[self._left]<0:
+            self._left=self._left+1
+        while self._bottom[self._right]<0:
+            self._right=self._right-1
+
+
+    def below(self,line):
+        """
+        Returns True if the bottom of any live alien is at or below line
+
+        This is one comparison against the bottom of bounds().
+
+        Parameter line: the vertical coordinate to test against
+        Precondition: line is a float or int
+        """
+        box=self.bounds()
+        return box!=None and bool(box[1]<=line)
+
+
+    # METHOD TO DRAW THE FORMATION AS ONE IMAGE
+    def pixels(self,colors):
+        """
+        Returns the formation as an image with one pixel per alien
+
+        The result is a rows x cols x 4 array of RGBA bytes, with the bottom
+        row first (the order of a texture). Each alien gets the color of its
+        image, and dead aliens are transparent.
+
+        Parameter colors: the RGBA color of each image in ALIEN_IMAGES
+        Precondition: colors is a sequence of len(ALIEN_IMAGES) 4-tuples of
+        ints in 0..255
+        """
+        # Look up whole pixels (as one uint32 each), then mask the alpha bytes
+        palette=np.ascontiguousarray(colors,dtype=np.uint8).view(np.uint32)[:,0]
+        result=np.take(palette,self.image[::-1]).view(np.uint8)
+        result=result.reshape(self.rows,self.cols,4)
+        result[...,3]*=self.alive[::-1]
+        return result
+
+
+    # METHODS TO SAVE AND RESTORE THE FORMATION
+    def packedSize(self):
+        """
+        Returns the number of bytes in the result of pack()
+        """
+        return self.rows*self.cols*(8+8+1)+self.cols*(2+2)
+
+
+    def pack(self):
+        """
+        Returns the positions, alive mask and column index as bytes
+
+        The layout is fixed for a given number of rows and columns: the x array
+        and the y array (little-endian float64, row by row), the alive mask (one
+        byte per alien), the bottom live row of each column (int16, -1 if it is
+        empty) and then the occupied columns in index order (int16, padded
+        with -1).
+        """
+        occupied=np.full(self.cols,-1,dtype='<i2')
+        occupied[:len(self._occupied)]=self._occupied
+        return b''.join((np.asarray(self.x,'<f8').tobytes(),
+                         np.asarray(self.y,'<f8').tobytes(),
+                         self.alive.tobytes(),
+                         np.asarray(self._bottom,'<i2').tobytes(),
+                         occupied.tobytes()))
+
+
+    def unpack(self,data):
+        """
+        Restores the positions, alive mask and column index from bytes
+
+        Parameter data: the result of pack() on a formation of the same size
+        Precondition: data is a bytes-like object of length packedSize()
+        """
+        assert len(data)==self.packedSize(), 'data does not match the formation'
+        n=self.rows*self.cols
+        shape=(self.rows,self.cols)
+        self.x[...]=np.frombuffer(data,'<f8',n,0).reshape(shape)
+        self.y[...]=np.frombuffer(data,'<f8',n,8*n).reshape(shape)
+        self.alive[...]=np.frombuffer(data,bool,n,16*n).reshape(shape)
+        columns=np.frombuffer(data,'<i2',2*self.cols,17*n).tolist()
+        self._bottom=columns[:self.cols]
+        self._occupied=[c for c in columns[self.cols:] if c>=0]
+        self._slot={c:i for (i,c) in enumerate(self._occupied)}
+        self._count=int(np.count_nonzero(self.alive))
+        self._left=min(self._occupied) if self._occupied else -1
+        self._right=max(self._occupied) if self._occupied else -1
+        self._lowest=max(self._bottom)
+        self._inRow=np.count_nonzero(self.alive,axis=1).tolist()
+        alive=[r for r in range(self.rows) if self._inRow[r]>0]
+        self._highest=alive[0] if alive else self.rows
+        self.version=self.version+1
+
+
+class SpatialGrid(object):
+    """
+    A class to represent a uniform grid over the play field for collisions.
+
+    The play field is divided into square cells of GRID_CELL pixels. Each item
+    is a box stored under a key in every cell that the box overlaps. A query
+    with another box returns the keys in the cells that box overlaps, which
+    are the only items it can possibly collide with. The exact test is left
+    to the caller.
+
+    Boxes that extend past the play field are stored in the border cells.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _size: the width and height of a cell
+    # Invariant: _size is a float or int > 0
+    #
+    # Attribute _cols: the number of cells across the play field
+    # Invariant: _cols is an int > 0
+    #
+    # Attribute _rows: the number of cells up the play field
+    # Invariant: _rows is an int > 0
+    #
+    # Attribute _cells: the keys stored in each cell, row by row from the bottom
+    # Invariant: _cells is a list of _rows*_cols sets
+    #
+    # Attribute _where: the cells that each key is stored in
+    # Invariant: _where is a dict mapping each stored key to a list of indices
+    # into _cells
+
+    # INITIALIZER TO MAKE AN EMPTY GRID
+    def __init__(self,width=GAME_WIDTH,height=GAME_HEIGHT,size=GRID_CELL):
+        """
+        Initializes an empty SpatialGrid
+
+        Parameter width: the width of the play field
+        Precondition: width is a float or int > 0
+
+        Parameter height: the height of the play field
+        Precondition: height is a float or int > 0
+
+        Parameter size: the width and height of a cell
+        Precondition: size is a float or int > 0
+        """
+        self._size=size
+        self._cols=int(-(-width//size))
+        self._rows=int(-(-height//size))
+        self._cells=[set() for i in range(self._rows*self._cols)]
+        self._where={}
+
+
+    # METHODS TO ADD AND REMOVE ITEMS
+    def insert(self,key,left,bottom,right,top):
+        """
+        Stores key in every cell overlapped by the given box
+
+        If key is already stored, it is moved to the new box.
+
+        Parameter key: the key identifying the item
+        Precondition: key is hashable
+
+        Parameter left, bottom, right, top: the edges of the box
+        Precondition: each is a float or int, with left<=right and bottom<=top
+        """
+        if (key in self._where):
+            self.remove(key)
+        cells=self._span(left,bottom,right,top)
+        for i in cells:
+            self._cells[i].add(key)
+        self._where[key]=cells
+
+
+    def remove(self,key):
+        """
+        Removes key from the grid, if it is stored
+
+        Parameter key: the key identifying the item
+        Precondition: key is hashable
+        """
+        for i in self._where.pop(key,()):
+            self._cells[i].discard(key)
+
+
+    def clear(self):
+        """
+        Removes every key from the grid
+        """
+        for cells in self._where.values():
+            for i in cells:
+                self._cells[i].clear()
+        self._where.clear()
+
+
+    def query(self,left,bottom,right,top):
+        """
+        Returns the set of keys stored in the cells overlapped by the given box
+
+        Parameter left, bottom, right, top: the edges of the box
+        Precondition: each is a float or int, with left<=right and bottom<=top
+        """
+        found=set()
+        for i in self._span(left,bottom,right,top):
+            found|=self._cells[i]
+        return found
+
+
+    # HELPER METHOD TO FIND THE CELLS UNDER A BOX
+    def _span(self,left,bottom,right,top):
+        """
+        Returns the list of indices of the cells overlapped by the given box
+
+        Parameter left, bottom, right, top: the edges of the box
+        Precondition: each is a float or int, with left<=right and bottom<=top
+        """
+        c0=min(max(int(left//self._size),0),self._cols-1)
+        c1=min(max(int(right//self._size),0),self._cols-1)
+        r0=min(max(int(bottom//self._size),0),self._rows-1)
+        r1=min(max(int(top//self._size),0),self._rows-1)
+        return [r*self._cols+c for r in range(r0,r1+1) for c in range(c0,c1+1)]
+
+
+class BoltPool(object):
+    """
+    A class to represent a fixed set of reusable laser bolts.
+
+    All of the bolts are created when the pool is made. Each one sits in a
+    slot, which is either active (the bolt is on screen) or free. Firing a
+    bolt reuses the lowest free slot, and expiring a bolt just marks its slot
+    free again. Slot numbers never change while a bolt is active, so a slot
+    may be expired in the middle of a loop over indices().
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _bolts: the bolt in each slot
+    # Invariant: _bolts is a list of BoltBody objects
+    #
+    # Attribute _active: whether each slot is active
+    # Invariant: _active is a list of bools, the same length as _bolts
+    #
+    # Attribute _free: the free slots
+    # Invariant: _free is a heap (see heapq) of the i with not _active[i]
+    #
+    # Attribute _high: one more than the highest active slot
+    # Invariant: _high is an int in 0..len(_bolts), and _active[i] is False
+    # for every i >= _high
+
+    # INITIALIZER TO MAKE THE BOLTS
+    def __init__(self,kind,capacity=BOLT_CAPACITY):
+        """
+        Initializes a BoltPool with every slot free
+
+        Parameter kind: the class of the bolts
+        Precondition: kind is BoltBody, or a class with the same methods
+
+        Parameter capacity: the number of slots
+        Precondition: capacity is an int > 0
+        """
+        self._bolts=[kind(0,0,0) for i in range(capacity)]
+        self._active=[False]*capacity
+        self._free=list(range(capacity))
+        self._high=0
+
+
+    # METHODS TO FIRE AND EXPIRE BOLTS
+    def fire(self,x,y,vel):
+        """
+        Returns the slot of a newly fired bolt, or -1 if every slot is active
+
+        Parameter x: horizontal coordinate of the center of the bolt
+        Precondition: x is a float or int
+
+        Parameter y: vertical coordinate of the center of the bolt
+        Precondition: y is a float or int
+
+        Parameter vel: vertical velocity of the bolt
+        Precondition: vel is a float or int
+        """
+        if (not self._free):
+            return -1
+        i=heapq.heappop(self._free)
+        self._bolts[i].fire(x,y,vel)
+        self._active[i]=True
+        self._high=max(self._high,i+1)
+        return i
+
+
+    def expire(self,i):
+        """
+        Frees the slot i, removing its bolt from the screen
+
+        Parameter i: the slot
+        Precondition: i is an active slot
+        """
+        assert self._active[i], 'slot %s is not active' % repr(i)
+        self._active[i]=False
+        heapq.heappush(self._free,i)
+        while self._high>0 and not self._active[self._high-1]:
+            self._high=self._high-1
+
+
+    def clear(self):
+        """
+        Frees every slot
+        """
+        for i in self.indices():
+            self.expire(i)
+
+
+    # METHODS TO ACCESS THE BOLTS
+    def get(self,i):
+        """
+        Returns the bolt in slot i
+
+        Parameter i: the slot
+        Precondition: i is an int in 0..capacity-1
+        """
+        return self._bolts[i]
+
+
+    def isActive(self,i):
+        """
+        Returns True if slot i is active
+
+        Parameter i: the slot
+        Precondition: i is an int in 0..capacity-1
+        """
+        return self._active[i]
+
+
+    def indices(self):
+        """
+        Returns the list of active slots, in increasing order
+        """
+        active=self._active
+        return [i for i in range(self._high) if active[i]]
+
+
+    def count(self):
+        """
+        Returns the number of active slots
+        """
+        return len(self._bolts)-len(self._free)
+
+
+    def capacity(self):
+        """
+        Returns the total number of slots
+        """
+        return len(self._bolts)
+
+
+    # METHODS TO SAVE AND RESTORE THE POOL
+    def packedSize(self):
+        """
+        Returns the number of bytes in the result of pack()
+        """
+        return len(self._bolts)*(1+4*8)
+
+
+    def pack(self):
+        """
+        Returns the slots and their bolts as bytes
+
+        The layout is fixed for a given capacity: one byte per slot (1 if it is
+        active), and then the x, y, velocity and last y of each slot
+        (little-endian float64). Free slots have zero position and velocity.
+        """
+        active=np.zeros(len(self._bolts),dtype=np.uint8)
+        state=np.zeros((len(self._bolts),4),dtype='<f8')
+        for i in self.indices():
+            b=self._bolts[i]
+            active[i]=1
+            state[i]=(b.x,b.y,b.getVelocity(),b.lastY)
+        return active.tobytes()+state.tobytes()
+
+
+    def unpack(self,data):
+        """
+        Restores the slots and their bolts from bytes
+
+        Parameter data: the result of pack() on a pool of the same capacity
+        Precondition: data is a bytes-like object of length packedSize()
+        """
+        assert len(data)==self.packedSize(), 'data does not match the pool'
+        n=len(self._bolts)
+        active=np.frombuffer(data,bool,n,0)
+        state=np.frombuffer(data,'<f8',4*n,n).reshape(n,4)
+        self._active=active.tolist()
+        self._free=np.flatnonzero(~active).tolist()
+        live=np.flatnonzero(active)
+        self._high=int(live[-1])+1 if len(live) else 0
+        for (i,x,y,vel,last) in zip(live.tolist(),*state[live].T.tolist()):
+            b=self._bolts[i]
+            b.fire(x,y,vel)
+            b.lastY=last
+
+
+class RandomStream(object):
+    """
+    A class to represent a small, fast, seedable random number generator.
+
+    This is the SplitMix64 generator. Its whole state is one 64-bit int, so it
+    can be saved and restored far more cheaply than random.Random (whose state
+    is 625 words). It supports the one method of random.Random that the game
+    uses, randint.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _state: the current state of the generator
+    # Invariant: _state is an int in 0..2**64-1
+
+    # INITIALIZER TO SEED THE STREAM
+    def __init__(self,seed):
+        """
+        Initializes the RandomStream from a seed
+
+        Parameter seed: the seed
+        Precondition: seed is an int in 0..2**64-1
+        """
+        self._state=seed&0xFFFFFFFFFFFFFFFF
+
+
+    # METHODS TO DRAW NUMBERS
+    def next(self):
+        """
+        Returns the next 64-bit value in the stream, as an int in 0..2**64-1
+        """
+        self._state=(self._state+0x9E3779B97F4A7C15)&0xFFFFFFFFFFFFFFFF
+        z=self._state
+        z=((z^(z>>30))*0xBF58476D1CE4E5B9)&0xFFFFFFFFFFFFFFFF
+        z=((z^(z>>27))*0x94D049BB133111EB)&0xFFFFFFFFFFFFFFFF
+        return z^(z>>31)
+
+
+    def randint(self,a,b):
+        """
+        Returns a random int in a..b (inclusive), with every value equally likely
+
+        Parameter a: the smallest value
+        Precondition: a is an int
+
+        Parameter b: the largest value
+        Precondition: b is an int >= a
+        """
+        n=b-a+1
+        limit=(1<<64)-(1<<64)%n
+        z=self.next()
+        while z>=limit:
+            z=self.next()
+        return a+z%n
+
+
+    # METHODS TO SAVE AND RESTORE THE STREAM
+    def getstate(self):
+        """
+        Returns the state of the stream, as an int in 0..2**64-1
+        """
+        return self._state
+
+
+    def setstate(self,state):
+        """
+        Restores the state of the stream
+
+        Parameter state: the result of getstate()
+        Precondition: state is an int in 0..2**64-1
+        """
+        self._state=state
+
+
+# FUNCTIONS FOR COLLISION DETECTION
+def sweptHit(x,y,lastY,tx,ty,twidth,theight,width=BOLT_WIDTH,height=BOLT_HEIGHT):
+    """
+    Returns True if a bolt overlapped a target box anywhere along its last
+    move; otherwise return False.
+
+    The test is against the box swept by the bolt from lastY to y, so a bolt
+    that moves farther than the height of the target in one step cannot pass
+    through it. For a bolt that has not moved, and is narrower and shorter
+    than the target, this is the same as asking if a corner of the bolt is
+    inside of the target. Every scalar bolt test in the game calls this, and
+    it builds no tuples.
+
+    Parameter x: the horizontal coordinate of the center of the bolt
+    Precondition: x is a float or int
+
+    Parameter y: the vertical coordinate of the center of the bolt
+    Precondition: y is a float or int
+
+    Parameter lastY: the value of y before the last move of the bolt
+    Precondition: lastY is a float or int
+
+    Parameter tx: the horizontal coordinate of the center of the target
+    Precondition: tx is a float or int
+
+    Parameter ty: the vertical coordinate of the center of the target
+    Precondition: ty is a float or int
+
+    Parameter twidth: the width of the target
+    Precondition: twidth is a float or int > 0
+
+    Parameter theight: the height of the target
+    Precondition: theight is a float or int > 0
+
+    Parameter width: the width of the bolt
+    Precondition: width is a float or int > 0
+
+    Parameter height: the height of the bolt
+    Precondition: height is a float or int > 0
+    """
+    if (abs(x-tx)>=(width+twidth)/2.0):
+        return False
+    if (y<lastY):
+        low=y
+        high=lastY
+    else:
+        low=lastY
+        high=y
+    h=theight/2.0
+    return (low-height/2.0<ty+h and high+height/2.0>ty-h)
+
+
+def sweptHits(x,y,lastY,tx,ty,twidth,theight,width=BOLT_WIDTH,height=BOLT_HEIGHT):
+    """
+    Returns a bool array that is True where a bolt overlapped a target box
+    anywhere along its last move
+
+    This is the test of sweptHit for bolts and targets held in arrays. The
+    arguments broadcast against each other, so this can test one target
+    against many bolts, many targets against one bolt, or pairs of bolts and
+    targets. It gives the same answer as sweptHit for every pair.
+
+    Parameter x: the horizontal coordinate of the center of each bolt
+    Precondition: x is a float or an array of floats
+
+    Parameter y: the vertical coordinate of the center of each bolt
+    Precondition: y is a float or an array of floats
+
+    Parameter lastY: the value of y for each bolt before its last move
+    Precondition: lastY is a float or an array of floats
+
+    Parameter tx: the horizontal coordinate of the center of each target
+    Precondition: tx is a float or an array of floats
+
+    Parameter ty: the vertical coordinate of the center of each target
+    Precondition: ty is a float or an array of floats
+
+    Parameter twidth: the width of the targets
+    Precondition: twidth is a float or int > 0
+
+    Parameter theight: the height of the targets
+    Precondition: theight is a float or int > 0
+
+    Parameter width: the width of the bolts
+    Precondition: width is a float or int > 0
+
+    Parameter height: the height of the bolts
+    Precondition: height is a float or int > 0
+    """
+    low=np.minimum(y,lastY)-height/2.0
+    high=np.maximum(y,lastY)+height/2.0
+    h=theight/2.0
+    return ((abs(np.subtract(x,tx))<(width+twidth)/2.0)&
+            (low<np.add(ty,h))&(high>np.subtract(ty,h)))
+
+
+# FUNCTIONS TO RUN A HEADLESS WAVE
+def run(steps,script=None,dt=1/SIM_RATE,seed=None):
+    """
+    Returns a dictionary of statistics after running a headless Wave.
+
+    The Wave is stepped until it is won or lost, or until steps frames have
+    passed. When the ship is destroyed it is restored immediately, as if the
+    player had pressed a key in the paused state. The dictionary has the keys
+    'seed', 'steps', 'seconds', 'steps_per_sec', 'lives', 'aliens' and 'below'.
+
+    Parameter steps: the maximum number of frames to simulate
+    Precondition: steps is an int > 0
+
+    Parameter script: the keys held down at each frame
+    Precondition: script is None or a function taking the frame number and
+    returning an iterable of key names
+
+    Parameter dt: the time between frames in seconds
+    Precondition: dt is a float > 0
+
+    Parameter seed: the seed for the Wave, or None for a fresh one
+    Precondition: seed is None or an int >= 0
+    """
+    from wave import Wave, ShipBody
+    from game2d.headless import HeadlessInput
+
+    wave=Wave(headless=True,seed=seed)
+    input=HeadlessInput()
+    count=0
+    start=time.perf_counter()
+    while count<steps:
+        if script!=None:
+            input.set_keys(script(count))
+        wave.update(input,dt)
+        count=count+1
+        if wave.getDeath():
+            if wave.getLives()==0:
+                break
+            wave.setDeath()
+            wave.setShip(ShipBody())
+        elif wave.getBelow() or wave.getAlienCount()==0:
+            break
+    seconds=time.perf_counter()-start
+    return {'seed':wave.getSeed(),'steps':count,'seconds':seconds,
+            'steps_per_sec':count/seconds if seconds>0 else float('inf'),
+            'lives':wave.getLives(),'aliens':wave.getAlienCount(),
+            'below':wave.getBelow()}
+
+
+def _autopilot(frame):
+    """
+    Returns the keys for a simple scripted player at the given frame
+
+    The player sweeps left and right and fires whenever it can.
+
+    Parameter frame: the frame number
+    Precondition: frame is an int >= 0
+    """
+    return ('up','left') if (frame//90)%2==0 else ('up','right')
+
+
+if __name__=='__main__':
+    import sys
+    try:
+        steps=int(sys.argv[4])
+    except:
+        steps=100000
+    stats=run(steps,_autopilot)
+    print('seed %d: %d steps in %.3f s: %.0f steps/sec' %
+          (stats['seed'],stats['steps'],stats['seconds'],stats['steps_per_sec']))
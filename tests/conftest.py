@@ -0,0 +1,51 @@
+"""
+Test configuration for Alien Invaders
+
+The game modules are imported by name, as the game imports them, so the root of
+the game goes first on the path. It must come before the standard library, as
+the game has a module named wave.
+
+Making a Kivy texture needs a GL context, which Kivy makes with its window.
+Without one, Kivy crashes the process rather than raising an error. So a test
+of a Kivy-backed class takes the fixture run, and runs its code in a child
+Python process that opens the window first.
+
+# Evelyn Si es828
+# 12/7/21
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if (sys.path[:1]!=[ROOT]):
+    sys.path.insert(0,ROOT)
+
+
+def runChild(code):
+    """
+    Returns the output of code run in a child Python process at the root of
+    the game, once the Kivy window is open, skipping the test if the process
+    is killed by a signal
+
+    Parameter code: the Python code to run
+    Precondition: code is a string
+    """
+    env=dict(os.environ,KIVY_NO_ARGS='1',KIVY_NO_CONSOLELOG='1')
+    code='from kivy.core.window import Window\n'+code
+    result=subprocess.run([sys.executable,'-c',code],cwd=ROOT,env=env,
+                          capture_output=True,text=True,timeout=120)
+    if (result.returncode<0):
+        pytest.skip('no GL context (child killed by signal %d)' % -result.returncode)
+    assert result.returncode==0, result.stderr
+    return result.stdout
+
+
+@pytest.fixture
+def run():
+    """
+    Returns the function runChild, to run code with the Kivy window open
+    """
+    return runChild
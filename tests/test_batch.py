@@ -0,0 +1,122 @@
+"""
+Tests for the batch simulation of Alien Invaders
+
+A BatchWave must play each of its waves exactly as a headless Wave with the
+same seed plays, given the same keys and time steps. These tests step both side
+by side and compare them after every step.
+
+# Evelyn Si es828
+# 12/7/21
+"""
+import random
+
+import numpy as np
+
+from consts import *
+from sim import ShipBody
+from wave import Wave
+from batch import BatchWave
+from game2d.headless import HeadlessInput
+
+
+def alive(batch,i):
+    """
+    Returns the alive mask of wave i of batch, in the shape of Formation.alive
+
+    A BatchWave only keeps the bottom live row of each column, as aliens are
+    only ever shot from the bottom.
+
+    Parameter batch: the batch of waves
+    Precondition: batch is a BatchWave
+
+    Parameter i: the wave to read
+    Precondition: i is an int in 0..batch.size-1
+    """
+    rows=batch._y.shape[1]
+    return np.arange(rows)[:,None]<=batch._bottom[i][None,:]
+
+
+def bolts(wave):
+    """
+    Returns the player bolt and the sorted alien bolts of wave, as (x,y) lists
+
+    Parameter wave: the wave to read
+    Precondition: wave is a Wave
+    """
+    pool=wave.getBolts()
+    active=[pool.get(j) for j in pool.indices()]
+    player=[(b.x,b.y) for b in active if b.isPlayerBolt()]
+    return (player,sorted((b.x,b.y) for b in active if not b.isPlayerBolt()))
+
+
+def batchBolts(batch,i):
+    """
+    Returns the player bolt and the sorted alien bolts of wave i of batch, as
+    (x,y) lists
+
+    Parameter batch: the batch of waves
+    Precondition: batch is a BatchWave
+
+    Parameter i: the wave to read
+    Precondition: i is an int in 0..batch.size-1
+    """
+    on=batch._boltOn[i]
+    player=[(batch._shotX[i],batch._shotY[i])] if batch._shot[i] else []
+    return (player,sorted(zip(batch._boltX[i][on].tolist(),
+                              batch._boltY[i][on].tolist())))
+
+
+def test_batch_matches_waves():
+    """
+    Each wave of a BatchWave matches a headless Wave, step by step, through
+    kills, ship deaths, new ships and the end of the game
+    """
+    seeds=list(range(100,106))
+    batch=BatchWave(len(seeds),seeds)
+    waves=[Wave(headless=True,seed=s) for s in seeds]
+    inputs=[HeadlessInput() for s in seeds]
+    keys=[()]*len(seeds)
+    rng=random.Random(7)
+    deaths=0
+
+    for step in range(3000):
+        dt=1/SIM_RATE if step%7 else 3/SIM_RATE
+        for i in range(len(seeds)):
+            if (step%(10+i%13)==0):
+                keys[i]=tuple(rng.sample(['left','right','up'],rng.randint(0,3)))
+        left=np.array(['left' in k for k in keys])
+        right=np.array(['right' in k for k in keys])
+        up=np.array(['up' in k for k in keys])
+        batch.update(dt,left,right,up)
+
+        for (i,wave) in enumerate(waves):
+            if (wave.getAlienCount()==0 or wave.getLives()==0):
+                continue
+            inputs[i].set_keys(keys[i])
+            wave.update(inputs[i],dt)
+            aliens=wave.getAliens()
+            where='step %d, wave %d' % (step,i)
+            assert np.array_equal(aliens.alive,alive(batch,i)), where
+            assert np.array_equal(aliens.x[0],batch._x[i]), where
+            assert np.array_equal(aliens.y[:,0],batch._y[i]), where
+            assert wave.getAlienCount()==batch.getAlienCount()[i], where
+            assert wave.getLives()==batch.getLives()[i], where
+            assert wave.getDeath()==batch.getDeath()[i], where
+            assert wave.getBelow()==batch.getBelow()[i], where
+            assert bolts(wave)==batchBolts(batch,i), where
+            ship=wave.getShip()
+            assert (ship is not None)==batch._ship[i], where
+            if (ship is not None):
+                assert ship.x==batch.getShipX()[i], where
+            if (wave.getDeath()):
+                wave.setDeath()
+                wave.setShip(ShipBody())
+                deaths+=1
+
+        dead=batch.getDeath().copy()
+        batch.setShip(dead)
+        batch.setDeath(dead)
+
+    # The run must reach the cases it is meant to check
+    assert deaths>0
+    assert batch.getAlienCount().min()<ALIENS_IN_ROW*ALIEN_ROWS
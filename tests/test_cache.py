@@ -0,0 +1,167 @@
+"""
+Tests for the texture cache of game2d
+
+A texture here is any value with a width and a height, so these tests need no
+Kivy window.
+
+# Evelyn Si es828
+# 12/7/21
+"""
+import random
+
+import pytest
+
+from game2d.cache import TextureCache
+
+
+class Texture(object):
+    """
+    A stand-in for a Kivy texture, with only a size
+    """
+
+    def __init__(self,width,height):
+        """
+        Initializes a texture of the given size
+
+        Parameter width: the width in pixels
+        Precondition: width is an int >= 0
+
+        Parameter height: the height in pixels
+        Precondition: height is an int >= 0
+        """
+        self.width=width
+        self.height=height
+
+
+def test_lru():
+    """
+    The textures used least recently are dropped first, and get counts hits
+    and misses while indexing does not
+    """
+    cache=TextureCache(3*400)
+    for name in 'abc':
+        cache[name]=Texture(10,10)
+    assert cache.bytes==1200 and len(cache)==3
+
+    assert cache.get('a') is not None
+    cache['b']
+    cache['d']=Texture(10,10)
+    assert not 'c' in cache
+    assert [name in cache for name in 'abd']==[True,True,True]
+    assert cache.evictions==1
+
+    assert cache.get('c') is None
+    assert (cache.hits,cache.misses)==(1,1)
+
+    cache['e']=Texture(20,10)
+    assert not 'a' in cache and not 'b' in cache
+    assert cache.bytes==1200 and cache.evictions==3
+
+    cache['e']=Texture(10,10)
+    assert cache.bytes==800 and len(cache)==2
+    del cache['d']
+    assert cache.bytes==400 and not 'd' in cache
+
+
+def test_budget():
+    """
+    Lowering the budget drops textures at once, and a texture bigger than the
+    budget is dropped as soon as it is added
+    """
+    cache=TextureCache(10000)
+    for name in 'abcde':
+        cache[name]=Texture(10,10)
+    cache.budget=1000
+    assert len(cache)==2 and 'd' in cache and 'e' in cache
+    assert cache.bytes==800
+
+    cache['huge']=Texture(100,100)
+    assert not 'huge' in cache
+    assert cache.bytes<=cache.budget
+
+    cache.budget=0
+    assert len(cache)==0 and cache.bytes==0
+    with pytest.raises(AssertionError):
+        cache.budget=-1
+    with pytest.raises(AssertionError):
+        cache.budget=1.5
+
+
+def test_pins():
+    """
+    A pinned texture is never dropped, even over the budget, and pins are
+    counted
+    """
+    cache=TextureCache(800)
+    cache.pin('a')
+    cache.pin('a')
+    cache['a']=Texture(10,10)
+    cache['b']=Texture(10,10)
+    cache['c']=Texture(10,10)
+    assert 'a' in cache and not 'b' in cache and 'c' in cache
+
+    cache['big']=Texture(20,20)
+    assert 'a' in cache and not 'c' in cache and not 'big' in cache
+    cache.pin('big')
+    cache['big']=Texture(20,20)
+    assert 'big' in cache and cache.bytes==2000
+
+    cache.unpin('a')
+    assert cache.is_pinned('a') and 'a' in cache
+    cache.unpin('a')
+    assert not cache.is_pinned('a') and not 'a' in cache
+    assert cache.bytes==1600
+    with pytest.raises(AssertionError):
+        cache.unpin('a')
+
+    cache.clear()
+    assert len(cache)==0 and cache.bytes==0
+    assert cache.is_pinned('big') and cache.evictions==4
+
+
+def test_matches_model():
+    """
+    A random run of adds, lookups, pins and unpins keeps the textures a
+    simple list in order of use would
+    """
+    rng=random.Random(9)
+    cache=TextureCache(5000)
+    names=['t%d' % i for i in range(12)]
+    order=[]
+    sizes={}
+    pins={}
+    for step in range(3000):
+        name=rng.choice(names)
+        action=rng.random()
+        if (action<0.4):
+            size=rng.randint(1,20)
+            cache[name]=Texture(size,10)
+            if name in order:
+                order.remove(name)
+            order.append(name)
+            sizes[name]=size*40
+        elif (action<0.8):
+            found=cache.get(name) is not None
+            assert found==(name in order)
+            if found:
+                order.remove(name)
+                order.append(name)
+        elif (action<0.9):
+            cache.pin(name)
+            pins[name]=pins.get(name,0)+1
+        elif (pins.get(name,0)>0):
+            cache.unpin(name)
+            pins[name]-=1
+            if (pins[name]==0):
+                del pins[name]
+
+        total=sum(sizes[n] for n in order)
+        for n in list(order):
+            if (total<=5000):
+                break
+            if not n in pins:
+                order.remove(n)
+                total-=sizes[n]
+        assert [n for n in names if n in cache]==sorted(order,key=names.index)
+        assert cache.bytes==total
+    assert cache.evictions>0 and cache.hits>0 and cache.misses>0
@@ -0,0 +1,120 @@
+"""
+Tests for the retained drawing of GView
+
+A retained view changes its canvas only for the commands that were added or
+dropped since the last frame. Whichever way it gets there, the canvas must hold
+the commands of the frame in the order they were drawn. Each test runs its code
+in a child Python process with the Kivy window open (see the fixture run in
+conftest.py).
+
+# Evelyn Si es828
+# 12/7/21
+"""
+
+# The setup of the child: a view, a pool of commands and a function that
+# checks the canvas after a frame
+SETUP='''
+import random
+from kivy.graphics import Color
+from game2d.gview import GView
+
+view=GView()
+commands=[Color(i/20.0,0,0) for i in range(20)]
+
+def frame(drawn):
+    view.clear()
+    for cmd in drawn:
+        view.draw(cmd)
+    view.present()
+    expected=[]
+    for cmd in drawn:
+        if not cmd in expected:
+            expected.append(cmd)
+    shown=list(view._frame.children)
+    assert len(shown)==len(expected), (len(shown),len(expected))
+    assert all(a is b for (a,b) in zip(shown,expected))
+    return shown
+'''
+
+
+def test_retained_frames(run):
+    """
+    A retained view shows each frame in the order it was drawn, whether the
+    frame adds, drops or reorders commands
+    """
+    out=run(SETUP+'''
+view.retained=True
+a,b,c,d=commands[:4]
+frame([a,b,c])
+frame([a,c,d])
+frame([d,a,b,c])
+frame([b,b,a])
+frame([])
+frame([c])
+
+rng=random.Random(4)
+drawn=[]
+for step in range(400):
+    if (step%5==0):
+        drawn=rng.sample(commands,rng.randint(0,len(commands)))
+    else:
+        kept=[cmd for cmd in drawn if rng.random()<0.8]
+        for cmd in rng.sample(commands,3):
+            if not cmd in kept:
+                kept.insert(rng.randint(0,len(kept)),cmd)
+        drawn=kept
+    frame(drawn)
+print('ok')
+''')
+    assert out.strip().endswith('ok')
+
+
+def test_retained_keeps_canvas(run):
+    """
+    A retained view leaves the canvas alone until the frame is presented, and
+    does not touch it at all for a frame the same as the last one
+    """
+    out=run(SETUP+'''
+view.retained=True
+shown=frame(commands[:5])
+view.clear()
+for cmd in commands[:5]:
+    view.draw(cmd)
+assert list(view._frame.children)==shown
+view.present()
+assert all(a is b for (a,b) in zip(view._frame.children,shown))
+
+view.clear()
+view.draw(commands[7])
+assert len(view._frame.children)==5
+view.present()
+assert list(view._frame.children)==[commands[7]]
+print('ok')
+''')
+    assert out.strip().endswith('ok')
+
+
+def test_immediate_frames(run):
+    """
+    A view that is not retained shows each frame as it is drawn, and turning
+    retained on or off starts again from an empty canvas
+    """
+    out=run(SETUP+'''
+(a,b,c)=commands[:3]
+view.clear()
+view.draw(a)
+view.draw(b)
+view.draw(a)
+assert list(view._frame.children)==[a,b]
+frame([c,a])
+
+view.retained=True
+assert len(view._frame.children)==0
+frame([a,b])
+frame([b,c])
+view.retained=False
+assert len(view._frame.children)==0
+frame([c,b,a])
+print('ok')
+''')
+    assert out.strip().endswith('ok')
@@ -0,0 +1,62 @@
+"""
+Tests for the Kivy-backed models of Alien Invaders
+
+Each test runs its code in a child Python process with the Kivy window open
+(see the fixture run in conftest.py).
+
+# Evelyn Si es828
+# 12/7/21
+"""
+
+
+def test_swarm_from_formation(run):
+    """
+    A Swarm can be made for a huge Formation, and follows it as it moves
+    """
+    out=run('''
+from consts import *
+from sim import Formation
+from models import Swarm
+aliens=Formation(HUGE_ROWS_MAX,HUGE_IN_ROW_MAX)
+assert aliens.huge
+swarm=Swarm(aliens)
+assert type(swarm.x)==float and type(swarm.y)==float
+assert swarm.x==float((aliens.x[0,0]+aliens.x[0,-1])/2.0)
+assert swarm.y==float((aliens.y[0,0]+aliens.y[-1,0])/2.0)
+aliens.march(ALIEN_H_WALK)
+swarm.sync(aliens)
+assert swarm.x==float((aliens.x[0,0]+aliens.x[0,-1])/2.0)
+print('ok')
+''')
+    assert out.strip().endswith('ok')
+
+
+def test_swarm_after_restore(run):
+    """
+    A Swarm shows the aliens of a restored snapshot, even when it has as many
+    live aliens as the one it replaces
+    """
+    out=run('''
+import os
+import kivy.resources
+from consts import *
+from game2d import GameApp, GView
+from wave import Wave
+for (name,folder) in (('images','Images'),('sounds','Sounds'),('fonts','Fonts')):
+    setattr(GameApp,name,os.path.abspath(folder))
+    kivy.resources.resource_add_path(folder)
+
+def killed(c):
+    wave=Wave(headless=True,seed=1,rows=40,cols=40)
+    wave.getAliens().kill(39,c)
+    return wave.snapshot()
+
+view=GView()
+wave=Wave(seed=1,rows=40,cols=40)
+for data in (killed(3),killed(7)):
+    wave.restore(data)
+    wave.draw(view)
+    assert wave._swarm._texture.pixels==wave.getAliens().pixels(HUGE_COLORS).tobytes()
+print('ok')
+''')
+    assert out.strip().endswith('ok')
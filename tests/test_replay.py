@@ -0,0 +1,115 @@
+"""
+Tests for the recording and replay of Alien Invaders
+
+# Evelyn Si es828
+# 12/7/21
+"""
+import random
+
+import pytest
+
+from consts import *
+import replay
+from replay import RECORDED_KEYS, RECORDING_HEAD, Recording, Session
+from game2d.headless import HeadlessInput
+
+
+def record(seed,length):
+    """
+    Returns a recording of a game played with random keys, and what could be
+    seen of that game after each frame
+
+    The keys include 's' (to start the game and each new ship) and a key that
+    is not recorded by name. Every ninth frame is a slow one.
+
+    Parameter seed: the seed of the keys
+    Precondition: seed is an int
+
+    Parameter length: the number of frames
+    Precondition: length is an int >= 0
+    """
+    rng=random.Random(seed)
+    recording=Recording()
+    session=Session()
+    input=HeadlessInput()
+    seen=[]
+    for step in range(length):
+        if (step%15==0):
+            input.set_keys(rng.sample(['left','right','up','s','x'],rng.randint(0,3)))
+        dt=1/SIM_RATE if step%9 else 2/SIM_RATE
+        recording.capture(input,dt)
+        session.update(input,dt)
+        wave=session.getWave()
+        if (wave!=None and recording.getSeed()==None):
+            recording.setSeed(wave.getSeed())
+        seen.append((session.getState(),None if wave==None else
+                     (wave.getLives(),wave.getAlienCount(),wave.getBelow())))
+    return (recording,seen)
+
+
+def test_capture():
+    """
+    A frame records each key of RECORDED_KEYS as a bit, and any other key as
+    one more bit
+    """
+    recording=Recording()
+    input=HeadlessInput()
+    for keys in ((),('left',),('up','s'),('x',),('x','spacebar','right')):
+        input.set_keys(keys)
+        recording.capture(input,0.5)
+    masks=[mask for (dt,mask) in recording.frames()]
+    other=1<<len(RECORDED_KEYS)
+    assert masks==[0,1,(1<<2)|(1<<3),other,other|2]
+    assert recording.count()==5
+
+
+def test_save_and_load(tmp_path):
+    """
+    A saved recording loads with the same size, seed and frames, and a file
+    that is not a whole recording is refused
+    """
+    (recording,seen)=record(0,3000)
+    assert recording.getSeed()!=None
+    path=str(tmp_path/'game.aiv')
+    recording.save(path)
+    with open(path,'rb') as file:
+        data=file.read()
+    assert len(data)==RECORDING_HEAD.size+9*recording.count()
+
+    other=replay.load(path)
+    assert other.getSize()==recording.getSize()
+    assert other.getSeed()==recording.getSeed()
+    assert list(other.frames())==list(recording.frames())
+
+    empty=Recording(3,4,2.5)
+    empty.save(path)
+    other=replay.load(path)
+    assert other.getSeed()==None and other.count()==0
+    assert other.getSize()==(3,4,2.5)
+
+    with open(path,'wb') as file:
+        file.write(data[:-1])
+    with pytest.raises(AssertionError):
+        replay.load(path)
+    with open(path,'wb') as file:
+        file.write(b'XXXX'+data[4:])
+    with pytest.raises(AssertionError):
+        replay.load(path)
+
+
+def test_play(tmp_path):
+    """
+    Replaying a saved recording ends the game where it was when it ended,
+    or where the recording stopped
+    """
+    for seed in range(3):
+        (recording,seen)=record(seed,20000)
+        path=str(tmp_path/'game.aiv')
+        recording.save(path)
+        stats=replay.play(replay.load(path))
+        assert stats['seed']==recording.getSeed()
+        assert 0<stats['frames']<=recording.count()
+        if (stats['frames']<recording.count()):
+            assert stats['state']==STATE_COMPLETE
+        assert seen[stats['frames']-1]==(stats['state'],
+            (stats['lives'],stats['aliens'],stats['below']))
@@ -0,0 +1,271 @@
+"""
+Tests for the headless simulation classes of Alien Invaders
+
+# Evelyn Si es828
+# 12/7/21
+"""
+import random
+
+import numpy as np
+import pytest
+
+from consts import *
+from sim import BoltBody, BoltPool, Formation, ShipBody, sweptHit, sweptHits
+
+
+def test_pool_fire_and_expire():
+    """
+    A BoltPool fires into the lowest free slot, reuses the same bolt object
+    for a slot, and refuses to fire when every slot is active
+    """
+    pool=BoltPool(BoltBody,4)
+    bodies=[pool.get(i) for i in range(4)]
+    assert pool.capacity()==4 and pool.count()==0 and pool.indices()==[]
+
+    assert [pool.fire(i,10*i,BOLT_SPEED) for i in range(4)]==[0,1,2,3]
+    assert pool.fire(0,0,BOLT_SPEED)==-1
+    assert pool.count()==4
+
+    pool.expire(2)
+    pool.expire(0)
+    assert not pool.isActive(0) and not pool.isActive(2)
+    assert pool.indices()==[1,3]
+    assert pool.fire(7,8,-BOLT_SPEED)==0
+    assert pool.fire(9,9,-BOLT_SPEED)==2
+    assert [pool.get(i) for i in range(4)]==bodies
+
+    bolt=pool.get(0)
+    assert (bolt.x,bolt.y,bolt.lastY,bolt.getVelocity())==(7,8,8,-BOLT_SPEED)
+    assert not bolt.isPlayerBolt()
+
+    with pytest.raises(AssertionError):
+        BoltPool(BoltBody,2).expire(1)
+
+
+def test_pool_expire_in_loop():
+    """
+    Bolts may be expired while looping over the active slots
+    """
+    pool=BoltPool(BoltBody,6)
+    for i in range(6):
+        pool.fire(i,i,BOLT_SPEED)
+    for i in pool.indices():
+        if (i%2==0):
+            pool.expire(i)
+    assert pool.indices()==[1,3,5]
+
+    pool.clear()
+    assert pool.indices()==[] and pool.count()==0
+    assert pool.fire(0,0,BOLT_SPEED)==0
+
+
+def test_pool_matches_model():
+    """
+    A random run of fires and expires keeps the slots a simple set would
+    """
+    rng=random.Random(5)
+    pool=BoltPool(BoltBody,8)
+    active=set()
+    for step in range(2000):
+        if (active and rng.random()<0.5):
+            i=rng.choice(sorted(active))
+            pool.expire(i)
+            active.remove(i)
+        else:
+            free=[i for i in range(8) if not i in active]
+            i=pool.fire(step,step,BOLT_SPEED)
+            assert i==(free[0] if free else -1)
+            if (i>=0):
+                active.add(i)
+        assert pool.indices()==sorted(active)
+        assert pool.count()==len(active)
+
+
+def test_pool_pack():
+    """
+    Unpacking a packed pool gives back its slots and bolts, and the free slots
+    are reused in the same order
+    """
+    pool=BoltPool(BoltBody,5)
+    for i in range(5):
+        pool.fire(i+0.5,2*i,BOLT_SPEED if i%2 else -BOLT_SPEED)
+    pool.get(1).move()
+    pool.expire(3)
+    pool.expire(0)
+    data=pool.pack()
+    assert len(data)==pool.packedSize()
+
+    other=BoltPool(BoltBody,5)
+    other.fire(1,1,BOLT_SPEED)
+    other.unpack(data)
+    assert other.indices()==pool.indices()
+    for i in pool.indices():
+        (a,b)=(pool.get(i),other.get(i))
+        assert (a.x,a.y,a.lastY,a.getVelocity())==(b.x,b.y,b.lastY,b.getVelocity())
+    assert other.pack()==data
+    assert other.fire(0,0,BOLT_SPEED)==0
+    assert other.fire(0,0,BOLT_SPEED)==3
+    assert other.fire(0,0,BOLT_SPEED)==-1
+
+
+def test_swept_hit_tunnelling():
+    """
+    A bolt that moves through a thin target in one step hits it, in either
+    direction, although neither end of its move overlaps the target
+    """
+    # A target 4 pixels tall at y=100, and bolts that jump 60 pixels past it
+    assert sweptHit(50,140,80,50,100,30,4)
+    assert sweptHit(50,80,140,50,100,30,4)
+    assert not sweptHit(50,140,140,50,100,30,4)
+    assert not sweptHit(50,80,80,50,100,30,4)
+
+    # A move that ends short of the target, or passes beside it, misses
+    assert not sweptHit(50,85,40,50,100,30,4)
+    side=(30+BOLT_WIDTH)/2.0
+    assert not sweptHit(50+side,140,80,50,100,30,4)
+    assert sweptHit(50+side-0.5,140,80,50,100,30,4)
+    assert not sweptHit(50-side,140,80,50,100,30,4)
+
+    # Edges that only touch do not overlap
+    top=100+2+BOLT_HEIGHT/2.0
+    assert not sweptHit(50,top,top,50,100,30,4)
+    assert sweptHit(50,top-0.5,top-0.5,50,100,30,4)
+
+
+def test_swept_hits_match():
+    """
+    sweptHits gives the same answer as sweptHit for every pair, whichever
+    arguments are arrays
+    """
+    rng=np.random.default_rng(3)
+    x=rng.uniform(0,100,500)
+    y=rng.uniform(0,100,500)
+    lastY=y-rng.uniform(-60,60,500)
+    tx=rng.uniform(0,100,500)
+    ty=rng.uniform(0,100,500)
+
+    pairs=sweptHits(x,y,lastY,tx,ty,ALIEN_WIDTH,5)
+    assert pairs.any() and not pairs.all()
+    assert pairs.tolist()==[sweptHit(*args,ALIEN_WIDTH,5)
+                            for args in zip(x,y,lastY,tx,ty)]
+
+    one=sweptHits(x,y,lastY,50.0,50.0,ALIEN_WIDTH,5)
+    assert one.tolist()==[sweptHit(a,b,c,50.0,50.0,ALIEN_WIDTH,5)
+                          for (a,b,c) in zip(x,y,lastY)]
+
+    grid=sweptHits(x[:,None],y[:,None],lastY[:,None],tx[None,:50],ty[None,:50],
+                   ALIEN_WIDTH,5)
+    assert grid.shape==(500,50)
+    assert np.array_equal(grid[:,7],sweptHits(x,y,lastY,tx[7],ty[7],ALIEN_WIDTH,5))
+
+
+def test_fast_bolts_do_not_tunnel():
+    """
+    An alien and the ship are hit by bolts that jump over them in one move
+    """
+    aliens=Formation(1,1)
+    (x,y)=aliens.center(0,0)
+    bolt=BoltBody(x,y-ALIEN_HEIGHT,BOLT_SPEED)
+    bolt.move(2*ALIEN_HEIGHT/BOLT_SPEED)
+    assert bolt.sweptBottom<y-ALIEN_HEIGHT/2.0 and bolt.sweptTop>y+ALIEN_HEIGHT/2.0
+    assert abs(bolt.y-y)>(ALIEN_HEIGHT+BOLT_HEIGHT)/2.0
+    assert aliens.collide(0,0,bolt)
+
+    ship=ShipBody()
+    bolt=BoltBody(ship.x,ship.y+SHIP_HEIGHT,-BOLT_SPEED)
+    bolt.move(2*SHIP_HEIGHT/BOLT_SPEED)
+    assert abs(bolt.y-ship.y)>(SHIP_HEIGHT+BOLT_HEIGHT)/2.0
+    assert ship.collide(bolt)
+    bolt.fire(ship.x+SHIP_WIDTH,ship.y+SHIP_HEIGHT,-BOLT_SPEED)
+    bolt.move(2*SHIP_HEIGHT/BOLT_SPEED)
+    assert not ship.collide(bolt)
+
+
+def kills(trial):
+    """
+    Returns a random formation and a random order to kill all of its aliens
+
+    Every other order kills the bottom row first, as a game mostly does.
+
+    Parameter trial: the seed of the formation and the order
+    Precondition: trial is an int
+    """
+    rng=random.Random(trial)
+    aliens=Formation(rng.randint(1,ALIEN_ROWS_MAX),rng.randint(1,ALIENS_IN_ROW_MAX))
+    cells=[(r,c) for r in range(aliens.rows) for c in range(aliens.cols)]
+    rng.shuffle(cells)
+    if (trial%2):
+        cells.sort(key=lambda cell: -cell[0])
+    return (aliens,cells)
+
+
+def test_column_index():
+    """
+    The column index of a Formation matches its alive mask after any kills
+    """
+    rng=random.Random(0)
+    for trial in range(150):
+        (aliens,cells)=kills(trial)
+        for (r,c) in cells:
+            aliens.kill(r,c)
+            # Killing a dead alien again must change nothing
+            aliens.kill(r,c)
+            occupied=[c for c in range(aliens.cols) if aliens.alive[:,c].any()]
+            for c in range(aliens.cols):
+                rows=np.flatnonzero(aliens.alive[:,c])
+                assert aliens.bottomRow(c)==(rows[-1] if len(rows) else -1)
+            assert aliens.leftColumn()==(occupied[0] if occupied else -1)
+            assert aliens.rightColumn()==(occupied[-1] if occupied else -1)
+            assert aliens.count()==int(aliens.alive.sum())
+            if (occupied):
+                chosen={aliens.randomColumn(rng) for i in range(20*len(occupied))}
+                assert chosen==set(occupied)
+
+
+def test_column_index_unpack():
+    """
+    Unpacking a formation rebuilds its column index
+    """
+    for trial in range(40):
+        (aliens,cells)=kills(trial)
+        for (r,c) in cells[:len(cells)//2]:
+            aliens.kill(r,c)
+        other=Formation(aliens.rows,aliens.cols)
+        other.unpack(aliens.pack())
+        for c in range(aliens.cols):
+            assert other.bottomRow(c)==aliens.bottomRow(c)
+        assert other.leftColumn()==aliens.leftColumn()
+        assert other.rightColumn()==aliens.rightColumn()
+        assert other.count()==aliens.count()
+        for (r,c) in cells[len(cells)//2:]:
+            aliens.kill(r,c)
+            other.kill(r,c)
+            assert other.leftColumn()==aliens.leftColumn()
+            assert other.rightColumn()==aliens.rightColumn()
+        assert other.count()==0 and other.leftColumn()==-1
+
+
+def test_bounds():
+    """
+    The box around a Formation fits its live aliens after any kills, including
+    kills in the top row, and after it moves or is unpacked
+    """
+    for trial in range(100):
+        (aliens,cells)=kills(trial)
+        for (r,c) in cells:
+            aliens.kill(r,c)
+            if (trial%3==0):
+                aliens.march(ALIEN_H_WALK)
+                aliens.descend(ALIEN_V_WALK)
+            box=aliens.bounds()
+            if (aliens.count()==0):
+                assert box is None
+                continue
+            (rows,cols)=np.nonzero(aliens.alive)
+            assert box==(aliens.x[0,cols.min()]-aliens.width/2.0,
+                         aliens.y[rows.max(),0]-aliens.height/2.0,
+                         aliens.x[0,cols.max()]+aliens.width/2.0,
+                         aliens.y[rows.min(),0]+aliens.height/2.0)
+            other=Formation(aliens.rows,aliens.cols)
+            other.unpack(aliens.pack())
+            assert other.bounds()==box
@@ -0,0 +1,116 @@
+"""
+Tests for the snapshots of Alien Invaders
+
+A wave restored from a snapshot must play on exactly as the wave the snapshot
+was taken from, whatever the wave restoring it was doing before.
+
+# Evelyn Si es828
+# 12/7/21
+"""
+import random
+
+from consts import *
+from sim import ShipBody
+from wave import Wave
+from game2d.headless import HeadlessInput
+
+
+def script(seed,length):
+    """
+    Returns the keys held down in each frame of a random game
+
+    Parameter seed: the seed of the keys
+    Precondition: seed is an int
+
+    Parameter length: the number of frames
+    Precondition: length is an int >= 0
+    """
+    rng=random.Random(seed)
+    keys=[]
+    for step in range(length):
+        if (step%20==0):
+            held=tuple(rng.sample(['left','right','up'],rng.randint(0,2)))
+        keys.append(held)
+    return keys
+
+
+def play(wave,keys):
+    """
+    Returns what can be seen of wave after each frame of keys
+
+    A ship that has finished exploding is replaced, as Invaders does. The play
+    stops when the game would end.
+
+    Parameter wave: the wave to play
+    Precondition: wave is a headless Wave
+
+    Parameter keys: the keys held down in each frame
+    Precondition: keys is a list of tuples of key names
+    """
+    input=HeadlessInput()
+    seen=[]
+    for held in keys:
+        input.set_keys(held)
+        wave.update(input,1/SIM_RATE)
+        if (wave.getDeath()):
+            if (wave.getLives()==0):
+                break
+            wave.setDeath()
+            wave.setShip(ShipBody())
+        ship=wave.getShip()
+        pool=wave.getBolts()
+        seen.append((wave.getAlienCount(),wave.getLives(),
+                     None if ship is None else (ship.x,ship.frame),
+                     [(pool.get(j).x,pool.get(j).y) for j in pool.indices()],
+                     wave.snapshot()))
+        if (wave.getBelow() or wave.getAlienCount()==0):
+            break
+    return seen
+
+
+def test_snapshot_round_trip():
+    """
+    Restoring a snapshot gives back the same snapshot, into a fresh wave or
+    into the wave it was taken from
+    """
+    wave=Wave(headless=True,seed=2)
+    seen=play(wave,script(2,3000))
+    data=wave.snapshot()
+
+    other=Wave(headless=True,seed=99)
+    other.restore(data)
+    assert other.snapshot()==data
+
+    wave.restore(seen[10][-1])
+    assert wave.snapshot()==seen[10][-1]
+
+
+def test_restore_and_play():
+    """
+    A wave restored at any frame of a game plays the rest of it the same way
+    """
+    for seed in range(2):
+        keys=script(seed,20000)
+        seen=play(Wave(headless=True,seed=seed),keys)
+        for cut in range(1,len(seen)-1,max(1,len(seen)//15)):
+            wave=Wave(headless=True,seed=12345)
+            wave.restore(seen[cut-1][-1])
+            assert play(wave,keys[cut:])==seen[cut:], (seed,cut)
+
+
+def test_restore_mid_death():
+    """
+    A wave restored while its ship is exploding finishes the explosion, and
+    plays on, the same way
+    """
+    keys=[()]*20000
+    seen=play(Wave(headless=True,seed=3),keys)
+    dying=[i for i in range(len(seen)) if seen[i][2] is not None and seen[i][2][1]>0]
+    assert dying, 'the ship was never hit'
+
+    cut=dying[0]+1
+    wave=Wave(headless=True,seed=12345)
+    wave.restore(seen[cut-1][-1])
+    after=play(wave,keys[cut:])
+    assert after==seen[cut:]
+    assert any(lives<seen[cut-1][1] for (count,lives,ship,bolts,data) in after)
@@ -6,15 +6,31 @@ the Alien Invaders game.  Instances of Wave represent a single wave. Whenever
 you move to a new level, you are expected to make a new instance of the class.
 
 The subcontroller Wave manages the ship, the aliens and any laser bolts on
-screen. These are model objects.  Their classes are defined in models.py.
+screen. These are model objects. Their state is kept in the light, window-free
+classes of sim.py, and the Kivy-backed classes in models.py are only made to
+draw them.
+
+A Wave can also be created headless, for bot play and balancing runs. A headless
+Wave draws nothing and never imports Kivy.
 
 # Evelyn Si es828
 # 12/7/21
 """
-from game2d import *
 from consts import *
-from models import *
+from sim import *
 import random
+import struct
+
+# The key of the Ship in the collision grid
+SHIP_KEY = 'ship'
+
+# The first bytes of every Wave snapshot (changes whenever the layout does)
+SNAPSHOT_MAGIC = b'AIW2'
+# The layout of the scalar state at the start of a snapshot: magic, rows,
+# cols, bolt capacity, lives, time, alien step, random bolt, direction, down,
+# below, death, has ship, animating, ship x, ship y, ship frame, death time,
+# seed, and the state of the random number generator
+SNAPSHOT_HEAD = struct.Struct('<4sHHHidiiBBBBBBddidQQ')
 
 # PRIMARY RULE: Wave can only access attributes in models.py via getters/setters
 # Wave is NOT allowed to access anything in app.py (Subcontrollers are not
@@ -47,16 +63,16 @@ class Wave(object):
     """
     # HIDDEN ATTRIBUTES:
     # Attribute _ship: the player ship to control
-    # Invariant: _ship is a Ship object or None
+    # Invariant: _ship is a ShipBody object or None
     #
-    # Attribute _aliens: the 2d list of aliens in the wave
-    # Invariant: _aliens is a rectangular 2d list containing Alien objects or None
+    # Attribute _aliens: the grid of aliens in the wave
+    # Invariant: _aliens is a Formation object
     #
-    # Attribute _bolts: the laser bolts currently on screen
-    # Invariant: _bolts is a list of Bolt objects, possibly empty
+    # Attribute _bolts: the laser bolts, on screen (active) or not
+    # Invariant: _bolts is a BoltPool of BoltBody objects
     #
     # Attribute _dline: the defensive line being protected
-    # Invariant : _dline is a GPath object
+    # Invariant : _dline is a GPath object, or None if the wave is headless
     #
     # Attribute _lives: the number of lives left
     # Invariant: _lives is an int >= 0
@@ -83,11 +99,53 @@ class Wave(object):
     # Attribute _animating: the animation coroutine for Ship
     # Invariant: _animating is a coroutine or None
     #
+    # Attribute _deathTime: the time sent to _animating so far
+    # Invariant: _deathTime is a float >= 0 (only meaningful if _animating is
+    # not None)
+    #
     # Attribute _below: True if any Aliens go below defense line
     # Invariant: _below is a boolean
     #
+    # Attribute _changed: True if the formation has descended or lost an Alien
+    # since _below was last computed
+    # Invariant: _changed is a boolean
+    #
     # Attribute _death: True if Ship exploded
     # Invariant: _death is a boolean
+    #
+    # Attribute _headless: True if the wave never draws (and never imports Kivy)
+    # Invariant: _headless is a boolean
+    #
+    # Attribute _painter: the models that draw _ship and the bolts in _bolts
+    # Invariant: _painter is a Painter object, or None if the wave is headless
+    #
+    # Attribute _swarm: the single image used to draw _aliens if it is huge
+    # Invariant: _swarm is a Swarm object, or None if the wave is headless or
+    # _aliens is not huge
+    #
+    # Attribute _batch: the batch that draws the live Aliens of _aliens, each
+    # at a fixed offset from the Alien in row 0 and column 0
+    # Invariant: _batch is an AlienBatch object, or None if the wave is
+    # headless or _aliens is huge
+    #
+    # Attribute _synced: the version and count of _aliens last copied to _batch
+    # Invariant: _synced is a pair of ints, or None if _batch was never synced
+    #
+    # Attribute _grid: the collision grid holding the Ship and the bottom Alien
+    # of each column (keyed by (row,col))
+    # Invariant: _grid is a SpatialGrid object
+    #
+    # Attribute _gridState: what the Alien part of _grid was last built from
+    # Invariant: _gridState is a pair (version, count) of _aliens, or None
+    #
+    # Attribute _gridShip: the Ship last stored in _grid, and its position
+    # Invariant: _gridShip is a triple (ship, x, y), or None
+    #
+    # Attribute _seed: the seed of _rng
+    # Invariant: _seed is an int >= 0
+    #
+    # Attribute _rng: the random number generator for this wave alone
+    # Invariant: _rng is a RandomStream object
 
 
 
@@ -109,10 +167,30 @@ class Wave(object):
     def getAliens(self):
         """
         Returns the _aliens attribute
+
+        The result is a Formation. It should not be modified.
         """
         return self._aliens
 
 
+    def getShip(self):
+        """
+        Returns the _ship attribute
+
+        The result is None while there is no ship. It should not be modified.
+        """
+        return self._ship
+
+
+    def getBolts(self):
+        """
+        Returns the _bolts attribute
+
+        The result is a BoltPool. It should not be modified.
+        """
+        return self._bolts
+
+
     def getBelow(self):
         """
         Returns the _below attribute
@@ -120,14 +198,31 @@ class Wave(object):
         return self._below
 
 
+    def getSeed(self):
+        """
+        Returns the _seed attribute
+
+        Two waves made with the same seed (and the same constants) play out
+        identically when given the same input and time steps.
+        """
+        return self._seed
+
+
+    def getAlienCount(self):
+        """
+        Returns the number of Aliens still alive
+        """
+        return self._aliens.count()
+
+
     def setShip(self,s):
         """
         Sets the _ship attribute equal to s
 
         Parameter s: the new value for _ship
-        Precondition: s is a Ship object
+        Precondition: s is a ShipBody object
         """
-        assert isinstance(s,Ship)
+        assert isinstance(s,ShipBody), repr(s)+' is not a ShipBody'
         self._ship=s
 
 
@@ -139,21 +234,54 @@ class Wave(object):
 
 
     # INITIALIZER (standard form) TO CREATE SHIP AND ALIENS
-    def __init__(self):
-        self._ship=Ship()
-        self._ship.frame=0
-        self._initListOfAliens()
-        self._bolts=[]
-        self._dline=GPath(points=[0,DEFENSE_LINE,GAME_WIDTH,DEFENSE_LINE],
-                          linecolor='black', linewidth=2)
+    def __init__(self,headless=False,seed=None,rows=ALIEN_ROWS,cols=ALIENS_IN_ROW):
+        """
+        Initializes the wave
+
+        Parameter headless: True if the wave should run without graphics
+        Precondition: headless is a boolean
+
+        Parameter seed: the seed for the random numbers of this wave, or None
+        to pick a fresh seed (which can be read back with getSeed)
+        Precondition: seed is None or an int in 0..2**64-1
+
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int in 1..HUGE_ROWS_MAX
+
+        Parameter cols: the number of aliens in each row
+        Precondition: cols is an int in 1..HUGE_IN_ROW_MAX
+        """
+        if (seed==None):
+            seed=random.SystemRandom().getrandbits(64)
+        assert type(seed)==int and 0<=seed<2**64, repr(seed)+' is not a valid seed'
+        self._seed=seed
+        self._rng=RandomStream(seed)
+        self._headless=headless
+        self._ship=ShipBody()
+        if (headless):
+            self._dline=None
+            self._painter=None
+        else:
+            from game2d import GPath
+            from models import Painter
+            self._dline=GPath(points=[0,DEFENSE_LINE,GAME_WIDTH,DEFENSE_LINE],
+                              linecolor='black', linewidth=2)
+            self._painter=Painter()
+        self._initListOfAliens(rows,cols)
+        self._bolts=BoltPool(BoltBody)
+        self._grid=SpatialGrid()
+        self._gridState=None
+        self._gridShip=None
         self._lives=SHIP_LIVES
         self._time=0
         self._direction='right'
         self._down=False
-        self._randomBolt=random.randint(1,BOLT_RATE)
+        self._randomBolt=self._rng.randint(1,BOLT_RATE)
         self._alienStep=0
         self._animating=None
+        self._deathTime=0
         self._below=False
+        self._changed=False
         self._death=False
 
 
@@ -163,21 +291,30 @@ class Wave(object):
         """
         Animates the Ship, Bolts, and Aliens
 
+        The Ship and Bolt speeds in consts.py are per update at FRAME_RATE
+        updates per second. They are scaled by dt so that the game plays at
+        the same speed at any (fixed) simulation rate.
+
+        The Aliens only do anything on a tick of their timer, every
+        ALIEN_SPEED seconds (see _tick), and the defense line is only checked
+        again after the formation descends or loses an Alien. Any other
+        update just moves the Ship and the Bolts.
+
         Parameter input: the key that the user presses
         Precondition: input is instance of GInput
 
         Parameter dt: time since last animation frame
         Precondition: dt is a float
         """
-        if (self._direction=='right'):
-            self._moveAliensRight(dt)
-        else:
-            self._moveAliensLeft(dt)
-        self._makeAlienBolts(dt)
-        self._fireAlienBolt()
+        scale=dt*FRAME_RATE
+        self._time=self._time+dt
+        if (self._time>=ALIEN_SPEED):
+            self._tick()
+        self._fireAlienBolt(scale)
         self._collide(input,dt)
         if (self._animating!=None):
             try:
+                self._deathTime=self._deathTime+dt
                 self._animating.send(dt)
             except StopIteration:
                 self._ship=None
@@ -186,12 +323,85 @@ class Wave(object):
                 self._death=True
         else: #ship no die
             if(input.is_key_down('up') and self._canFirePlayer()):
-                self._bolts.append(Bolt(self._ship.x,self._ship.top,BOLT_SPEED))
-            self._moveShip(input)
-            self._firePlayerBolt()
-        self._below=self._alienUnder()
-
-
+                self._bolts.fire(self._ship.x,self._ship.top,BOLT_SPEED)
+            self._moveShip(input,scale)
+            self._firePlayerBolt(scale)
+        if (self._changed):
+            self._below=self._alienUnder()
+            self._changed=False
+
+
+
+
+    # METHODS TO SAVE AND RESTORE THE WAVE
+    def snapshot(self):
+        """
+        Returns the complete state of this wave as bytes
+
+        The encoding has a fixed layout for a given formation size and bolt
+        capacity: the scalars (and random number generator state) in
+        SNAPSHOT_HEAD, and then Formation.pack() and BoltPool.pack().
+        It holds no Kivy objects, so a snapshot taken from a headless wave can
+        be restored into a windowed one and vice versa.
+        """
+        ship=self._ship
+        head=SNAPSHOT_HEAD.pack(SNAPSHOT_MAGIC,self._aliens.rows,
+            self._aliens.cols,self._bolts.capacity(),self._lives,self._time,
+            self._alienStep,self._randomBolt,self._direction=='left',
+            self._down,self._below,self._death,ship!=None,
+            self._animating!=None,ship.x if ship!=None else 0.0,
+            ship.y if ship!=None else 0.0,ship.frame if ship!=None else 0,
+            self._deathTime,self._seed,self._rng.getstate())
+        return b''.join((head,self._aliens.pack(),self._bolts.pack()))
+
+
+    def restore(self,data):
+        """
+        Restores the complete state of this wave from bytes
+
+        Parameter data: the result of snapshot() on a wave with the same
+        formation size and bolt capacity
+        Precondition: data is a bytes-like object
+        """
+        head=SNAPSHOT_HEAD.unpack_from(data,0)
+        assert head[0]==SNAPSHOT_MAGIC, 'data is not a Wave snapshot'
+        assert head[1:4]==(self._aliens.rows,self._aliens.cols,
+                           self._bolts.capacity()), 'snapshot is a different size'
+        (self._lives,self._time,self._alienStep,self._randomBolt)=head[4:8]
+        self._direction='left' if head[8] else 'right'
+        self._down=bool(head[9])
+        self._below=bool(head[10])
+        self._changed=False
+        self._death=bool(head[11])
+        self._seed=head[18]
+        self._rng.setstate(head[19])
+
+        data=memoryview(data)
+        offset=SNAPSHOT_HEAD.size
+        size=self._aliens.packedSize()
+        self._aliens.unpack(data[offset:offset+size])
+        offset=offset+size
+        self._bolts.unpack(data[offset:offset+self._bolts.packedSize()])
+
+        if (not head[12]):
+            self._ship=None
+        else:
+            if (self._ship==None):
+                self._ship=ShipBody()
+            self._ship.x=head[14]
+            self._ship.y=head[15]
+            self._ship.frame=head[16]
+        self._animating=None
+        self._deathTime=head[17]
+        if (head[13]):
+            self._animating=self._ship.animateShip()
+            next(self._animating)
+            self._animating.send(self._deathTime)
+        self._gridState=None
+        self._gridShip=None
+        self._synced=None
+        if (self._swarm!=None):
+            self._swarm.invalidate()
 
 
     # DRAW METHOD TO DRAW THE SHIP, ALIENS, DEFENSIVE LINE AND BOLTS
@@ -199,48 +409,73 @@ class Wave(object):
         """
         Draws the Ship, Aliens, defensive line, and Bolts
 
+        A headless wave draws nothing.
+
         Parameter view: the game view
         Precondidtion: view is an instance of GView
         """
+        if (self._headless):
+            return
         if (self._ship!=None):
-            self._ship.draw(view)
-        for r in range(len(self._aliens)):
-            for c in range(len(self._aliens[0])):
-                if (self._aliens[r][c]!=None):
-                    self._aliens[r][c].draw(view)
-        for b in self._bolts:
-            b.draw(view)
-        self._dline.draw(view)
-
-
-    # HELPER METHOD TO INITIALIZE THE 2D LIST WITH ALIENS
-    def _initListOfAliens(self):
-        """
-        Initializes the _aliens attribute
-        """
-        self._aliens=[]
-        image=-1
-        for row in range(ALIEN_ROWS):
-            x=ALIEN_WIDTH/2+ALIEN_H_SEP
-            if (row==0):
-                y=GAME_HEIGHT-(ALIEN_CEILING+((ALIEN_ROWS-1)*
-                  (ALIEN_V_SEP+ALIEN_HEIGHT))+ALIEN_HEIGHT/2)
-            else:
-                y=y+ALIEN_HEIGHT+ALIEN_V_SEP
-            alist=[]
-            if (row%2==0):
-                image=(image+1)%(len(ALIEN_IMAGES))
-            for col in range(ALIENS_IN_ROW):
-                a=Alien(x,y,ALIEN_IMAGES[image])
-                alist.append(a)
-                if (col==ALIENS_IN_ROW-1):
-                    self._aliens.insert(0,alist)
-                else:
-                    x=x+ALIEN_WIDTH+ALIEN_H_SEP
+            self._painter.drawShip(self._ship,view)
+        if (self._batch!=None):
+            self._syncBatch()
+            self._batch.draw(view)
+        if (self._swarm!=None):
+            self._swarm.sync(self._aliens)
+            self._swarm.draw(view)
+        self._painter.drawBolts(self._bolts,view)
+        if (self._dline!=None):
+            self._dline.draw(view)
+
+
+    # HELPER METHOD TO INITIALIZE THE ALIENS
+    def _initListOfAliens(self,rows,cols):
+        """
+        Initializes the _aliens attribute, and the _batch (or _swarm) that
+        draws it
+
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int in 1..HUGE_ROWS_MAX
+
+        Parameter cols: the number of aliens in each row
+        Precondition: cols is an int in 1..HUGE_IN_ROW_MAX
+        """
+        self._aliens=Formation(rows,cols)
+        self._synced=None
+        self._batch=None
+        self._swarm=None
+        if (self._headless):
+            return
+        if (self._aliens.huge):
+            from models import Swarm
+            self._swarm=Swarm(self._aliens)
+            return
+        from models import AlienBatch
+        self._batch=AlienBatch()
+
+
+    # HELPER METHOD TO COPY THE ALIENS TO THE BATCH
+    def _syncBatch(self):
+        """
+        Moves _batch to the position of the Alien in row 0 and column 0, and
+        reloads its rectangles if an Alien died
+
+        The formation only ever moves as a whole, so moving the batch is the
+        only change needed to draw every Alien in the right place. It only
+        does work if the formation changed since the last call.
+        """
+        state=(self._aliens.version,self._aliens.count())
+        if (self._synced==state):
+            return
+        if (self._synced==None or self._synced[1]!=state[1]):
+            self._batch.load(self._aliens)
+        self._batch.follow(self._aliens)
+        self._synced=state
 
 
     # HELPER METHOD TO MOVE SHIP
-    def _moveShip(self,input):
+    def _moveShip(self,input,scale):
         """
         Moves Ship left if user presses the left key and right if the user
         presses the right key. If no keys were pressed, then the Ship doesn't
@@ -248,177 +483,151 @@ class Wave(object):
 
         Parameter input: the key that the user presses
         Precondition: input is instance of GInput
+
+        Parameter scale: the number of FRAME_RATE updates this update stands for
+        Precondition: scale is a float > 0
         """
         if(self._ship!=None):
             if (input.is_key_down('right')==True):
-                self._ship.move(SHIP_MOVEMENT)
+                self._ship.move(SHIP_MOVEMENT*scale)
             elif (input.is_key_down('left')==True):
-                self._ship.move(-1*SHIP_MOVEMENT)
+                self._ship.move(-1*SHIP_MOVEMENT*scale)
+
+
+    # HELPER METHOD FOR THE ALIEN TIMER
+    def _tick(self):
+        """
+        Steps the Aliens, and lets them fire if it is their turn
+
+        This is called when _time reaches ALIEN_SPEED, and restarts the timer.
+        """
+        self._time=0
+        self._alienStep=self._alienStep+1
+        if (self._direction=='right'):
+            self._moveAliensRight()
+        else:
+            self._moveAliensLeft()
+        self._makeAlienBolts()
 
 
     # HELPER METHOD TO MOVE ALIENS
-    def _moveAliensRight(self,dt):
+    def _moveAliensRight(self):
         """
         Moves all Aliens to the right. If the Aliens are going to go offscreen,
         then move the ALiens down
-
-        Parameter dt: time since last animation frame
-        Precondition: dt is a float
         """
-        self._time=self._time+dt
-        if (self._time>=ALIEN_SPEED):
-            self._alienStep=self._alienStep+1
-            col=self._leftMost()
-            if (self._aliens[0][col].right+ALIEN_H_SEP>=GAME_WIDTH and
-                self._down==False):
-                for row in range(len(self._aliens)):
-                    for col in range(len(self._aliens[0])):
-                        if(self._aliens[row][col]!=None):
-                            y=self._aliens[row][col].y-ALIEN_V_WALK
-                            self._aliens[row][col].y=y
-                self._time=0
-                self._down=True
-                self._direction='left'
-            else:
-                for row in range(len(self._aliens)):
-                    for col in range(len(self._aliens[0])):
-                        if(self._aliens[row][col]!=None):
-                            self._aliens[row][col].x=(self._aliens[row][col].x+
-                                                      ALIEN_H_WALK)
-                self._time=0
-                self._down=False
-                self._direction='right'
+        box=self._aliens.bounds()
+        if (box!=None and box[2]+ALIEN_H_SEP>=GAME_WIDTH and self._down==False):
+            self._aliens.descend(ALIEN_V_WALK)
+            self._down=True
+            self._changed=True
+            self._direction='left'
+        else:
+            self._aliens.march(ALIEN_H_WALK)
+            self._down=False
+            self._direction='right'
 
 
     # HELPER METHOD TO MOVE ALIENS LEFT
-    def _moveAliensLeft(self,dt):
+    def _moveAliensLeft(self):
         """
         Moves all Aliens to the left. If the Aliens are going to go offscreen,
         then move the ALiens down
-
-        Parameter dt: time since last animation frame
-        Precondition: dt is a float
         """
-        self._time=self._time+dt
-        if (self._time>=ALIEN_SPEED):
-            self._alienStep=self._alienStep+1
-            col=self._rightMost()
-            if (self._aliens[0][col].left-ALIEN_H_SEP<=0 and
-                self._down==False):
-                for row in range(len(self._aliens)):
-                    for col in range(len(self._aliens[0])):
-                        if (self._aliens[row][col]!=None):
-                            y=self._aliens[row][col].y-ALIEN_V_WALK
-                            self._aliens[row][col].y=y
-                self._time=0
-                self._down=True
-                self._direction='right'
-            else:
-                for row in range(len(self._aliens)):
-                    for col in range(len(self._aliens[0])):
-                        if (self._aliens[row][col]!=None):
-                            self._aliens[row][col].x=(self._aliens[row][col].x-
-                                                      ALIEN_H_WALK)
-                self._time=0
-                self._down=False
-                self._direction='left'
-
-    # HELPER METHOD THAT DETERMINES THE RIGHTMOST COLLUMN THAT HAS AlIEN(s)
-    def _rightMost(self):
-        """
-        Returns the rightmost collumn of _aliens that has at least one Alien
-        """
-        for col in range(len(self._aliens[0])):
-            if(self._aliens[0][col]!=None):
-                return col
-
-
-    # HELPER METHOD THAT DETERMINES THE LEFTMOST COLLUMN THAT HAS ALIEN(s)
-    def _leftMost(self):
-        """
-        Returns the leftmost collumn of _aliens that has at least one Alien
-        """
-        for col in range(len(self._aliens[0])):
-            l=len(self._aliens[0])
-            if(self._aliens[0][l-1-col]!=None):
-                return l-1-col
-
+        box=self._aliens.bounds()
+        if (box!=None and box[0]-ALIEN_H_SEP<=0 and self._down==False):
+            self._aliens.descend(ALIEN_V_WALK)
+            self._down=True
+            self._changed=True
+            self._direction='right'
+        else:
+            self._aliens.march(-1*ALIEN_H_WALK)
+            self._down=False
+            self._direction='left'
 
     # HELPER METHOD TO DETERMINE IF THERE'S ALREADY A PLAYER BOLT IN _bolts
     def _canFirePlayer(self):
         """
         Returns True if player can fire and False otherwise
         """
-        output=True
-        for x in self._bolts:
-            if (x.isPlayerBolt()==True):
-                output=False
-        return output
+        for i in self._bolts.indices():
+            if (self._bolts.get(i).isPlayerBolt()):
+                return False
+        return True
 
 
     # HELPER METHOD TO FIRE THE PLAYER BOLT
-    def _firePlayerBolt(self):
+    def _firePlayerBolt(self,scale):
         """
         Moving the player Bolt. When the bolt goes offscreen, it will be removed
-        """
-        for x in self._bolts:
-            if (x.isPlayerBolt()==True):
-                i=self._bolts.index(x)
-                if (self._bolts[i].bottom+self._bolts[i].getVelocity()<=
-                    GAME_HEIGHT):
-                    self._bolts[i].move()
-                else:
-                    self._bolts.remove(x)
-
-    # HELPER METHOD FOR PICKING RANDOM NONEMPTY COLUMN OF ALIEN(s)
-    def _randomCol(self):
-        """
-        Returns a nonempty random column from _aliens
-        """
-        r=random.randint(0,len(self._aliens[0])-1)
-        while self._aliens[0][r]==None:
-            r=random.randint(0,len(self._aliens[0])-1)
-        return r
 
+        A bolt that leaves the screen is still checked for collisions along
+        the rest of its path first, so nothing is skipped when scale is large.
 
-    # HELPER METHOD TO FIND ROW OF THE BOTTOM MOST ALIEN IN THE C COLLUMN
-    def _bottomAlien(self,c):
-        for r in range(len(self._aliens)):
-            if self._aliens[r][c]==None:
-                return r-1
-            if r==len(self._aliens)-1:
-                return r
-
+        Parameter scale: the number of FRAME_RATE updates this update stands for
+        Precondition: scale is a float > 0
+        """
+        for i in self._bolts.indices():
+            b=self._bolts.get(i)
+            if (b.isPlayerBolt()):
+                if (b.bottom+b.getVelocity()*scale<=GAME_HEIGHT):
+                    b.move(scale)
+                else:
+                    self._leave(i,b,scale)
 
     # HELPER METHOD FOR CREATING ALIEN BOLTS
-    def _makeAlienBolts(self,dt):
+    def _makeAlienBolts(self):
         """
         Creating Alien Bolts to fire at random rate between 1 and BOLT_RATE
-
-        Paramter dt: time since last animation frame
-        Precondition: dt is a float
         """
         if self._alienStep>=self._randomBolt:
-            col=self._randomCol()
-            r=self._bottomAlien(col)
-            a1=self._aliens[r][col]
-            self._bolts.append(Bolt(a1.x,a1.y,-1*BOLT_SPEED))
+            col=self._aliens.randomColumn(self._rng)
+            r=self._aliens.bottomRow(col)
+            x,y=self._aliens.center(r,col)
+            self._bolts.fire(x,y,-1*BOLT_SPEED)
             self._alienStep=0
-            self._randomBolt=random.randint(1,BOLT_RATE)
+            self._randomBolt=self._rng.randint(1,BOLT_RATE)
 
 
     # HELPER METHOD TO FIRE THE ALIEN BOLT
-    def _fireAlienBolt(self):
+    def _fireAlienBolt(self,scale):
         """
         Moving the Alien Bolt. When the bolt goes offscreen, it will be removed
+
+        A bolt that leaves the screen is still checked for collisions along
+        the rest of its path first, so nothing is skipped when scale is large.
+
+        Parameter scale: the number of FRAME_RATE updates this update stands for
+        Precondition: scale is a float > 0
         """
-        for x in self._bolts:
-            if (x.isPlayerBolt()==False):
-                i=self._bolts.index(x)
-                if (self._bolts[i].top+self._bolts[i].getVelocity()>=0):
-                    self._bolts[i].move()
+        for i in self._bolts.indices():
+            b=self._bolts.get(i)
+            if (not b.isPlayerBolt()):
+                if (b.top+b.getVelocity()*scale>=0):
+                    b.move(scale)
                 else:
-                    self._bolts.remove(x)
+                    self._leave(i,b,scale)
+
+
+    # HELPER METHOD TO REMOVE A BOLT THAT LEAVES THE SCREEN
+    def _leave(self,i,b,scale):
+        """
+        Moves the bolt b in slot i off the screen, checks it for collisions
+        along the way, and removes it
+
+        Parameter i: the slot of the bolt
+        Precondition: i is an active slot of _bolts
+
+        Parameter b: the bolt in slot i
+        Precondition: b is a Bolt or BoltBody object
+
+        Parameter scale: the number of FRAME_RATE updates this update stands for
+        Precondition: scale is a float > 0
+        """
+        b.move(scale)
+        self._collideBolt(i,b)
+        if (self._bolts.isActive(i)):
+            self._bolts.expire(i)
 
 
     # HELPER METHODS FOR COLLISION DETECTION
@@ -426,22 +635,107 @@ class Wave(object):
         """
         Check if there are any collisions between the bolt and the Ship,
         if they do collide, then player loses one live, Ship explodes, that
-        bolt is removed from _bolts, and player is not allowed to move Ship or
+        bolt is expired from _bolts, and player is not allowed to move Ship or
         shoot. This method also checks the collision between the bolt and the
-        Aliens. If they do collide then set that Alien equal to None
-        """
-        for b in self._bolts:
-            if(self._ship!=None and self._ship.collide(b)):
-                self._animating=self._ship.animateShip()
-                next(self._animating)
-                self._lives=(self._lives-1)%3
-                self._bolts.remove(b)
-            for c in range(len(self._aliens[0])):
-                a=self._aliens[self._bottomAlien(c)][c]
-                if(a!=None):
-                    if (a.collide(b)):
-                        self._aliens[self._bottomAlien(c)][c]=None
-                        self._bolts.remove(b)
+        Aliens. If they do collide then that Alien is killed
+
+        Each bolt is tested along the whole path of its last move, not just
+        where it ended up.
+        """
+        for i in self._bolts.indices():
+            self._collideBolt(i,self._bolts.get(i))
+
+
+    def _collideBolt(self,i,b):
+        """
+        Checks the bolt b in slot i against the Ship and the Aliens, as
+        _collide does
+
+        Parameter i: the slot of the bolt
+        Precondition: i is an active slot of _bolts
+
+        Parameter b: the bolt in slot i
+        Precondition: b is a Bolt or BoltBody object
+        """
+        self._updateGrid()
+        near=self._grid.query(b.left,b.sweptBottom,b.right,b.sweptTop)
+        if (SHIP_KEY in near and self._ship.collide(b)):
+            self._animating=self._ship.animateShip()
+            next(self._animating)
+            self._deathTime=0
+            self._lives=(self._lives-1)%3
+            self._bolts.expire(i)
+            return
+        near.discard(SHIP_KEY)
+        # The bolt reaches the lowest row first (then the leftmost column), so
+        # only an alien that would beat the best hit so far is tested
+        best=None
+        for key in near:
+            if (best==None or key[0]>best[0] or
+                (key[0]==best[0] and key[1]<best[1])):
+                if (self._aliens.collide(key[0],key[1],b)):
+                    best=key
+        if (best!=None):
+            self._killAlien(best[0],best[1])
+            self._bolts.expire(i)
+
+
+    def _killAlien(self,r,c):
+        """
+        Kills the Alien at row r and column c, which is in _grid, and puts the
+        new bottom Alien of its column in _grid in its place
+
+        This keeps _grid up to date without re-entering every column, which
+        matters for a huge formation.
+
+        Parameter r: the row
+        Precondition: r is an int, and (r,c) is the bottom Alien of column c
+
+        Parameter c: the column
+        Precondition: c is an int in 0..cols-1
+        """
+        self._aliens.kill(r,c)
+        self._changed=True
+        self._grid.remove((r,c))
+        r=self._aliens.bottomRow(c)
+        if (r>=0):
+            x,y=self._aliens.center(r,c)
+            w=self._aliens.width/2.0
+            h=self._aliens.height/2.0
+            self._grid.insert((r,c),x-w,y-h,x+w,y+h)
+        self._gridState=(self._aliens.version,self._aliens.count())
+
+
+    # HELPER METHOD TO KEEP THE COLLISION GRID UP TO DATE
+    def _updateGrid(self):
+        """
+        Updates _grid so that it holds the Ship and the bottom Alien of each
+        column at their current positions
+
+        The Aliens are only re-entered when the formation has moved or lost an
+        Alien since the last update, and the Ship only when it has moved.
+        """
+        state=(self._aliens.version,self._aliens.count())
+        if (state!=self._gridState):
+            self._grid.clear()
+            self._gridShip=None
+            w=self._aliens.width/2.0
+            h=self._aliens.height/2.0
+            for c in range(self._aliens.cols):
+                r=self._aliens.bottomRow(c)
+                if (r>=0):
+                    x,y=self._aliens.center(r,c)
+                    self._grid.insert((r,c),x-w,y-h,x+w,y+h)
+            self._gridState=state
+        s=self._ship
+        if (s==None):
+            if (self._gridShip!=None):
+                self._grid.remove(SHIP_KEY)
+                self._gridShip=None
+        elif (self._gridShip==None or self._gridShip[0] is not s or
+              self._gridShip[1]!=s.x or self._gridShip[2]!=s.y):
+            self._grid.insert(SHIP_KEY,s.left,s.bottom,s.right,s.top)
+            self._gridShip=(s,s.x,s.y)
 
 
     # HELPER METHOD TO DETERMINE IF ANY OF THE ALIENS ARE BELOW THE DEFENSE LINE
@@ -450,10 +744,4 @@ class Wave(object):
         Returns True if the lowest Alien in _aliens is below the defense line;
         otherwise return False
         """
-        for r in range(len(self._aliens)):
-            for c in range(len(self._aliens[0])):
-                if (self._aliens[len(self._aliens)-1-r][c]!=None):
-                    a=self._aliens[len(self._aliens)-1-r][c]
-                    if(a.bottom<=self._dline.top):
-                        return True
-        return False
+        return self._aliens.below(DEFENSE_LINE)